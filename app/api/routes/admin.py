@@ -9,14 +9,15 @@ from app.db.base import get_db
 from app.db.models.user import User
 from app.db.models.service import Service
 from app.db.models.booking import Booking
-from app.db.models.review import Review
 from app.schemas.admin import (
     UserListItem,
     ServiceListItem,
     BookingAdminItem,
     DashboardAdminResponse,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, invalidate_principal, revoke_tokens, Principal
+from app.services import provider_ratings
+from app.services.booking_lifecycle import on_booking_status_changed
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -37,7 +38,7 @@ def list_users(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
 
@@ -60,14 +61,18 @@ def set_user_active(
     user_id: int,
     active: bool,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     u = db.query(User).filter(User.id == user_id).first()
     if not u:
         raise HTTPException(status_code=404, detail="User not found")
     u.is_active = bool(active)
+    if not u.is_active:
+        # a deactivated user's outstanding tokens stop working right away
+        revoke_tokens(db, u)
     db.commit()
+    invalidate_principal(u.email)
     db.refresh(u)
     return {"ok": True, "user_id": u.id, "is_active": u.is_active}
 
@@ -80,7 +85,7 @@ def approve_provider(
     provider_id: int,
     approve: bool,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     provider = db.query(User).filter(User.id == provider_id, User.role == "provider").first()
@@ -88,6 +93,7 @@ def approve_provider(
         raise HTTPException(status_code=404, detail="Provider not found")
     provider.is_provider_approved = bool(approve)
     db.commit()
+    invalidate_principal(provider.email)
     db.refresh(provider)
     return {"ok": True, "provider_id": provider.id, "is_provider_approved": provider.is_provider_approved}
 
@@ -103,7 +109,7 @@ def list_services(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     q = db.query(Service)
@@ -122,7 +128,7 @@ def toggle_service(
     service_id: int,
     active: bool,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     svc = db.query(Service).filter(Service.id == service_id).first()
@@ -147,7 +153,7 @@ def admin_list_bookings(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
     q = db.query(Booking)
@@ -180,14 +186,17 @@ def admin_update_booking_status(
     booking_id: int,
     status: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    # row lock, like the booking routes: old_status must be the status this change replaces
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     # optional: validate status is in a known set
+    old_status = booking.status
     booking.status = status
+    on_booking_status_changed(db, booking, old_status, actor_id=current_user.id)
     db.commit()
     db.refresh(booking)
     return {"ok": True, "booking_id": booking.id, "status": booking.status}
@@ -200,14 +209,12 @@ def admin_update_booking_status(
 def admin_delete_review(
     review_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     require_admin(current_user)
-    r = db.query(Review).filter(Review.id == review_id).first()
-    if not r:
-        raise HTTPException(status_code=404, detail="Review not found")
     # soft-delete or hard delete depending on your policy. We'll hard-delete for now:
-    db.delete(r)
+    if not provider_ratings.delete_review(db, review_id):
+        raise HTTPException(status_code=404, detail="Review not found")
     db.commit()
     return {"ok": True, "deleted_review_id": review_id}
 
@@ -216,7 +223,7 @@ def admin_delete_review(
 # 7. Admin summary (platform KPIs)
 # --------------------------------------------------
 @router.get("/summary", response_model=DashboardAdminResponse)
-def admin_summary(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def admin_summary(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     require_admin(current_user)
     total_users = db.query(func.count(User.id)).scalar() or 0
     total_providers = db.query(func.count(User.id)).filter(User.role == "provider").scalar() or 0
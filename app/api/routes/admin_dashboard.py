@@ -1,16 +1,17 @@
 # app/api/routes/admin_dashboard.py
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, true
 from datetime import datetime, timedelta, date
 from typing import List, Dict
 
-from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.user import User
 from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.category import Category
 from app.db.models.review import Review
+from app.db.models.booking_daily_stats import BookingDailyStat
 from app.schemas.admin_dashboard import (
     AdminDashboardResponse,
     KPIItem,
@@ -18,7 +19,10 @@ from app.schemas.admin_dashboard import (
     CategoryEarningsItem,
     TrendPoint,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.core.time_windows import day_window, last_days_window
+from app.services import analytics_snapshot, booking_stats
+from app.services.dashboard_cache import cached_dashboard
 
 router = APIRouter(prefix="/admin/dashboard", tags=["admin-dashboard"])
 
@@ -29,89 +33,128 @@ def require_admin(current_user: User):
     return True
 
 
+def _dashboard_from_snapshot(snap: analytics_snapshot.Snapshot, now: datetime) -> AdminDashboardResponse:
+    return AdminDashboardResponse(
+        kpis=KPIItem(**analytics_snapshot.kpis(snap, now)),
+        bookings_by_status=analytics_snapshot.status_counts(snap),
+        top_providers_by_earnings=[
+            ProviderEarningsItem(provider_id=pid, provider_name=name, total_earnings=earned, completed_bookings=completed)
+            for pid, name, earned, completed in analytics_snapshot.top_providers_by_earnings(snap, limit=10)
+        ],
+        earnings_by_category=[
+            CategoryEarningsItem(category_id=cid, category_name=name, total_earnings=earned)
+            for cid, name, _count, earned in analytics_snapshot.category_totals(snap, limit=20)
+        ],
+        bookings_trend_last_30_days=[
+            TrendPoint(date=datetime.combine(day, datetime.min.time()), bookings=bookings_count, earnings=earnings_sum)
+            for day, bookings_count, _completed, earnings_sum in analytics_snapshot.daily_series(snap, last_days_window(30, now))
+        ],
+    )
+
+
 @router.get("", response_model=AdminDashboardResponse)
-def admin_dashboard(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@cached_dashboard("admin")
+def admin_dashboard(db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
     require_admin(current_user)
     now = datetime.utcnow()
-    today = now.date()
-    last_30 = now - timedelta(days=30)
+    today = day_window(now.date())
     last_7 = now - timedelta(days=7)
+    trend_window = last_days_window(30, now)
+
+    # large installs: everything below comes from the columnar snapshot, no OLTP queries
+    snap = analytics_snapshot.current()
+    if snap is not None:
+        return _dashboard_from_snapshot(snap, now)
 
-    # KPIs
-    total_users = db.query(func.count(User.id)).scalar() or 0
-    total_providers = db.query(func.count(User.id)).filter(User.role == "provider").scalar() or 0
-    total_services = db.query(func.count(Service.id)).scalar() or 0
-    total_bookings = db.query(func.count(Booking.id)).scalar() or 0
-    bookings_today = db.query(func.count(Booking.id)).filter(func.date(Booking.created_at) == today).scalar() or 0
-    bookings_last_7_days = db.query(func.count(Booking.id)).filter(Booking.created_at >= last_7).scalar() or 0
+    # KPIs - one round trip: a conditional aggregate per table, cross-joined (each is a single row)
+    users_agg = db.query(
+        func.count(User.id).label("total_users"),
+        func.count(User.id).filter(User.role == "provider").label("total_providers"),
+    ).subquery()
+    services_agg = db.query(func.count(Service.id).label("total_services")).subquery()
+    bookings_agg = db.query(
+        func.count(Booking.id).label("total_bookings"),
+        func.count(Booking.id).filter(today.clause(Booking.created_at)).label("bookings_today"),
+        func.count(Booking.id).filter(Booking.created_at >= last_7).label("bookings_last_7_days"),
+    ).subquery()
+    kpi_row = (
+        db.query(users_agg, services_agg, bookings_agg)
+        .select_from(users_agg)
+        .join(services_agg, true())
+        .join(bookings_agg, true())
+        .one()
+    )
 
     kpis = KPIItem(
-        total_users=int(total_users),
-        total_providers=int(total_providers),
-        total_services=int(total_services),
-        total_bookings=int(total_bookings),
-        bookings_today=int(bookings_today),
-        bookings_last_7_days=int(bookings_last_7_days),
+        total_users=int(kpi_row.total_users or 0),
+        total_providers=int(kpi_row.total_providers or 0),
+        total_services=int(kpi_row.total_services or 0),
+        total_bookings=int(kpi_row.total_bookings or 0),
+        bookings_today=int(kpi_row.bookings_today or 0),
+        bookings_last_7_days=int(kpi_row.bookings_last_7_days or 0),
     )
 
-    # bookings by status
-    status_counts_q = db.query(Booking.status, func.count(Booking.id)).group_by(Booking.status).all()
+    # bookings by status (rollup rows are far fewer than bookings)
+    status_counts_q = (
+        db.query(BookingDailyStat.status, func.sum(BookingDailyStat.bookings_count))
+        .group_by(BookingDailyStat.status)
+        .all()
+    )
     bookings_by_status = {row[0]: int(row[1]) for row in status_counts_q}
 
-    # top providers by earnings (completed bookings)
+    # top providers by earnings (completed bookings), provider name joined in
     prov_rows = (
         db.query(
-            Booking.provider_id,
-            func.coalesce(func.sum(Booking.amount), 0).label("sum_earn"),
-            func.count(func.nullif(Booking.status != "completed", True)).label("completed_count")
+            BookingDailyStat.provider_id,
+            User.name,
+            func.coalesce(func.sum(BookingDailyStat.amount_sum), 0).label("sum_earn"),
+            func.coalesce(func.sum(BookingDailyStat.bookings_count), 0).label("completed_count"),
         )
-        .filter(Booking.status == "completed")
-        .group_by(Booking.provider_id)
+        .outerjoin(User, User.id == BookingDailyStat.provider_id)
+        .filter(BookingDailyStat.status == "completed")
+        .group_by(BookingDailyStat.provider_id, User.name)
         .order_by(desc("sum_earn"))
         .limit(10)
         .all()
     )
-    top_providers = []
-    for provider_id, sum_earn, completed_count in prov_rows:
-        prov = db.query(User).filter(User.id == provider_id).first()
-        top_providers.append(ProviderEarningsItem(
+    top_providers = [
+        ProviderEarningsItem(
             provider_id=int(provider_id),
-            provider_name=prov.name if prov else None,
+            provider_name=provider_name,
             total_earnings=float(sum_earn or 0.0),
             completed_bookings=int(completed_count or 0),
-        ))
+        )
+        for provider_id, provider_name, sum_earn, completed_count in prov_rows
+    ]
 
-    # earnings by category
+    # earnings by category, category name joined in
     cat_rows = (
         db.query(
-            Service.category_id,
-            func.coalesce(func.sum(Booking.amount), 0).label("sum_earn")
+            BookingDailyStat.category_id,
+            Category.name,
+            func.coalesce(func.sum(BookingDailyStat.amount_sum), 0).label("sum_earn")
         )
-        .join(Booking, Booking.service_id == Service.id)
-        .filter(Booking.status == "completed")
-        .group_by(Service.category_id)
+        .outerjoin(Category, Category.id == BookingDailyStat.category_id)
+        .filter(BookingDailyStat.status == "completed", BookingDailyStat.category_id.isnot(None))
+        .group_by(BookingDailyStat.category_id, Category.name)
         .order_by(desc("sum_earn"))
         .limit(20)
         .all()
     )
-    earnings_by_category = []
-    for cat_id, sum_earn in cat_rows:
-        cat = db.query(Category).filter(Category.id == cat_id).first()
-        earnings_by_category.append(CategoryEarningsItem(
+    earnings_by_category = [
+        CategoryEarningsItem(
             category_id=int(cat_id),
-            category_name=cat.name if cat else None,
+            category_name=cat_name,
             total_earnings=float(sum_earn or 0.0),
-        ))
-
-    # bookings & earnings trend last 30 days
-    trend = []
-    for i in range(29, -1, -1):
-        d = (now - timedelta(days=i)).date()
-        day_start = datetime.combine(d, datetime.min.time())
-        day_end = datetime.combine(d, datetime.max.time())
-        bookings_count = db.query(func.count(Booking.id)).filter(Booking.created_at >= day_start, Booking.created_at <= day_end).scalar() or 0
-        earnings_sum = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(Booking.status == "completed", Booking.created_at >= day_start, Booking.created_at <= day_end).scalar() or 0.0
-        trend.append(TrendPoint(date=day_start, bookings=int(bookings_count), earnings=float(earnings_sum)))
+        )
+        for cat_id, cat_name, sum_earn in cat_rows
+    ]
+
+    # bookings & earnings trend last 30 days - served from the daily rollup, gap-filled
+    trend = [
+        TrendPoint(date=datetime.combine(day, datetime.min.time()), bookings=bookings_count, earnings=earnings_sum)
+        for day, bookings_count, _completed, earnings_sum in booking_stats.daily_series(db, trend_window.first_day, trend_window.last_day)
+    ]
 
     return AdminDashboardResponse(
         kpis=kpis,
@@ -5,20 +5,31 @@ from sqlalchemy import func, desc, and_
 from datetime import datetime, timedelta, date
 from typing import List
 
-from app.db.base import get_db
+from app.db.replica import get_read_db, read_sessionmaker
+from app.db import views
+from app.db.loaders import Loaders
+from app.db.parallel import run_sections
 from app.db.models.user import User
 from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.category import Category
+from app.db.models.booking_daily_stats import BookingDailyStat
 from app.schemas.admin_dashboard_advanced import (
     AdminAdvancedResponse,
     ProviderGrowthPoint,
     MonthlyRevenuePoint,
     CategoryDistributionItem,
     LeaderboardItem,
+    LeaderboardPage,
+    LeaderboardRankResponse,
     HeatmapPoint,
+    SeriesFreshness,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.core.time_windows import last_days_window, recent_month_windows
+from app.services import analytics_snapshot
+from app.services import leaderboard as leaderboard_service
+from app.services.dashboard_cache import cached_dashboard
 
 router = APIRouter(prefix="/admin/dashboard/advanced", tags=["admin-dashboard-advanced"])
 
@@ -27,58 +38,58 @@ def require_admin(current_user: User):
         raise HTTPException(status_code=403, detail="Admin only")
     return True
 
-@router.get("", response_model=AdminAdvancedResponse)
-def admin_dashboard_advanced(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    require_admin(current_user)
-    now = datetime.utcnow()
-    today = now.date()
+def _leaderboard_item(entry, provider_name):
+    return LeaderboardItem(
+        rank=entry.rank,
+        provider_id=entry.provider_id,
+        provider_name=provider_name,
+        avg_rating=float(entry.avg_rating or 0.0),
+        rating_count=int(entry.rating_count or 0),
+        total_earnings=float(entry.total_earnings or 0.0),
+        completed_bookings=int(entry.completed_bookings or 0),
+        score=float(entry.score),
+    )
 
-    # Basic KPIs
+# Basic KPIs
+def _kpis(db: Session):
     total_users = db.query(func.count(User.id)).scalar() or 0
     total_providers = db.query(func.count(User.id)).filter(User.role == "provider").scalar() or 0
     total_services = db.query(func.count(Service.id)).scalar() or 0
     total_bookings = db.query(func.count(Booking.id)).scalar() or 0
+    return int(total_users), int(total_providers), int(total_services), int(total_bookings)
 
-    # 1) Provider growth last 30 days (group by day)
-    start_30 = now - timedelta(days=29)
-    raw = (
-        db.query(
-            func.date_trunc('day', User.created_at).label('day'),
-            func.count(User.id).label('cnt')
-        )
-        .filter(User.role == "provider", User.created_at >= start_30)
-        .group_by(func.date_trunc('day', User.created_at))
-        .order_by(func.date_trunc('day', User.created_at))
-        .all()
-    )
+# 1) Provider growth last 30 days - read from the mv_provider_growth_daily materialized view
+def _provider_growth(db: Session, now: datetime) -> List[ProviderGrowthPoint]:
+    window_30 = last_days_window(30, now)
+    growth = views.provider_growth_daily.table
+    raw = db.query(growth.c.day, growth.c.new_providers).filter(growth.c.day >= window_30.first_day).all()
     # map raw into day->count for 30-day window
-    day_map = {r.day.date(): int(r.cnt) for r in raw}
+    day_map = {day: int(cnt) for day, cnt in raw}
     provider_growth = []
-    for i in range(29, -1, -1):
-        d = (now - timedelta(days=i)).date()
+    for i in range(window_30.days):
+        d = window_30.first_day + timedelta(days=i)
         provider_growth.append(ProviderGrowthPoint(date=datetime.combine(d, datetime.min.time()), new_providers=day_map.get(d, 0)))
+    return provider_growth
 
-    # 2) Monthly revenue last 12 months
-    months = []
-    for i in range(11, -1, -1):
-        # compute month start by subtracting months - approximate by month arithmetic
-        ref = (now.replace(day=1) - timedelta(days=30*i)).replace(day=1)
-        months.append((ref.year, ref.month))
-    monthly_revenue = []
-    for y, m in months:
-        start = datetime(y, m, 1)
-        if m == 12:
-            end = datetime(y+1, 1, 1)
-        else:
-            end = datetime(y, m+1, 1)
-        total = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(
-            Booking.status == "completed",
-            Booking.created_at >= start,
-            Booking.created_at < end
-        ).scalar() or 0.0
-        monthly_revenue.append(MonthlyRevenuePoint(year=y, month=m, total_earnings=float(total)))
-
-    # 3) Category distribution - bookings count & earnings (top 10)
+# 2) Monthly revenue last 12 months
+def _monthly_revenue(db: Session, now: datetime) -> List[MonthlyRevenuePoint]:
+    months = recent_month_windows(12, now)
+    # one grouped read of the daily rollup covers all 12 months
+    month_col = func.date_trunc('month', BookingDailyStat.day)
+    month_rows = (
+        db.query(month_col.label('month'), func.coalesce(func.sum(BookingDailyStat.amount_sum), 0))
+        .filter(BookingDailyStat.status == "completed", BookingDailyStat.day >= months[0].first_day)
+        .group_by(month_col)
+        .all()
+    )
+    month_map = {(m.year, m.month): float(total or 0.0) for m, total in month_rows}
+    return [
+        MonthlyRevenuePoint(year=w.start.year, month=w.start.month, total_earnings=month_map.get((w.start.year, w.start.month), 0.0))
+        for w in months
+    ]
+
+# 3) Category distribution - bookings count & earnings (top 10)
+def _category_distribution(db: Session) -> List[CategoryDistributionItem]:
     cat_rows = (
         db.query(
             Service.category_id,
@@ -86,93 +97,151 @@ def admin_dashboard_advanced(db: Session = Depends(get_db), current_user: User =
             func.coalesce(func.sum(Booking.amount), 0).label("earnings")
         )
         .join(Booking, Booking.service_id == Service.id)
-        .filter(Booking.status == "completed")
+        .filter(Booking.status == "completed", Service.category_id.isnot(None))
         .group_by(Service.category_id)
         .order_by(desc("bookings_count"))
         .limit(20)
         .all()
     )
+    categories = Loaders(db)(Category).load_many(r[0] for r in cat_rows)
     category_distribution = []
     for cat_id, cnt, earn in cat_rows:
-        cat = db.query(Category).filter(Category.id == cat_id).first()
+        cat = categories.get(cat_id)
         category_distribution.append(CategoryDistributionItem(
             category_id=int(cat_id),
             category_name=cat.name if cat else None,
             bookings_count=int(cnt or 0),
             earnings=float(earn or 0.0)
         ))
+    return category_distribution
 
-    # 4) Provider leaderboard - hybrid score (rating * log(1 + rating_count) + normalized earnings)
-    # Fetch top providers by completed earnings, then compute score
-    prov_raw = (
-        db.query(
-            Booking.provider_id,
-            func.coalesce(func.sum(Booking.amount), 0).label("earnings"),
-            func.count(Booking.id).label("completed_count")
-        )
-        .filter(Booking.status == "completed")
-        .group_by(Booking.provider_id)
-        .order_by(desc("earnings"))
-        .limit(50)
-        .all()
-    )
-    leaderboard = []
-    # compute max earnings for normalization
-    max_earn = max([r.earnings for r in prov_raw], default=1)
-    for provider_id, earnings, completed_count in prov_raw:
-        prov = db.query(User).filter(User.id == provider_id).first()
-        avg_rating = getattr(prov, "avg_rating", 0) or 0
-        rating_count = getattr(prov, "rating_count", 0) or 0
-        # hybrid score: weight rating and earnings
-        # score = (avg_rating * log(1 + rating_count)) * 0.6 + (earnings / max_earn) * 0.4
-        # avoid import math inside loop: import here
-        import math
-        rating_component = avg_rating * math.log(1 + rating_count)
-        earnings_component = (earnings / max_earn) if max_earn > 0 else 0
-        score = rating_component * 0.6 + earnings_component * 0.4
-        leaderboard.append(LeaderboardItem(
-            provider_id=int(provider_id),
-            provider_name=prov.name if prov else None,
-            avg_rating=float(avg_rating),
-            rating_count=int(rating_count),
-            total_earnings=float(earnings or 0.0),
-            completed_bookings=int(completed_count or 0),
-            score=float(score)
-        ))
-    # sort by score desc and take top 20
-    leaderboard.sort(key=lambda x: x.score, reverse=True)
-    leaderboard = leaderboard[:20]
+# 5) Bookings heatmap (weekday x hour) last 30 days - read from the mv_bookings_heatmap materialized view
+# weekday: 1..7 (ISO)
+def _heatmap(db: Session) -> List[HeatmapPoint]:
+    heat = views.bookings_heatmap.table
+    heat_rows = db.query(heat.c.weekday, heat.c.hour, heat.c.bookings).all()
+    return [HeatmapPoint(weekday=int(weekday), hour=int(hour), bookings=int(cnt)) for weekday, hour, cnt in heat_rows]
 
-    # 5) Bookings heatmap (weekday x hour) last 30 days
-    # weekday: 1..7 using EXTRACT(isodow)
-    heat_rows = (
-        db.query(
-            func.extract('isodow', Booking.created_at).label('weekday'),
-            func.extract('hour', Booking.created_at).label('hour'),
-            func.count(Booking.id).label('cnt')
+# 6) Cancellation rate
+def _cancellation_rate(db: Session) -> float:
+    total_bookings_completed_or_canceled = db.query(func.count(Booking.id)).filter(Booking.status.in_(["completed","canceled"])).scalar() or 0
+    canceled_count = db.query(func.count(Booking.id)).filter(Booking.status == "canceled").scalar() or 0
+    return (int(canceled_count) / int(total_bookings_completed_or_canceled) * 100.0) if total_bookings_completed_or_canceled > 0 else 0.0
+
+# how stale the materialized series are
+def _series_freshness(db: Session, now: datetime) -> List[SeriesFreshness]:
+    return [
+        SeriesFreshness(
+            name=name,
+            refreshed_at=refreshed,
+            staleness_seconds=(now - refreshed).total_seconds() if refreshed else None,
         )
-        .filter(Booking.created_at >= start_30)
-        .group_by('weekday', 'hour')
-        .all()
+        for name, refreshed in views.refreshed_at(db).items()
+    ]
+
+def _advanced_from_snapshot(snap: analytics_snapshot.Snapshot, now: datetime) -> AdminAdvancedResponse:
+    kpis = analytics_snapshot.kpis(snap, now)
+    window_30 = last_days_window(30, now)
+    growth = analytics_snapshot.provider_growth(snap, window_30)
+    months = recent_month_windows(12, now)
+    month_map = analytics_snapshot.monthly_revenue(snap, months)
+    return AdminAdvancedResponse(
+        total_users=kpis["total_users"],
+        total_providers=kpis["total_providers"],
+        total_services=kpis["total_services"],
+        total_bookings=kpis["total_bookings"],
+        provider_growth_last_30_days=[
+            ProviderGrowthPoint(date=datetime.combine(window_30.first_day + timedelta(days=i), datetime.min.time()), new_providers=cnt)
+            for i, cnt in enumerate(growth)
+        ],
+        monthly_revenue_last_12_months=[
+            MonthlyRevenuePoint(year=w.start.year, month=w.start.month, total_earnings=month_map.get((w.start.year, w.start.month), 0.0))
+            for w in months
+        ],
+        category_distribution=[
+            CategoryDistributionItem(category_id=cid, category_name=name, bookings_count=cnt, earnings=earned)
+            for cid, name, cnt, earned in analytics_snapshot.category_totals(snap, limit=20, by_count=True)
+        ],
+        provider_leaderboard=[LeaderboardItem(**item) for item in analytics_snapshot.leaderboard(snap, limit=20)],
+        bookings_heatmap=[
+            HeatmapPoint(weekday=weekday, hour=hour, bookings=cnt)
+            for weekday, hour, cnt in analytics_snapshot.heatmap(snap, now)
+        ],
+        cancellation_rate_percent=float(round(analytics_snapshot.cancellation_rate(snap), 2)),
+        series_freshness=[
+            SeriesFreshness(name="analytics_snapshot", refreshed_at=snap.built_at, staleness_seconds=(now - snap.built_at).total_seconds())
+        ],
     )
-    heatmap = []
-    for weekday, hour, cnt in heat_rows:
-        heatmap.append(HeatmapPoint(weekday=int(weekday), hour=int(hour), bookings=int(cnt)))
 
-    # 6) Cancellation rate
-    total_bookings_completed_or_canceled = db.query(func.count(Booking.id)).filter(Booking.status.in_(["completed","canceled"])).scalar() or 0
-    canceled_count = db.query(func.count(Booking.id)).filter(Booking.status == "canceled").scalar() or 0
-    cancellation_rate = (int(canceled_count) / int(total_bookings_completed_or_canceled) * 100.0) if total_bookings_completed_or_canceled > 0 else 0.0
+@router.get("", response_model=AdminAdvancedResponse)
+@cached_dashboard("admin")
+def admin_dashboard_advanced(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    require_admin(current_user)
+    now = datetime.utcnow()
+
+    # large installs: every section comes from the columnar snapshot, no OLTP queries
+    snap = analytics_snapshot.current()
+    if snap is not None:
+        return _advanced_from_snapshot(snap, now)
+
+    # sections are independent: each runs on its own pooled connection
+    sections = run_sections({
+        "kpis": _kpis,
+        "provider_growth": lambda s: _provider_growth(s, now),
+        "monthly_revenue": lambda s: _monthly_revenue(s, now),
+        "category_distribution": _category_distribution,
+        # 4) Provider leaderboard - hybrid score, precomputed for all providers by app.services.leaderboard
+        "leaderboard": lambda s: [_leaderboard_item(entry, name) for entry, name in leaderboard_service.top_providers(s, limit=20)],
+        "heatmap": _heatmap,
+        "cancellation_rate": _cancellation_rate,
+        "series_freshness": lambda s: _series_freshness(s, now),
+    }, session_factory=read_sessionmaker())
+    total_users, total_providers, total_services, total_bookings = sections["kpis"]
 
     return AdminAdvancedResponse(
-        total_users=int(total_users),
-        total_providers=int(total_providers),
-        total_services=int(total_services),
-        total_bookings=int(total_bookings),
-        provider_growth_last_30_days=provider_growth,
-        monthly_revenue_last_12_months=monthly_revenue,
-        category_distribution=category_distribution,
-        provider_leaderboard=leaderboard,
-        bookings_heatmap=heatmap,
-        cancellation_rate_percent=float(round(cancellation_rate,2)),
+        total_users=total_users,
+        total_providers=total_providers,
+        total_services=total_services,
+        total_bookings=total_bookings,
+        provider_growth_last_30_days=sections["provider_growth"],
+        monthly_revenue_last_12_months=sections["monthly_revenue"],
+        category_distribution=sections["category_distribution"],
+        provider_leaderboard=sections["leaderboard"],
+        bookings_heatmap=sections["heatmap"],
+        cancellation_rate_percent=float(round(sections["cancellation_rate"],2)),
+        series_freshness=sections["series_freshness"],
+    )
+
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+def provider_leaderboard(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    require_admin(current_user)
+    rows = leaderboard_service.top_providers(db, limit=limit, offset=offset)
+    return LeaderboardPage(
+        total_ranked=leaderboard_service.ranked_count(db),
+        computed_at=rows[0][0].computed_at if rows else None,
+        items=[_leaderboard_item(entry, name) for entry, name in rows],
+    )
+
+
+@router.get("/leaderboard/{provider_id}", response_model=LeaderboardRankResponse)
+def provider_leaderboard_rank(provider_id: int, db: Session = Depends(get_read_db), current_user: Principal = Depends(get_current_user)):
+    require_admin(current_user)
+    entry = leaderboard_service.provider_rank(db, provider_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Provider not ranked yet")
+    return LeaderboardRankResponse(
+        provider_id=entry.provider_id,
+        rank=entry.rank,
+        total_ranked=leaderboard_service.ranked_count(db),
+        score=float(entry.score),
+        computed_at=entry.computed_at,
     )
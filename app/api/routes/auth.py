@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.db.base import get_db
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.core.security import create_access_token, hash_password, verify_password, get_current_user
+from app.core.security import create_access_token, hash_password, verify_password, get_current_user, revoke_tokens, Principal
 
 router = APIRouter()
 
@@ -38,11 +38,20 @@ def login(
     if not user or not verify_password(form_data.password, user.password_hash):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    token = create_access_token({"sub": user.email})
+    token = create_access_token({"sub": user.email}, user=user)
     return {"access_token": token, "token_type": "bearer"}
 
 
 
 @router.get("/me", response_model=UserResponse)
-def read_me(current_user: User = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+def read_me(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    return db.query(User).options(lazyload("*")).filter(User.id == current_user.id).first()
+
+
+@router.post("/logout-all")
+def logout_all(current_user: Principal = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Revoke every token issued to the caller, including the one used for this request."""
+    user = db.query(User).options(lazyload("*")).filter(User.id == current_user.id).first()
+    revoke_tokens(db, user)
+    db.commit()
+    return {"ok": True}
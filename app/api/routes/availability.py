@@ -5,7 +5,6 @@ from datetime import datetime, date, time, timedelta
 from typing import List
 
 from app.db.base import get_db
-from app.db.models.user import User
 from app.db.models.availability import ProviderAvailability, ProviderTimeOff
 from app.db.models.booking import Booking
 from app.db.models.service import Service
@@ -15,14 +14,14 @@ from app.schemas.availability import (
     ProviderTimeOffCreate,
     ProviderTimeOffResponse,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
 
 router = APIRouter(prefix="/availability", tags=["availability"])
 
 
 
 @router.post("/provider/weekly", response_model=ProviderAvailabilityResponse)
-def add_weekly_availability(payload: ProviderAvailabilityCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def add_weekly_availability(payload: ProviderAvailabilityCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Only providers can add availability")
 
@@ -45,7 +44,7 @@ def add_weekly_availability(payload: ProviderAvailabilityCreate, db: Session = D
 
 
 @router.get("/provider/weekly", response_model=List[ProviderAvailabilityResponse])
-def list_weekly_availability(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_weekly_availability(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Only providers can view")
     return db.query(ProviderAvailability).filter(ProviderAvailability.provider_id == current_user.id).all()
@@ -53,7 +52,7 @@ def list_weekly_availability(db: Session = Depends(get_db), current_user: User =
 
 
 @router.post("/provider/timeoff", response_model=ProviderTimeOffResponse)
-def add_timeoff(payload: ProviderTimeOffCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def add_timeoff(payload: ProviderTimeOffCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Only providers can add time off")
 
@@ -76,7 +75,7 @@ def add_timeoff(payload: ProviderTimeOffCreate, db: Session = Depends(get_db), c
 
 
 @router.get("/provider/timeoff", response_model=List[ProviderTimeOffResponse])
-def list_timeoffs(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def list_timeoffs(db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Only providers can view")
     return db.query(ProviderTimeOff).filter(ProviderTimeOff.provider_id == current_user.id).all()
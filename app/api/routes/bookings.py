@@ -7,7 +7,8 @@ from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.user import User
 from app.schemas.booking import BookingCreate, BookingResponse
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.services.booking_lifecycle import on_booking_created, on_booking_status_changed
 
 from datetime import datetime, timedelta
 from app.db.models.availability import ProviderAvailability, ProviderTimeOff
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/bookings", tags=["bookings"])
 def create_booking(
     booking: BookingCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     # Step 1: Only customers allowed
     if current_user.role != "customer":
@@ -93,6 +94,8 @@ def create_booking(
     )
 
     db.add(new_booking)
+    db.flush()
+    on_booking_created(db, new_booking, category_id=service.category_id, actor_id=current_user.id)
     db.commit()
     db.refresh(new_booking)
 
@@ -106,12 +109,13 @@ def create_booking(
 def cancel_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Customers only")
 
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    # row lock: the status check and the write cannot race the expiry sweep or another request
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
 
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -126,7 +130,9 @@ def cancel_booking(
             detail=f"Cannot cancel booking because it is already {booking.status}",
         )
 
+    old_status = booking.status
     booking.status = "canceled"
+    on_booking_status_changed(db, booking, old_status, actor_id=current_user.id)
 
     db.commit()
     db.refresh(booking)
@@ -140,7 +146,7 @@ def cancel_booking(
 @router.get("/customer/me", response_model=list[BookingResponse])
 def customer_my_bookings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Customers only")
@@ -158,7 +164,7 @@ def customer_my_bookings(
 @router.get("/provider/me", response_model=list[BookingResponse])
 def provider_my_bookings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Only providers can view this")
@@ -176,12 +182,12 @@ def provider_my_bookings(
 def accept_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -191,7 +197,9 @@ def accept_booking(
     if booking.status != "pending":
         raise HTTPException(status_code=400, detail="Booking already handled")
 
+    old_status = booking.status
     booking.status = "accepted"
+    on_booking_status_changed(db, booking, old_status, actor_id=current_user.id)
     db.commit()
     db.refresh(booking)
     return booking
@@ -204,12 +212,12 @@ def accept_booking(
 def reject_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -219,7 +227,9 @@ def reject_booking(
     if booking.status != "pending":
         raise HTTPException(status_code=400, detail="Booking already handled")
 
+    old_status = booking.status
     booking.status = "rejected"
+    on_booking_status_changed(db, booking, old_status, actor_id=current_user.id)
     db.commit()
     db.refresh(booking)
     return booking
@@ -231,12 +241,12 @@ def reject_booking(
 def complete_booking(
     booking_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
+    booking = db.query(Booking).filter(Booking.id == booking_id).with_for_update().first()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
@@ -246,7 +256,9 @@ def complete_booking(
     if booking.status != "accepted":
         raise HTTPException(status_code=400, detail="Only accepted bookings can be completed")
 
+    old_status = booking.status
     booking.status = "completed"
+    on_booking_status_changed(db, booking, old_status, actor_id=current_user.id)
     db.commit()
     db.refresh(booking)
     return booking
@@ -259,7 +271,7 @@ def complete_booking(
 @router.get("/admin/all", response_model=list[BookingResponse])
 def admin_all_bookings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin only")
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.category import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
-from app.core.security import require_admin
+from app.core.security import require_role
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 def create_category(
     data: CategoryCreate,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin)
+    admin=Depends(require_role("admin"))
 ):
     existing = db.query(Category).filter(Category.name == data.name).first()
     if existing:
@@ -33,13 +34,13 @@ def create_category(
 
 # List categories (PUBLIC)
 @router.get("/", response_model=list[CategoryResponse])
-def list_categories(db: Session = Depends(get_db)):
+def list_categories(db: Session = Depends(get_read_db)):
     return db.query(Category).all()
 
 
 # Get category by ID (PUBLIC)
 @router.get("/{category_id}", response_model=CategoryResponse)
-def get_category(category_id: int, db: Session = Depends(get_db)):
+def get_category(category_id: int, db: Session = Depends(get_read_db)):
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
@@ -52,7 +53,7 @@ def update_category(
     category_id: int,
     data: CategoryUpdate,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin)
+    admin=Depends(require_role("admin"))
 ):
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
@@ -73,7 +74,7 @@ def update_category(
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
-    admin=Depends(require_admin)
+    admin=Depends(require_role("admin"))
 ):
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
@@ -5,7 +5,7 @@ from sqlalchemy import func, desc
 from datetime import datetime, date, timedelta
 from typing import List
 
-from app.db.base import get_db
+from app.db.replica import get_user_read_db, read_sessionmaker
 from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.user import User
@@ -18,52 +18,67 @@ from app.schemas.customer_dashboard import (
     RecommendationItem,
     SpendingPoint,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.core.time_windows import recent_month_windows
+from app.db.parallel import run_sections
+from app.services.dashboard_cache import cached_dashboard
 
 router = APIRouter(prefix="/customer/dashboard", tags=["customer-dashboard"])
 
 
-@router.get("", response_model=CustomerDashboardResponse)
-def customer_dashboard(
-    limit_recommend: int = Query(6, ge=1, le=20),
-    months_spending: int = Query(6, ge=1, le=24),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    if not current_user or current_user.role != "customer":
-        raise HTTPException(status_code=403, detail="Customers only")
+def _booking_mini(b, svc, prov):
+    return BookingMini(
+        id=b.id,
+        service_id=svc.id,
+        service_name=svc.name,
+        provider_id=prov.id,
+        provider_name=prov.name,
+        booking_date=b.booking_date,
+        booking_time=str(b.booking_time) if getattr(b, "booking_time", None) else None,
+        amount=float(b.amount or 0.0),
+        status=b.status,
+    )
 
-    customer_id = current_user.id
-    today = datetime.utcnow().date()
 
-    # --- Overview ---
-    total_bookings = db.query(func.count(Booking.id)).filter(Booking.customer_id == customer_id).scalar() or 0
-    completed = db.query(func.count(Booking.id)).filter(Booking.customer_id == customer_id, Booking.status == "completed").scalar() or 0
-    canceled = db.query(func.count(Booking.id)).filter(Booking.customer_id == customer_id, Booking.status == "canceled").scalar() or 0
-    pending = db.query(func.count(Booking.id)).filter(Booking.customer_id == customer_id, Booking.status == "pending").scalar() or 0
-
-    total_spent = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(
-        Booking.customer_id == customer_id, Booking.status == "completed"
-    ).scalar() or 0.0
-
-    # average rating given by this customer (if Review.customer_id exists)
-    try:
-        avg_rating_given = db.query(func.avg(Review.rating)).filter(Review.customer_id == customer_id).scalar()
-        avg_rating_given = float(avg_rating_given) if avg_rating_given is not None else None
-    except Exception:
-        avg_rating_given = None
-
-    overview = CustomerOverview(
-        total_bookings=int(total_bookings),
-        completed=int(completed),
-        canceled=int(canceled),
-        pending=int(pending),
-        total_spent=float(total_spent),
-        avg_rating_given=avg_rating_given,
+def _recommendation_item(svc, prov):
+    return RecommendationItem(
+        service_id=svc.id,
+        service_name=svc.name,
+        provider_id=prov.id,
+        provider_name=prov.name,
+        price=float(svc.price or 0.0),
+        avg_rating=float(prov.avg_rating) if getattr(prov, "avg_rating", None) is not None else None,
     )
 
-    # --- Upcoming bookings (future) ---
-    upcoming_rows = (
+
+# --- Overview (one conditional aggregate; avg rating given as a scalar subquery) ---
+def _overview(db: Session, customer_id: int) -> CustomerOverview:
+    is_completed = Booking.status == "completed"
+    ov = (
+        db.query(
+            func.count(Booking.id).label("total_bookings"),
+            func.count(Booking.id).filter(is_completed).label("completed"),
+            func.count(Booking.id).filter(Booking.status == "canceled").label("canceled"),
+            func.count(Booking.id).filter(Booking.status == "pending").label("pending"),
+            func.coalesce(func.sum(Booking.amount).filter(is_completed), 0).label("total_spent"),
+            db.query(func.avg(Review.rating)).filter(Review.customer_id == customer_id).scalar_subquery().label("avg_rating_given"),
+        )
+        .filter(Booking.customer_id == customer_id)
+        .one()
+    )
+    return CustomerOverview(
+        total_bookings=int(ov.total_bookings or 0),
+        completed=int(ov.completed or 0),
+        canceled=int(ov.canceled or 0),
+        pending=int(ov.pending or 0),
+        total_spent=float(ov.total_spent or 0.0),
+        avg_rating_given=float(ov.avg_rating_given) if ov.avg_rating_given is not None else None,
+    )
+
+
+# --- Upcoming bookings (future) ---
+def _upcoming(db: Session, customer_id: int, today: date) -> List[BookingMini]:
+    rows = (
         db.query(Booking, Service, User)
         .join(Service, Booking.service_id == Service.id)
         .join(User, Booking.provider_id == User.id)
@@ -74,54 +89,28 @@ def customer_dashboard(
         .limit(10)
         .all()
     )
+    return [_booking_mini(b, svc, prov) for b, svc, prov in rows]
 
-    upcoming = []
-    for b, svc, prov in upcoming_rows:
-        upcoming.append(
-            BookingMini(
-                id=b.id,
-                service_id=svc.id,
-                service_name=svc.name,
-                provider_id=prov.id,
-                provider_name=prov.name,
-                booking_date=b.booking_date,
-                booking_time=str(b.booking_time) if getattr(b, "booking_time", None) else None,
-                amount=float(b.amount or 0.0),
-                status=b.status,
-            )
-        )
 
-    # --- Past bookings (limit 20) ---
-    past_rows = (
+# --- Past bookings (limit 20) ---
+def _past(db: Session, customer_id: int) -> List[BookingMini]:
+    rows = (
         db.query(Booking, Service, User)
         .join(Service, Booking.service_id == Service.id)
         .join(User, Booking.provider_id == User.id)
         .filter(Booking.customer_id == customer_id)
-        .filter(Booking.status.in_(["completed", "canceled", "rejected"]))
+        .filter(Booking.status.in_(["completed", "canceled", "rejected", "expired"]))
         .order_by(Booking.booking_date.desc(), Booking.created_at.desc())
         .limit(20)
         .all()
     )
+    return [_booking_mini(b, svc, prov) for b, svc, prov in rows]
 
-    past = []
-    for b, svc, prov in past_rows:
-        past.append(
-            BookingMini(
-                id=b.id,
-                service_id=svc.id,
-                service_name=svc.name,
-                provider_id=prov.id,
-                provider_name=prov.name,
-                booking_date=b.booking_date,
-                booking_time=str(b.booking_time) if getattr(b, "booking_time", None) else None,
-                amount=float(b.amount or 0.0),
-                status=b.status,
-            )
-        )
 
-    # --- Simple recommendations:
-    # Strategy:
-    # - find top categories customer booked in last 180 days; recommend top-rated services from those categories
+# --- Simple recommendations:
+# Strategy:
+# - find top categories customer booked in last 180 days; recommend top-rated services from those categories
+def _recommendations(db: Session, customer_id: int, today: date, limit: int) -> List[RecommendationItem]:
     six_months_ago = today - timedelta(days=180)
     category_counts = (
         db.query(Service.category_id, func.count(Booking.id).label("cnt"))
@@ -132,7 +121,6 @@ def customer_dashboard(
         .limit(3)
         .all()
     )
-    recs = []
     if category_counts:
         cat_ids = [r[0] for r in category_counts if r[0]]
         # pick top-rated services in those categories
@@ -141,72 +129,78 @@ def customer_dashboard(
             .join(User, Service.provider_id == User.id)
             .filter(Service.category_id.in_(cat_ids), Service.is_active == True)
             .order_by(desc(func.coalesce(User.avg_rating, 0)), desc(Service.created_at))
-            .limit(limit_recommend)
+            .limit(limit)
             .all()
         )
-        for svc, prov in rows:
-            recs.append(
-                RecommendationItem(
-                    service_id=svc.id,
-                    service_name=svc.name,
-                    provider_id=prov.id,
-                    provider_name=prov.name,
-                    price=float(svc.price or 0.0),
-                    avg_rating=float(prov.avg_rating) if getattr(prov, "avg_rating", None) is not None else None,
-                )
-            )
-    else:
-        # fallback: top popular services overall
-        rows = (
-            db.query(Service, User, func.coalesce(func.count(Booking.id), 0).label("bookings_count"))
-            .join(User, Service.provider_id == User.id)
-            .outerjoin(Booking, Booking.service_id == Service.id)
-            .filter(Service.is_active == True)
-            .group_by(Service.id, User.id)
-            .order_by(desc("bookings_count"), desc(func.coalesce(User.avg_rating, 0)))
-            .limit(limit_recommend)
-            .all()
+        return [_recommendation_item(svc, prov) for svc, prov in rows]
+
+    # fallback: top popular services overall
+    rows = (
+        db.query(Service, User, func.coalesce(func.count(Booking.id), 0).label("bookings_count"))
+        .join(User, Service.provider_id == User.id)
+        .outerjoin(Booking, Booking.service_id == Service.id)
+        .filter(Service.is_active == True)
+        .group_by(Service.id, User.id)
+        .order_by(desc("bookings_count"), desc(func.coalesce(User.avg_rating, 0)))
+        .limit(limit)
+        .all()
+    )
+    return [_recommendation_item(svc, prov) for svc, prov, _cnt in rows]
+
+
+# --- Spending summary (month wise last N months): one grouped query, gap-filled ---
+def _spending(db: Session, customer_id: int, months: int) -> List[SpendingPoint]:
+    windows = recent_month_windows(months)
+    month_col = func.date_trunc("month", Booking.created_at)
+    month_rows = (
+        db.query(month_col.label("month"), func.coalesce(func.sum(Booking.amount), 0))
+        .filter(
+            Booking.customer_id == customer_id,
+            Booking.status == "completed",
+            Booking.created_at >= windows[0].start,
+            Booking.created_at < windows[-1].end,
         )
-        for svc, prov, _cnt in rows:
-            recs.append(
-                RecommendationItem(
-                    service_id=svc.id,
-                    service_name=svc.name,
-                    provider_id=prov.id,
-                    provider_name=prov.name,
-                    price=float(svc.price or 0.0),
-                    avg_rating=float(prov.avg_rating) if getattr(prov, "avg_rating", None) is not None else None,
-                )
-            )
-
-    # --- Spending summary (month wise last N months) ---
-    spend_points = []
-    for i in range(months_spending - 1, -1, -1):
-        start = (today.replace(day=1) - timedelta(days=30 * i)).replace(day=1)
-        # define month start and end
-        month_start = start
-        # approximate month end by next month first day - 1 second
-        if start.month == 12:
-            next_month = start.replace(year=start.year + 1, month=1, day=1)
-        else:
-            next_month = start.replace(month=start.month + 1, day=1)
-        total_spent_m = (
-            db.query(func.coalesce(func.sum(Booking.amount), 0))
-            .filter(
-                Booking.customer_id == customer_id,
-                Booking.status == "completed",
-                Booking.created_at >= month_start,
-                Booking.created_at < next_month,
-            )
-            .scalar()
-            or 0.0
+        .group_by(month_col)
+        .all()
+    )
+    spent_by_month = {(m.year, m.month): float(total or 0.0) for m, total in month_rows}
+    return [
+        SpendingPoint(
+            month=w.start.strftime("%b"),
+            year=w.start.year,
+            total_spent=spent_by_month.get((w.start.year, w.start.month), 0.0),
         )
-        spend_points.append(SpendingPoint(month=month_start.strftime("%b"), year=month_start.year, total_spent=float(total_spent_m)))
+        for w in windows
+    ]
+
+
+@router.get("", response_model=CustomerDashboardResponse)
+@cached_dashboard("customer")
+def customer_dashboard(
+    limit_recommend: int = Query(6, ge=1, le=20),
+    months_spending: int = Query(6, ge=1, le=24),
+    db: Session = Depends(get_user_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if not current_user or current_user.role != "customer":
+        raise HTTPException(status_code=403, detail="Customers only")
+
+    customer_id = current_user.id
+    today = datetime.utcnow().date()
+
+    # sections are independent: each runs on its own pooled connection
+    sections = run_sections({
+        "overview": lambda s: _overview(s, customer_id),
+        "upcoming": lambda s: _upcoming(s, customer_id, today),
+        "past": lambda s: _past(s, customer_id),
+        "recommendations": lambda s: _recommendations(s, customer_id, today, limit_recommend),
+        "spending_summary": lambda s: _spending(s, customer_id, months_spending),
+    }, session_factory=read_sessionmaker(customer_id))
 
     return CustomerDashboardResponse(
-        overview=overview,
-        upcoming=upcoming,
-        past=past,
-        recommendations=recs,
-        spending_summary=spend_points,
+        overview=sections["overview"],
+        upcoming=sections["upcoming"],
+        past=sections["past"],
+        recommendations=sections["recommendations"],
+        spending_summary=sections["spending_summary"],
     )
@@ -5,7 +5,8 @@ from sqlalchemy import func, desc
 from datetime import datetime, timedelta
 from typing import List
 
-from app.db.base import get_db
+from app.db.replica import get_user_read_db
+from app.db.loaders import Loaders
 from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.user import User
@@ -16,15 +17,22 @@ from app.schemas.customer_dashboard_advanced import (
     CategoryInterestItem,
     RepeatProviderItem,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.services.dashboard_cache import cached_dashboard
 
 router = APIRouter(prefix="/customer/dashboard/advanced", tags=["customer-dashboard-advanced"])
 
 @router.get("", response_model=CustomerAdvancedResponse)
-def customer_dashboard_advanced(limit_recent: int = Query(6, ge=1, le=20), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@cached_dashboard("customer")
+def customer_dashboard_advanced(
+    limit_recent: int = Query(6, ge=1, le=20),
+    db: Session = Depends(get_user_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
     if not current_user or current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Customers only")
     cid = current_user.id
+    loaders = Loaders(db)
     now = datetime.utcnow().date()
 
     # 1) recent providers — last 6 providers customer interacted with (by booking date)
@@ -36,26 +44,18 @@ def customer_dashboard_advanced(limit_recent: int = Query(6, ge=1, le=20), db: S
         .limit(limit_recent)
         .all()
     )
-    recent_providers = []
-    for prov_id, last_date in recent_rows:
-        prov = db.query(User).filter(User.id == prov_id).first()
-        recent_providers.append(RecentProviderItem(provider_id=int(prov_id), provider_name=prov.name if prov else None, last_booking_date=str(last_date.date()) if last_date else None, avg_rating=float(getattr(prov,'avg_rating',0) or 0)))
 
     # 2) category interest - categories user booked most in last 180 days
     six_months = datetime.utcnow().date() - timedelta(days=180)
     cat_rows = (
         db.query(Service.category_id, func.count(Booking.id).label('cnt'))
         .join(Booking, Booking.service_id == Service.id)
-        .filter(Booking.customer_id == cid, Booking.booking_date >= six_months)
+        .filter(Booking.customer_id == cid, Booking.booking_date >= six_months, Service.category_id.isnot(None))
         .group_by(Service.category_id)
         .order_by(desc('cnt'))
         .limit(6)
         .all()
     )
-    category_interest = []
-    for cat_id, cnt in cat_rows:
-        cat = db.query(Category).filter(Category.id == cat_id).first()
-        category_interest.append(CategoryInterestItem(category_id=int(cat_id), category_name=cat.name if cat else None, bookings_count=int(cnt)))
 
     # 3) repeat providers - providers booked more than once by this customer
     repeat_rows = (
@@ -66,15 +66,30 @@ def customer_dashboard_advanced(limit_recent: int = Query(6, ge=1, le=20), db: S
         .order_by(desc('times'))
         .all()
     )
+
+    # names for every section: one IN query per model (recent + repeat providers share one)
+    users = loaders(User).prime(r[0] for r in recent_rows).prime(r[0] for r in repeat_rows)
+    categories = loaders(Category).prime(r[0] for r in cat_rows)
+
+    recent_providers = []
+    for prov_id, last_date in recent_rows:
+        prov = users.load(prov_id)
+        recent_providers.append(RecentProviderItem(provider_id=int(prov_id), provider_name=prov.name if prov else None, last_booking_date=str(last_date.date()) if last_date else None, avg_rating=float(getattr(prov,'avg_rating',0) or 0)))
+
+    category_interest = []
+    for cat_id, cnt in cat_rows:
+        cat = categories.load(cat_id)
+        category_interest.append(CategoryInterestItem(category_id=int(cat_id), category_name=cat.name if cat else None, bookings_count=int(cnt)))
+
     repeat_providers = []
     for prov_id, times in repeat_rows:
-        prov = db.query(User).filter(User.id == prov_id).first()
+        prov = users.load(prov_id)
         repeat_providers.append(RepeatProviderItem(provider_id=int(prov_id), provider_name=prov.name if prov else None, times_booked=int(times)))
 
     # 4) simple "book again" suggestions - services the user used previously but not in last 30 days (encourage repeat)
     last_30 = datetime.utcnow().date() - timedelta(days=30)
     prev_services = (
-        db.query(Booking.service_id, func.count(Booking.id).label('cnt'))
+        db.query(Booking.service_id, func.count(Booking.id).label('cnt'), func.max(Booking.booking_date).label('last_booking'))
         .filter(Booking.customer_id == cid)
         .group_by(Booking.service_id)
         .order_by(desc('cnt'))
@@ -82,9 +97,7 @@ def customer_dashboard_advanced(limit_recent: int = Query(6, ge=1, le=20), db: S
         .all()
     )
     suggestions = []
-    for svc_id, cnt in prev_services:
-        # check last booking date for this service
-        last_booking = db.query(func.max(Booking.booking_date)).filter(Booking.customer_id == cid, Booking.service_id == svc_id).scalar()
+    for svc_id, cnt, last_booking in prev_services:
         if not last_booking or last_booking < last_30:
             suggestions.append(int(svc_id))
     # keep unique and limit
@@ -4,10 +4,11 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.user import User, provider_categories
 from app.db.models.category import Category
 from app.schemas.provider import ProviderCreate, ProviderUpdate, ProviderResponse
-from app.core.security import require_admin, get_current_user
+from app.core.security import require_role, get_current_user, Principal
 from app.core.security import hash_password
 
 router = APIRouter(prefix="/providers", tags=["providers"])
@@ -17,7 +18,7 @@ router = APIRouter(prefix="/providers", tags=["providers"])
 def admin_create_provider(
     payload: ProviderCreate,
     db: Session = Depends(get_db),
-    admin: User = Depends(require_admin)
+    admin: Principal = Depends(require_role("admin"))
 ):
     # email unique
     existing = db.query(User).filter(User.email == payload.email).first()
@@ -49,7 +50,7 @@ def admin_create_provider(
 
 # PUBLIC: list providers, optionally filter by category_id
 @router.get("/", response_model=List[ProviderResponse])
-def list_providers(category_id: Optional[int] = None, db: Session = Depends(get_db)):
+def list_providers(category_id: Optional[int] = None, db: Session = Depends(get_read_db)):
     q = db.query(User).filter(User.role == "provider")
     if category_id:
         q = q.join(provider_categories).filter(provider_categories.c.category_id == category_id)
@@ -59,7 +60,7 @@ def list_providers(category_id: Optional[int] = None, db: Session = Depends(get_
 
 # PUBLIC: get provider by id
 @router.get("/{provider_id}", response_model=ProviderResponse)
-def get_provider(provider_id: int, db: Session = Depends(get_db)):
+def get_provider(provider_id: int, db: Session = Depends(get_read_db)):
     provider = db.query(User).filter(User.id == provider_id, User.role == "provider").first()
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
@@ -70,7 +71,7 @@ def get_provider(provider_id: int, db: Session = Depends(get_db)):
 @router.put("/me", response_model=ProviderResponse)
 def update_own_profile(
     payload: ProviderUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     if current_user.role != "provider" and current_user.role != "admin":
@@ -98,7 +99,7 @@ def update_own_profile(
 
 # ADMIN: assign categories to an existing provider
 @router.post("/{provider_id}/categories", response_model=ProviderResponse)
-def admin_assign_categories(provider_id: int, category_ids: List[int], db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+def admin_assign_categories(provider_id: int, category_ids: List[int], db: Session = Depends(get_db), admin: Principal = Depends(require_role("admin"))):
     provider = db.query(User).filter(User.id == provider_id, User.role == "provider").first()
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
@@ -119,7 +120,7 @@ def admin_assign_categories(provider_id: int, category_ids: List[int], db: Sessi
 
 # ADMIN: remove category from provider
 @router.delete("/{provider_id}/categories/{category_id}", response_model=ProviderResponse)
-def admin_remove_category(provider_id: int, category_id: int, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
+def admin_remove_category(provider_id: int, category_id: int, db: Session = Depends(get_db), admin: Principal = Depends(require_role("admin"))):
     provider = db.query(User).filter(User.id == provider_id, User.role == "provider").first()
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
@@ -1,11 +1,12 @@
 # app/api/routes/provider_dashboard.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
 from sqlalchemy import func, desc
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional
 
-from app.db.base import get_db
+from app.db.replica import get_user_read_db
+from app.db.loaders import Loaders
 from app.db.models.booking import Booking
 from app.db.models.service import Service
 from app.db.models.review import Review
@@ -15,81 +16,83 @@ from app.schemas.provider_dashboard import (
     SummaryResponse,
     EarningsResponse,
     EarningsBreakdownItem,
+    DailyEarningsPoint,
+    DailyEarningsResponse,
     BookingsStatsResponse,
     ReviewsResponse,
     ReviewMini,
     ActivityResponse,
     TopServiceItem,
 )
-from app.core.security import get_current_user
+from app.core.security import get_current_user, Principal
+from app.core.config import settings
+from app.core.time_windows import TimeWindow, current_month_window, month_window
+from app.services import booking_stats, earnings_ledger, reviews as review_service
+from app.services.dashboard_cache import cached_dashboard
 
 router = APIRouter(prefix="/provider/dashboard", tags=["provider-dashboard"])
 
 
+def _booking_counts(db: Session, provider_id: int, month: Optional[TimeWindow] = None):
+    """
+    One query over the provider's bookings: total and per-status counts (COUNT ... FILTER).
+    When a month window is given, also lifetime and month earnings from the earnings
+    ledger totals and the provider's average review rating.
+    """
+    columns = [
+        func.count(Booking.id).label("total"),
+        func.count(Booking.id).filter(Booking.status == "completed").label("completed"),
+        func.count(Booking.id).filter(Booking.status == "pending").label("pending"),
+        func.count(Booking.id).filter(Booking.status == "canceled").label("cancelled"),
+        func.count(Booking.id).filter(Booking.status == "rejected").label("rejected"),
+    ]
+    if month is not None:
+        columns += [
+            earnings_ledger.lifetime_earnings_subquery(db, provider_id).label("total_earnings"),
+            earnings_ledger.month_earnings_subquery(db, provider_id, month.first_day).label("current_month_earnings"),
+            db.query(func.avg(Review.rating)).filter(Review.provider_id == provider_id).scalar_subquery().label("avg_rating"),
+        ]
+    return db.query(*columns).filter(Booking.provider_id == provider_id).one()
+
+
 # --------------------------
 # 1) /provider/dashboard/summary
 # --------------------------
 @router.get("/summary", response_model=SummaryResponse)
-def provider_summary(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@cached_dashboard("provider")
+def provider_summary(db: Session = Depends(get_user_read_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
     provider_id = current_user.id
 
-    # Total bookings
-    total_bookings = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id).scalar() or 0
-
-    # By status
-    completed = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "completed").scalar() or 0
-    pending = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "pending").scalar() or 0
-    cancelled = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "canceled").scalar() or 0
-    rejected = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "rejected").scalar() or 0
-
-    # Earnings - sum only completed bookings
-    total_earnings = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(
-        Booking.provider_id == provider_id, Booking.status == "completed"
-    ).scalar() or 0.0
+    # Counts by status, lifetime earnings and current month earnings in one pass
+    counts = _booking_counts(db, provider_id, month=current_month_window())
 
-    # Current month earnings (local server month)
-    now = datetime.utcnow()
-    current_month = now.month
-    current_year = now.year
-    current_month_earnings = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(
-        Booking.provider_id == provider_id,
-        Booking.status == "completed",
-        func.extract("month", Booking.created_at) == current_month,
-        func.extract("year", Booking.created_at) == current_year
-    ).scalar() or 0.0
-
-    # Average rating from reviews table
-    avg_rating = db.query(func.avg(Review.rating)).filter(Review.provider_id == provider_id).scalar()
-    avg_rating = float(avg_rating) if avg_rating is not None else None
-
-    # Top service by number of bookings
+    # Top service by number of bookings, name joined in
     top_q = (
-        db.query(Booking.service_id, func.count(Booking.id).label("cnt"))
+        db.query(Booking.service_id, Service.name, func.count(Booking.id).label("cnt"))
+        .join(Service, Service.id == Booking.service_id)
         .filter(Booking.provider_id == provider_id)
-        .group_by(Booking.service_id)
+        .group_by(Booking.service_id, Service.name)
         .order_by(desc("cnt"))
         .limit(1)
-        .all()
+        .first()
     )
     top_service = None
     if top_q:
-        svc_id, cnt = top_q[0]
-        svc = db.query(Service).filter(Service.id == svc_id).first()
-        if svc:
-            top_service = TopServiceItem(service_id=svc.id, service_name=svc.name, count=int(cnt))
+        svc_id, svc_name, cnt = top_q
+        top_service = TopServiceItem(service_id=svc_id, service_name=svc_name, count=int(cnt))
 
     return SummaryResponse(
-        total_bookings=int(total_bookings),
-        completed=int(completed),
-        pending=int(pending),
-        cancelled=int(cancelled),
-        rejected=int(rejected),
-        total_earnings=float(total_earnings),
-        current_month_earnings=float(current_month_earnings),
-        average_rating=avg_rating,
+        total_bookings=int(counts.total or 0),
+        completed=int(counts.completed or 0),
+        pending=int(counts.pending or 0),
+        cancelled=int(counts.cancelled or 0),
+        rejected=int(counts.rejected or 0),
+        total_earnings=float(counts.total_earnings or 0.0),
+        current_month_earnings=float(counts.current_month_earnings or 0.0),
+        average_rating=float(counts.avg_rating) if counts.avg_rating is not None else None,
         top_service=top_service,
     )
 
@@ -98,11 +101,12 @@ def provider_summary(db: Session = Depends(get_db), current_user: User = Depends
 # 2) /provider/dashboard/earnings?month=&year=
 # --------------------------
 @router.get("/earnings", response_model=EarningsResponse)
+@cached_dashboard("provider")
 def provider_earnings(
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_user_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
@@ -114,35 +118,12 @@ def provider_earnings(
     if year is None:
         year = now.year
 
-    # Total earnings and completed bookings for the month
-    total_earnings = db.query(func.coalesce(func.sum(Booking.amount), 0)).filter(
-        Booking.provider_id == provider_id,
-        Booking.status == "completed",
-        func.extract("month", Booking.created_at) == month,
-        func.extract("year", Booking.created_at) == year,
-    ).scalar() or 0.0
-
-    completed_bookings = db.query(func.count(Booking.id)).filter(
-        Booking.provider_id == provider_id,
-        Booking.status == "completed",
-        func.extract("month", Booking.created_at) == month,
-        func.extract("year", Booking.created_at) == year,
-    ).scalar() or 0
+    # Total earnings and completed bookings for the month - one row of the ledger totals
+    window = month_window(year, month)
+    completed_bookings, total_earnings = earnings_ledger.month_totals(db, provider_id, window.first_day)
 
-    # Breakdown by service
-    rows = (
-        db.query(Service.name, func.count(Booking.id).label("cnt"), func.coalesce(func.sum(Booking.amount), 0).label("value"))
-        .join(Booking, Booking.service_id == Service.id)
-        .filter(
-            Booking.provider_id == provider_id,
-            Booking.status == "completed",
-            func.extract("month", Booking.created_at) == month,
-            func.extract("year", Booking.created_at) == year,
-        )
-        .group_by(Service.name)
-        .order_by(desc("value"))
-        .all()
-    )
+    # Breakdown by service - the month's ledger entries
+    rows = earnings_ledger.month_breakdown(db, provider_id, window.first_day)
 
     breakdown = [EarningsBreakdownItem(service_name=r[0], count=int(r[1]), value=float(r[2] or 0.0)) for r in rows]
 
@@ -156,20 +137,58 @@ def provider_earnings(
     )
 
 
+# --------------------------
+# 2b) /provider/dashboard/earnings/daily?start=&end=
+# --------------------------
+@router.get("/earnings/daily", response_model=DailyEarningsResponse)
+@cached_dashboard("provider")
+def provider_daily_earnings(
+    start: Optional[date] = Query(None, description="First day (default: 29 days before end)"),
+    end: Optional[date] = Query(None, description="Last day, inclusive (default: today)"),
+    db: Session = Depends(get_user_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    if current_user.role != "provider":
+        raise HTTPException(status_code=403, detail="Providers only")
+
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start).days + 1 > settings.PROVIDER_DAILY_SERIES_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range is limited to {settings.PROVIDER_DAILY_SERIES_MAX_DAYS} days")
+
+    # one grouped read of the daily rollup, gap-filled with generate_series
+    series = booking_stats.daily_series(db, start, end, provider_id=current_user.id)
+    points = [
+        DailyEarningsPoint(date=day, bookings=bookings, completed_bookings=completed, earnings=earnings)
+        for day, bookings, completed, earnings in series
+    ]
+    return DailyEarningsResponse(
+        provider_id=current_user.id,
+        start=start,
+        end=end,
+        total_earnings=sum(p.earnings for p in points),
+        completed_bookings=sum(p.completed_bookings for p in points),
+        points=points,
+    )
+
+
 # --------------------------
 # 3) /provider/dashboard/bookings/stats
 # --------------------------
 @router.get("/bookings/stats", response_model=BookingsStatsResponse)
-def provider_bookings_stats(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+@cached_dashboard("provider")
+def provider_bookings_stats(db: Session = Depends(get_user_read_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
-    provider_id = current_user.id
-    total = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id).scalar() or 0
-    completed = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "completed").scalar() or 0
-    pending = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "pending").scalar() or 0
-    cancelled = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "canceled").scalar() or 0
-    rejected = db.query(func.count(Booking.id)).filter(Booking.provider_id == provider_id, Booking.status == "rejected").scalar() or 0
+    counts = _booking_counts(db, current_user.id)
+    total = int(counts.total or 0)
+    completed = int(counts.completed or 0)
+    pending = int(counts.pending or 0)
+    cancelled = int(counts.cancelled or 0)
+    rejected = int(counts.rejected or 0)
 
     completion_rate = f"{(completed / total * 100):.1f}%" if total > 0 else "0.0%"
 
@@ -187,37 +206,52 @@ def provider_bookings_stats(db: Session = Depends(get_db), current_user: User =
 # 4) /provider/dashboard/reviews
 # --------------------------
 @router.get("/reviews", response_model=ReviewsResponse)
-def provider_reviews(limit: int = Query(20, ge=1, le=100), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def provider_reviews(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_user_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
-    provider_id = current_user.id
-    avg_rating = db.query(func.avg(Review.rating)).filter(Review.provider_id == provider_id).scalar()
-    avg_rating = float(avg_rating) if avg_rating is not None else None
+    # average and distribution come from the stored counters on the provider row
+    provider = db.query(User).options(lazyload("*")).filter(User.id == current_user.id).first()
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+    rating_count = int(provider.rating_count or 0)
+    avg_rating = float(provider.avg_rating) if rating_count else None
 
-    rows = db.query(Review).filter(Review.provider_id == provider_id).order_by(Review.created_at.desc()).limit(limit).all()
+    rows, next_cursor = review_service.provider_reviews_page(db, current_user.id, limit, cursor)
+    customers = Loaders(db)(User).load_many(r.customer_id for r in rows)
 
     reviews = []
     for r in rows:
-        # try to fetch customer name if present
-        try:
-            customer_name = r.customer.name
-        except Exception:
-            customer_name = None
-        reviews.append(ReviewMini(id=r.id, rating=r.rating, comment=r.comment, customer_name=customer_name, created_at=r.created_at))
+        customer = customers.get(r.customer_id)
+        reviews.append(ReviewMini(id=r.id, rating=r.rating, comment=r.comment, customer_name=customer.name if customer else None, created_at=r.created_at))
 
-    return ReviewsResponse(average_rating=avg_rating, reviews=reviews)
+    return ReviewsResponse(
+        average_rating=avg_rating,
+        rating_count=rating_count,
+        rating_histogram=review_service.rating_histogram(provider),
+        reviews=reviews,
+        next_cursor=next_cursor,
+    )
 
 
 # --------------------------
 # 5) /provider/dashboard/activity
 # --------------------------
 @router.get("/activity", response_model=ActivityResponse)
-def provider_activity(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def provider_activity(db: Session = Depends(get_user_read_db), current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Providers only")
 
     provider_id = current_user.id
+    # profile fields for the completion score; relationships stay unloaded unless used
+    provider = db.query(User).options(lazyload("*")).filter(User.id == provider_id).first()
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
 
     # last booking created_at
     last_booking = db.query(Booking).filter(Booking.provider_id == provider_id).order_by(Booking.created_at.desc()).first()
@@ -244,7 +278,7 @@ def provider_activity(db: Session = Depends(get_db), current_user: User = Depend
     # field checks
     for attr in ("name", "phone", "address", "description"):
         checks += 1
-        if getattr(current_user, attr, None):
+        if getattr(provider, attr, None):
             profile_score += 1
 
     # services count check
@@ -257,7 +291,7 @@ def provider_activity(db: Session = Depends(get_db), current_user: User = Depend
     # best effort: if relationship exists
     cat_count = 0
     try:
-        cat_count = len(current_user.categories or [])
+        cat_count = len(provider.categories or [])
     except Exception:
         cat_count = 0
     checks += 1
@@ -1,35 +1,22 @@
 # app/api/routes/reviews.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.review import Review
 from app.db.models.booking import Booking
 from app.db.models.user import User
-from app.schemas.review import ReviewCreate, ReviewResponse
-from app.core.security import get_current_user, require_admin
+from app.schemas.review import ReviewCreate, ReviewResponse, RatingSummary
+from app.core.security import get_current_user, require_role, Principal
+from app.services import provider_ratings, reviews as review_service
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
-# Helper: recalc provider aggregates
-def _recalculate_provider_rating(db: Session, provider: User):
-    # compute from reviews table
-    rows = db.query(Review).filter(Review.provider_id == provider.id).all()
-    total = len(rows)
-    if total == 0:
-        provider.avg_rating = 0.0
-        provider.total_reviews = 0
-    else:
-        s = sum(r.rating for r in rows)
-        provider.avg_rating = float(s) / total
-        provider.total_reviews = total
-    db.add(provider)
-    db.commit()
-
 # Create review (customer)
 @router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
-def create_review(review_in: ReviewCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_review(review_in: ReviewCreate, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_user)):
     # only customers can create reviews
     if current_user.role != "customer":
         raise HTTPException(status_code=403, detail="Only customers can create reviews")
@@ -67,33 +54,50 @@ def create_review(review_in: ReviewCreate, db: Session = Depends(get_db), curren
     )
 
     db.add(review)
+    db.flush()
+    # provider aggregates move in the same transaction as the review
+    provider_ratings.review_added(db, review)
     db.commit()
     db.refresh(review)
 
-    # update provider aggregates (recalculate for correctness; fine for small scale)
-    _recalculate_provider_rating(db, provider)
-
     return review
 
-# List reviews for a provider (public)
+# List reviews for a provider (public), newest first.
+# Keyset pagination is opt-in so existing clients keep getting the full list: pass limit,
+# then send the X-Next-Cursor response header back as ?cursor= for the next page.
 @router.get("/provider/{provider_id}", response_model=List[ReviewResponse])
-def list_provider_reviews(provider_id: int, db: Session = Depends(get_db)):
-    reviews = db.query(Review).filter(Review.provider_id == provider_id).order_by(Review.created_at.desc()).all()
-    return reviews
+def list_provider_reviews(
+    provider_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    db: Session = Depends(get_read_db),
+):
+    if limit is None and cursor is not None:
+        limit = 20
+    items, next_cursor = review_service.provider_reviews_page(db, provider_id, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
+
+# Average and star distribution for a provider (public) - stored counters, no aggregation
+@router.get("/provider/{provider_id}/summary", response_model=RatingSummary)
+def provider_rating_summary(provider_id: int, db: Session = Depends(get_read_db)):
+    provider = db.query(User).filter(User.id == provider_id, User.role == "provider").first()
+    if not provider:
+        raise HTTPException(status_code=404, detail="Provider not found")
+    return RatingSummary(
+        provider_id=provider.id,
+        average_rating=float(provider.avg_rating) if provider.rating_count else None,
+        rating_count=int(provider.rating_count or 0),
+        histogram=review_service.rating_histogram(provider),
+    )
 
 # Admin: delete a review (and recalc)
 @router.delete("/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
-def admin_delete_review(review_id: int, db: Session = Depends(get_db), admin: User = Depends(require_admin)):
-    review = db.query(Review).filter(Review.id == review_id).first()
-    if not review:
+def admin_delete_review(review_id: int, db: Session = Depends(get_db), admin: Principal = Depends(require_role("admin"))):
+    if not provider_ratings.delete_review(db, review_id):
         raise HTTPException(status_code=404, detail="Review not found")
-
-    provider = db.query(User).filter(User.id == review.provider_id).first()
-    db.delete(review)
     db.commit()
 
-    # recalc provider aggregates
-    if provider:
-        _recalculate_provider_rating(db, provider)
-
     return
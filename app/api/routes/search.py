@@ -5,7 +5,7 @@ from sqlalchemy import func, desc, asc
 from typing import Optional
 from datetime import datetime
 
-from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.service import Service
 from app.db.models.user import User
 from app.db.models.category import Category
@@ -64,7 +64,7 @@ def search_services(
     sort: Optional[str] = Query("relevance", description="relevance | price_asc | price_desc | rating_desc | popularity | newest"),
     page: int = Query(1, ge=1),
     per_page: int = Query(12, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """
     Search services with filters, sorting, and pagination.
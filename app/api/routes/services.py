@@ -4,11 +4,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.db.base import get_db
+from app.db.replica import get_read_db
 from app.db.models.service import Service
 from app.db.models.category import Category
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
-from app.core.security import get_current_user
-from app.db.models.user import User
+from app.core.security import get_current_user, Principal
 
 
 router = APIRouter(prefix="/services", tags=["services"])
@@ -19,7 +19,7 @@ router = APIRouter(prefix="/services", tags=["services"])
 def create_service(
     service_data: ServiceCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     # Only providers can create services
     if current_user.role != "provider":
@@ -53,7 +53,7 @@ def create_service(
 @router.get("/provider/services", response_model=list[ServiceResponse])
 def get_my_services(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     if current_user.role != "provider":
         raise HTTPException(403, "Only providers can view their services")
@@ -69,7 +69,7 @@ def update_service(
     service_id: int,
     update_data: ServiceUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     service = db.query(Service).filter(Service.id == service_id).first()
     if not service:
@@ -95,7 +95,7 @@ def update_service(
 def delete_service(
     service_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     service = db.query(Service).filter(Service.id == service_id).first()
     if not service:
@@ -114,7 +114,7 @@ def delete_service(
 # Get services by category
 
 @router.get("/services/category/{category_id}", response_model=list[ServiceResponse])
-def get_services_by_category(category_id: int, db: Session = Depends(get_db)):
+def get_services_by_category(category_id: int, db: Session = Depends(get_read_db)):
     services = (
         db.query(Service)
         .filter(Service.category_id == category_id, Service.is_active == True)
@@ -126,7 +126,7 @@ def get_services_by_category(category_id: int, db: Session = Depends(get_db)):
 # Get services by provider
 
 @router.get("/providers/{provider_id}/services", response_model=list[ServiceResponse])
-def get_provider_services(provider_id: int, db: Session = Depends(get_db)):
+def get_provider_services(provider_id: int, db: Session = Depends(get_read_db)):
     services = (
         db.query(Service)
         .filter(Service.provider_id == provider_id, Service.is_active == True)
@@ -0,0 +1,176 @@
+# app/core/cache.py
+"""
+Small in-process caches. Each API worker keeps its own copy, so entries must be
+short-lived and invalidated explicitly when the underlying rows change.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Thread-safe, size-bounded (LRU) cache whose entries expire after `ttl_seconds`."""
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _Flight:
+    """One in-progress computation of a key; waiters take its result from `future`."""
+    __slots__ = ("future", "current")
+
+    def __init__(self):
+        self.future: Future = Future()
+        # cleared when the key is invalidated mid-computation: the result is handed to the
+        # callers already waiting but not stored
+        self.current = True
+
+
+class SWRCache:
+    """
+    Stale-while-revalidate cache with single-flight.
+
+    Within `ttl` an entry is fresh. For `stale_seconds` after that it is still served, while
+    one background refresh replaces it. Past that it is a miss. On a miss only one caller
+    computes the value; concurrent callers for the same key wait for that result instead
+    of stampeding the database.
+    """
+
+    def __init__(self, stale_seconds: float, maxsize: int = 1024, executor_workers: int = 4):
+        self.stale_seconds = stale_seconds
+        self.maxsize = maxsize
+        # key -> (fresh_until, stale_until, value)
+        self._data: "OrderedDict[Hashable, tuple[float, float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=executor_workers, thread_name_prefix="swr-refresh")
+
+    def _claim(self, key: Hashable) -> Tuple[bool, _Flight]:
+        """(True, flight) if the caller must compute; (False, flight) to wait for another caller."""
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                return False, flight
+            flight = self._inflight[key] = _Flight()
+            return True, flight
+
+    def _finish(self, key: Hashable, flight: _Flight, ttl: float, value: Any = None, error: Optional[BaseException] = None):
+        now = time.monotonic()
+        with self._lock:
+            if flight.current:
+                del self._inflight[key]
+                if error is None:
+                    self._data[key] = (now + ttl, now + ttl + self.stale_seconds, value)
+                    self._data.move_to_end(key)
+                    while len(self._data) > self.maxsize:
+                        self._data.popitem(last=False)
+        if error is None:
+            flight.future.set_result(value)
+        else:
+            flight.future.set_exception(error)
+
+    def _detach_where(self, predicate: Callable[[Hashable], bool]):
+        # caller holds the lock; later readers of these keys start a new computation
+        for key in [k for k in self._inflight if predicate(k)]:
+            self._inflight.pop(key).current = False
+
+    def _refresh(self, key: Hashable, compute: Callable[[], Any], ttl: float, flight: _Flight):
+        try:
+            value = compute()
+        except Exception as e:
+            logger.exception("Background refresh failed for %r", key)
+            self._finish(key, flight, ttl, error=e)
+        else:
+            self._finish(key, flight, ttl, value)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        ttl: float,
+        background_compute: Optional[Callable[[], Any]] = None,
+    ) -> Any:
+        """
+        `compute` runs in the caller's thread on a miss. `background_compute` (defaults to
+        `compute`) runs on the refresh pool for stale hits, so it must not rely on
+        request-scoped resources.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is not None:
+            fresh_until, stale_until, value = entry
+            if now < fresh_until:
+                return value
+            if now < stale_until:
+                owner, flight = self._claim(key)
+                if owner:
+                    self._executor.submit(self._refresh, key, background_compute or compute, ttl, flight)
+                return value
+
+        owner, flight = self._claim(key)
+        if not owner:
+            # the owner's result (or exception), even if the key was invalidated meanwhile
+            return flight.future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            self._finish(key, flight, ttl, error=e)
+            raise
+        self._finish(key, flight, ttl, value)
+        return value
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+            self._detach_where(predicate)
+
+    def expire_where(self, predicate: Callable[[Hashable], bool]):
+        """Mark matching entries stale: still served, but the next read triggers a refresh."""
+        now = time.monotonic()
+        with self._lock:
+            for key, (fresh_until, stale_until, value) in self._data.items():
+                if predicate(key) and fresh_until > now:
+                    self._data[key] = (now, now + self.stale_seconds, value)
+            self._detach_where(predicate)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._detach_where(lambda key: True)
@@ -0,0 +1,65 @@
+# app/core/circuit_breaker.py
+"""
+Consecutive-failure circuit breaker.
+
+closed     calls go through; `failure_threshold` failures in a row open the circuit
+open       calls are refused immediately for `reset_seconds`
+half-open  after that, one trial call is let through; success closes, failure re-opens
+"""
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def is_open(self) -> bool:
+        """True while calls would be refused (does not claim the half-open trial)."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._trial_running = True
+            return True
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("%s circuit closed", self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (self._opened_at is None and self._failures >= self.failure_threshold):
+                logger.warning("%s circuit open after %d failures", self.name, self._failures)
+                self._opened_at = time.monotonic()
+            self._trial_running = False
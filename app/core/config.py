@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings  import BaseSettings  # pyright: ignore[reportMissingImports]
 
 class Settings(BaseSettings):
@@ -6,6 +8,82 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # optional streaming replica for dashboards, search and public listings
+    REPLICA_DATABASE_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 10.0
+    REPLICA_LAG_CHECK_SECONDS: float = 5.0
+    REPLICA_STICKY_SECONDS: float = 30.0
+
+    # background jobs
+    SCHEDULER_ENABLED: bool = True
+    STATS_RECONCILE_INTERVAL_HOURS: int = 24
+    STATS_RECONCILE_DAYS: int = 35
+    LEADERBOARD_REFRESH_MINUTES: int = 15
+    MATVIEW_REFRESH_MINUTES: int = 10
+
+    # leaderboard scoring weights
+    LEADERBOARD_RATING_WEIGHT: float = 0.6
+    LEADERBOARD_EARNINGS_WEIGHT: float = 0.4
+
+    # authenticated principal (with token version) per token subject (see app.core.security)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
+
+    # dashboard response cache (per-role TTL, then served stale while refreshing)
+    DASHBOARD_CACHE_TTL_ADMIN_SECONDS: int = 120
+    DASHBOARD_CACHE_TTL_PROVIDER_SECONDS: int = 30
+    DASHBOARD_CACHE_TTL_CUSTOMER_SECONDS: int = 60
+    DASHBOARD_CACHE_STALE_SECONDS: int = 300
+    DASHBOARD_CACHE_MAXSIZE: int = 4096
+
+    # worker threads for concurrent dashboard sections (1 runs them inline)
+    DASHBOARD_SECTION_WORKERS: int = 8
+
+    # longest range /provider/dashboard/earnings/daily accepts
+    PROVIDER_DAILY_SERIES_MAX_DAYS: int = 366
+
+    # outgoing mail (pooled, persistent connections; see app.core.email)
+    SMTP_HOST: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
+    SMTP_USER: str = ""
+    SMTP_PASSWORD: str = ""
+    SMTP_FROM: str = ""  # defaults to SMTP_USER
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    SMTP_POOL_SIZE: int = 4
+    SMTP_HEALTHCHECK_SECONDS: float = 30.0  # NOOP a connection idle longer than this before reuse
+    SMTP_BREAKER_FAILURES: int = 5
+    SMTP_BREAKER_RESET_SECONDS: float = 60.0
+
+    # notification outbox workers (per process; 0 disables delivery in this process)
+    NOTIFICATION_WORKERS: int = 4
+    NOTIFICATION_CLAIM_BATCH: int = 10  # users per claim, each with all of their due notifications
+    NOTIFICATION_POLL_SECONDS: float = 5.0
+    NOTIFICATION_MAX_ATTEMPTS: int = 8
+    NOTIFICATION_RETRY_BASE_SECONDS: float = 30.0
+    NOTIFICATION_RETRY_MAX_SECONDS: float = 3600.0
+    # notifications for one user inside the same window go out as one digest; 0 sends each right away
+    NOTIFICATION_DIGEST_WINDOW_MINUTES: int = 5
+
+    # bookings.booking_date/booking_time are wall-clock times at the business, which runs on
+    # IST like the users timestamps; jobs comparing them with the clock use this UTC offset
+    BOOKING_UTC_OFFSET_MINUTES: int = 330
+
+    # reminders for accepted bookings, sent this many hours before they start
+    BOOKING_REMINDER_HOURS: int = 24
+    BOOKING_REMINDER_INTERVAL_MINUTES: int = 5
+
+    # pending bookings older than this, or already past their start, become "expired"
+    PENDING_BOOKING_TTL_HOURS: int = 48
+    BOOKING_EXPIRY_INTERVAL_MINUTES: int = 5
+    BOOKING_EXPIRY_BATCH: int = 500
+
+    # columnar snapshot serving admin dashboards (see app.services.analytics_snapshot)
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False
+    ANALYTICS_SNAPSHOT_DIR: str = "var/analytics"
+    ANALYTICS_SNAPSHOT_MINUTES: int = 10
+    ANALYTICS_SNAPSHOT_MAX_AGE_MINUTES: int = 60
+
     class Config:
         env_file = ".env"
 
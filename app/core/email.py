@@ -1,25 +1,193 @@
+# app/core/email.py
+"""
+SMTP transport.
+
+A small pool of long-lived, already authenticated SMTP connections is shared by every
+sender in the process. A connection idle for longer than SMTP_HEALTHCHECK_SECONDS is
+checked with NOOP before reuse; a connection that fails is dropped and replaced once per
+message. send_many() pushes a whole batch through one connection.
+
+A circuit breaker sits in front of the pool: after SMTP_BREAKER_FAILURES consecutive
+connection-level failures, send_many() raises CircuitOpenError immediately (instead of
+waiting out connect timeouts) until a trial send succeeds.
+
+Point SMTP_HOST/SMTP_PORT at any SMTP server, e.g. a local aiosmtpd on localhost:8025 with
+SMTP_STARTTLS=false and no SMTP_USER.
+"""
+import logging
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
+from typing import List, NamedTuple, Optional, Sequence, Tuple
 
-SMTP_HOST = "smtp.gmail.com"
-SMTP_PORT = 587
-SMTP_USER = "your_email@gmail.com"
-SMTP_PASS = "your_app_password"   # DO NOT USE NORMAL PASSWORD
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
 
-def send_email(to_email: str, subject: str, body: str) -> bool:
-    try:
+logger = logging.getLogger(__name__)
+
+Message = Tuple[str, str, str]  # (to_email, subject, body)
+
+
+class SendResult(NamedTuple):
+    ok: bool
+    error: Optional[str] = None
+
+
+SENT = SendResult(True)
+
+
+class _Connection:
+    def __init__(self):
+        self.smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_STARTTLS:
+            self.smtp.starttls()
+        if settings.SMTP_USER:
+            self.smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        self.last_used = time.monotonic()
+
+    def healthy(self) -> bool:
+        if time.monotonic() - self.last_used < settings.SMTP_HEALTHCHECK_SECONDS:
+            return True
+        try:
+            return self.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def close(self):
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self.smtp.close()
+
+
+def _reply(code: Optional[int], reply) -> str:
+    if isinstance(reply, bytes):
+        reply = reply.decode(errors="replace")
+    return f"{code} {reply}" if code else str(reply)
+
+
+# errors meaning the connection itself is gone; anything else is a reply about one message
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, OSError)
+
+
+class SMTPPool:
+    def __init__(self, size: int):
+        self._idle: "queue.LifoQueue[_Connection]" = queue.LifoQueue()
+        # bounds open connections (idle + in use)
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _checkout(self) -> _Connection:
+        # caller holds a slot
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return _Connection()
+            if conn.healthy():
+                return conn
+            conn.close()
+
+    def _release(self, conn: Optional[_Connection]):
+        if conn is not None:
+            conn.last_used = time.monotonic()
+            self._idle.put(conn)
+        self._slots.release()
+
+    def send_many(self, messages: Sequence[Message]) -> List[SendResult]:
+        """
+        Send every message over one pooled connection; one result per message.
+        A message the server refuses fails alone; a lost connection fails the rest of the batch.
+        Raises CircuitOpenError without touching the network while the server is considered down.
+        """
+        smtp_breaker.check()
+        results: List[SendResult] = []
+        error = None
+        conn = None
+        # the slot is released exactly once, in the finally below, whether or not a connection was made
+        self._slots.acquire()
+        try:
+            conn = self._checkout()
+            for to_email, subject, body in messages:
+                result, conn = self._send_one(conn, to_email, subject, body)
+                results.append(result)
+            smtp_breaker.record_success()
+        except (smtplib.SMTPException, OSError) as e:
+            logger.warning("SMTP unavailable, %d message(s) not sent: %s", len(messages) - len(results), e)
+            smtp_breaker.record_failure()
+            error = f"SMTP unavailable: {e}"
+            conn = None
+        except BaseException:
+            # anything else (e.g. a UnicodeEncodeError from sendmail) must still settle a
+            # half-open trial, or the breaker would stay open for good; the connection is
+            # in an unknown state, so it is not pooled again
+            smtp_breaker.record_failure()
+            if conn is not None:
+                conn.close()
+                conn = None
+            raise
+        finally:
+            self._release(conn)
+        # messages not attempted because the connection could not be (re)made
+        return results + [SendResult(False, error)] * (len(messages) - len(results))
+
+    def _send_one(self, conn: _Connection, to_email: str, subject: str, body: str) -> Tuple[SendResult, _Connection]:
         msg = MIMEText(body)
         msg["Subject"] = subject
-        msg["From"] = SMTP_USER
+        msg["From"] = settings.SMTP_FROM or settings.SMTP_USER
         msg["To"] = to_email
+        try:
+            return self._deliver(conn, msg), conn
+        except _CONNECTION_ERRORS as e:
+            logger.warning("SMTP connection lost sending to %s, reconnecting: %s", to_email, e)
+            conn.close()
+        # the pooled connection may have been dropped by the server: one fresh try
+        conn = _Connection()
+        try:
+            return self._deliver(conn, msg), conn
+        except _CONNECTION_ERRORS:
+            conn.close()
+            raise
+
+    def _deliver(self, conn: _Connection, msg: MIMEText) -> SendResult:
+        try:
+            conn.smtp.sendmail(msg["From"], [msg["To"]], msg.as_string())
+        except smtplib.SMTPRecipientsRefused as e:
+            # the connection is fine, the address is not
+            return self._refused(msg, *e.recipients.get(msg["To"], (None, str(e))))
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code == 421:
+                # "service not available, closing channel": a connection failure, not this message's
+                raise smtplib.SMTPServerDisconnected(_reply(e.smtp_code, e.smtp_error)) from e
+            # sender or data refused (e.g. 552): only this message fails, the connection is reused
+            return self._refused(msg, e.smtp_code, e.smtp_error)
+        conn.last_used = time.monotonic()
+        return SENT
 
-        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASS)
-        server.sendmail(SMTP_USER, to_email, msg.as_string())
-        server.quit()
+    def _refused(self, msg: MIMEText, code: Optional[int], reply) -> SendResult:
+        error = _reply(code, reply)
+        logger.warning("SMTP rejected message to %s: %s", msg["To"], error)
+        return SendResult(False, error)
 
-        return True
-    except Exception as e:
-        print("Email Error:", e)
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+smtp_breaker = CircuitBreaker("smtp", settings.SMTP_BREAKER_FAILURES, settings.SMTP_BREAKER_RESET_SECONDS)
+smtp_pool = SMTPPool(settings.SMTP_POOL_SIZE)
+
+
+def send_many(messages: Sequence[Message]) -> List[SendResult]:
+    return smtp_pool.send_many(messages)
+
+
+def send_email(to_email: str, subject: str, body: str) -> bool:
+    try:
+        return send_many([(to_email, subject, body)])[0].ok
+    except CircuitOpenError:
         return False
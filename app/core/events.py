@@ -0,0 +1,60 @@
+# app/core/events.py
+"""
+In-process domain event bus bound to the SQLAlchemy session.
+
+emit() only queues the event on the session. When that session commits, every
+subscriber is called once with the whole batch of events emitted in the transaction,
+inside the transaction (before_commit), so whatever a subscriber writes (e.g. outbox
+rows) commits or rolls back together with the state change that produced the events.
+Subscribers must not commit; slow work belongs in whatever consumes their rows.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING = "pending_domain_events"
+
+Subscriber = Callable[[Session, List["DomainEvent"]], None]
+_subscribers: Dict[str, List[Subscriber]] = {}
+
+
+class DomainEvent(NamedTuple):
+    type: str  # e.g. "booking.created", "booking.accepted"
+    payload: Dict[str, Any]
+
+
+def subscribe(event_type: str, handler: Subscriber):
+    """`event_type` is an exact type, a prefix ending in ".*" (e.g. "booking.*"), or "*"."""
+    _subscribers.setdefault(event_type, []).append(handler)
+
+
+def _matches(pattern: str, event_type: str) -> bool:
+    if pattern == "*":
+        return True
+    if pattern.endswith(".*"):
+        return event_type.startswith(pattern[:-1])
+    return pattern == event_type
+
+
+def emit(db: Session, event_type: str, payload: Optional[Dict[str, Any]] = None):
+    db.info.setdefault(_PENDING, []).append(DomainEvent(event_type, payload or {}))
+
+
+@event.listens_for(Session, "before_commit")
+def _publish(session: Session):
+    events = session.info.pop(_PENDING, [])
+    if not events:
+        return
+    for pattern, handlers in _subscribers.items():
+        batch = [e for e in events if _matches(pattern, e.type)]
+        if not batch:
+            continue
+        for handler in handlers:
+            # a failing subscriber fails the commit: the state change and its events stay atomic
+            handler(session, batch)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session):
+    session.info.pop(_PENDING, None)
@@ -1,31 +1,69 @@
 from datetime import datetime
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 from app.db.models.notification import Notification
-from app.core.email import send_email
+from app.services.notification_outbox import digest_due_at, wake_workers
+
 
-def dispatch_notification(db: Session, *, user, booking, type: str, message: str):
+def queue_notification(db: Session, *, user_id: int, booking_id: Optional[int], type: str, message: str) -> Notification:
+    """Add the outbox row only; the caller's commit publishes it."""
+    now = datetime.utcnow()
     record = Notification(
-        user_id=user.id,
-        booking_id=booking.id if booking else None,
+        user_id=user_id,
+        booking_id=booking_id,
         channel="email",  # for now only email
         type=type,
         message=message,
         is_sent=False,
+        created_at=now,
+        # held until the end of the user's digest window
+        next_attempt_at=digest_due_at(user_id, now),
     )
     db.add(record)
-    db.commit()
-    db.refresh(record)
-
-    # Try sending email now (sync)
-    success = send_email(
-        to_email=user.email,
-        subject=f"Booking Update: {type}",
-        body=message,
-    )
+    return record
+
 
-    if success:
-        record.is_sent = True
-        record.sent_at = datetime.utcnow()
+def queue_notifications(db: Session, rows: Iterable[Tuple[int, Optional[int], str, str]]) -> int:
+    """Bulk queue_notification(): one INSERT for many (user_id, booking_id, type, message) rows."""
+    now = datetime.utcnow()
+    values = [
+        {
+            "user_id": user_id,
+            "booking_id": booking_id,
+            "channel": "email",
+            "type": type,
+            "message": message,
+            "is_sent": False,
+            "created_at": now,
+            "next_attempt_at": digest_due_at(user_id, now),
+        }
+        for user_id, booking_id, type, message in rows
+    ]
+    if values:
+        db.execute(insert(Notification), values)
+    return len(values)
+
+
+def wake_workers_after_commit(db: Session):
+    # wake local workers once the rows are visible to them
+    event.listen(db, "after_commit", lambda session: wake_workers(), once=True)
+
+
+def dispatch_notification(db: Session, *, user, booking, type: str, message: str, commit: bool = True):
+    """
+    Queue a notification: the row is the outbox entry and delivery happens on the
+    notification workers (app.services.notification_outbox), never on the request thread.
+    With commit=False the row is only added, so it is published by the caller's commit
+    together with the change it describes.
+    """
+    record = queue_notification(
+        db, user_id=user.id, booking_id=booking.id if booking else None, type=type, message=message
+    )
+    wake_workers_after_commit(db)
+    if commit:
         db.commit()
+        db.refresh(record)
 
     return record
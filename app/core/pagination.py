@@ -0,0 +1,27 @@
+# app/core/pagination.py
+"""
+Opaque keyset cursors: the (created_at, id) of the last row returned, base64-encoded.
+Pages are fetched with WHERE (created_at, id) < cursor ORDER BY created_at DESC, id DESC,
+so each page is an index range scan no matter how deep the client scrolls.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,83 @@
+# app/core/scheduler.py
+"""
+Minimal in-process periodic job runner.
+Every API worker starts the same jobs; a PostgreSQL advisory lock per job makes sure
+only one worker runs a given job at a time.
+"""
+import logging
+import threading
+import zlib
+from typing import Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+_jobs: List["Job"] = []
+_threads: List[threading.Thread] = []
+_stop = threading.Event()
+
+
+class Job:
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[Session], None], run_at_start: bool = False):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.func = func
+        self.run_at_start = run_at_start
+        # stable across processes so every worker competes for the same lock
+        self.lock_key = zlib.crc32(name.encode())
+
+    def run_once(self) -> bool:
+        """Run the job if no other worker holds its lock. Returns True if it ran."""
+        with engine.connect() as lock_conn:
+            got_lock = lock_conn.execute(text("SELECT pg_try_advisory_lock(:k)"), {"k": self.lock_key}).scalar()
+            if not got_lock:
+                return False
+            try:
+                db = SessionLocal()
+                try:
+                    self.func(db)
+                finally:
+                    db.close()
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": self.lock_key})
+                lock_conn.commit()
+        return True
+
+    def loop(self):
+        if not self.run_at_start and _stop.wait(self.interval_seconds):
+            return
+        while not _stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Scheduled job %s failed", self.name)
+            if _stop.wait(self.interval_seconds):
+                return
+
+
+def register_job(name: str, interval_seconds: float, func: Callable[[Session], None], run_at_start: bool = False) -> Job:
+    job = Job(name, interval_seconds, func, run_at_start=run_at_start)
+    _jobs.append(job)
+    return job
+
+
+def start_scheduler():
+    if not settings.SCHEDULER_ENABLED or _threads:
+        return
+    _stop.clear()
+    for job in _jobs:
+        t = threading.Thread(target=job.loop, name=f"job-{job.name}", daemon=True)
+        t.start()
+        _threads.append(t)
+
+
+def stop_scheduler():
+    _stop.set()
+    for t in _threads:
+        t.join(timeout=5)
+    _threads.clear()
@@ -1,9 +1,12 @@
 from passlib.context import CryptContext  # type: ignore[import]  # no typing stubs
 from jose import jwt, JWTError  # type: ignore[import]  # jose doesn't ship type info
 from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from app.core.cache import TTLCache
 from app.core.config import settings
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.db.models.user import User
@@ -19,38 +22,112 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
-def create_access_token(data: dict):
+def create_access_token(data: dict, user: User):
     to_encode = data.copy()
+    # id, role and token version let role-gated routes authorize without loading the user
+    to_encode.update({"uid": user.id, "role": user.role, "ver": user.token_version or 0})
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+class Principal(NamedTuple):
+    """
+    The authenticated caller as routes see it. Loaded with a single column query (none of
+    User's selectin relationships); routes that need the profile load the User by id.
+    """
+    id: int
+    email: str
+    role: str
+    is_active: Optional[bool]
+    is_provider_approved: Optional[bool]
+    token_version: int
+
+
+# keyed by token subject. Per worker: invalidate_principal() clears the local copy and the
+# short TTL bounds how long other workers see a changed role/active/approval flag.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_TTL_SECONDS, maxsize=settings.PRINCIPAL_CACHE_MAXSIZE)
+
+
+def invalidate_principal(email: str):
+    principal_cache.invalidate(email)
+
+
+def revoke_tokens(db: Session, user: User):
+    """Invalidate every token issued to `user` so far, once the caller commits."""
+    user.token_version = User.token_version + 1
+    email = user.email
+    event.listen(db, "after_commit", lambda session: invalidate_principal(email), once=True)
+
+
+def _decode(token: str) -> dict:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if not email:
-            raise HTTPException(status_code=401, detail="Invalid authentication")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication")
+    # tokens issued before versioned claims existed cannot be revoked, so they are refused
+    if not payload.get("sub") or payload.get("ver") is None:
+        raise HTTPException(status_code=401, detail="Invalid authentication")
+    return payload
 
-    user = db.query(User).filter(User.email == email).first()
 
-    if not user:
+def _load_principal(db: Session, email: str) -> Principal:
+    row = (
+        db.query(User.id, User.email, User.role, User.is_active, User.is_provider_approved, User.token_version)
+        .filter(User.email == email)
+        .first()
+    )
+    if not row:
         raise HTTPException(status_code=401, detail="User not found")
+    principal = Principal(*row)
+    principal_cache.set(email, principal)
+    return principal
+
+
+def _principal(db: Session, payload: dict) -> Principal:
+    email = payload["sub"]
+    principal = principal_cache.get(email)
+    if principal is None or payload["ver"] > principal.token_version:
+        # a newer version than cached: tokens were revoked through another worker, whose
+        # invalidation this worker never saw, and this token was issued after that
+        principal = _load_principal(db, email)
+    if payload["ver"] != principal.token_version:
+        raise HTTPException(status_code=401, detail="Token revoked")
+    return principal
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    return _principal(db, _decode(token))
+
+
+def require_role(*roles: str):
+    """
+    Dependency for role-gated routes: the role claim is checked before anything else, so
+    other roles are refused without any lookup; the token version is then checked through
+    the principal cache, and the role again against the principal.
+    """
+    detail = f"{'/'.join(r.capitalize() for r in roles)} access only"
 
-    return user
+    def dependency(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+        payload = _decode(token)
+        if payload.get("role") not in roles:
+            raise HTTPException(status_code=403, detail=detail)
+        principal = _principal(db, payload)
+        if principal.role not in roles:
+            # role changed since the token was issued
+            raise HTTPException(status_code=403, detail=detail)
+        return principal
+    return dependency
 
 
 
-def require_admin(current_user: User = Depends(get_current_user)):
+def require_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Admin access only")
     return current_user
 
-def require_provider(current_user: User = Depends(get_current_user)):
+def require_provider(current_user: Principal = Depends(get_current_user)):
     if current_user.role != "provider":
         raise HTTPException(status_code=403, detail="Provider access only")
     return current_user
@@ -0,0 +1,85 @@
+# app/core/time_windows.py
+"""
+Half-open [start, end) timestamp ranges for dashboard filters.
+Filtering with `col >= start AND col < end` lets PostgreSQL use a btree index on the
+column, unlike extract('month', col) == m which forces a scan.
+"""
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import and_
+
+from app.core.config import settings
+
+
+class TimeWindow(NamedTuple):
+    start: datetime
+    end: datetime  # exclusive
+
+    @property
+    def first_day(self) -> date:
+        return self.start.date()
+
+    @property
+    def last_day(self) -> date:
+        # last calendar day that intersects the window
+        return (self.end - timedelta(microseconds=1)).date()
+
+    @property
+    def days(self) -> int:
+        return (self.last_day - self.first_day).days + 1
+
+    def clause(self, column):
+        return and_(column >= self.start, column < self.end)
+
+
+def _midnight(d: date) -> datetime:
+    return datetime.combine(d, datetime.min.time())
+
+
+def shift_month(year: int, month: int, delta: int):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def day_window(d: date) -> TimeWindow:
+    return TimeWindow(_midnight(d), _midnight(d + timedelta(days=1)))
+
+
+def month_window(year: int, month: int) -> TimeWindow:
+    next_year, next_month = shift_month(year, month, 1)
+    return TimeWindow(datetime(year, month, 1), datetime(next_year, next_month, 1))
+
+
+def date_range_window(date_from: date, date_to: date) -> TimeWindow:
+    """Both calendar days included."""
+    return TimeWindow(_midnight(date_from), _midnight(date_to + timedelta(days=1)))
+
+
+def last_days_window(days: int, now: Optional[datetime] = None) -> TimeWindow:
+    """The last `days` calendar days, today included."""
+    today = (now or datetime.utcnow()).date()
+    return date_range_window(today - timedelta(days=days - 1), today)
+
+
+def current_month_window(now: Optional[datetime] = None) -> TimeWindow:
+    now = now or datetime.utcnow()
+    return month_window(now.year, now.month)
+
+
+def recent_month_windows(months: int, now: Optional[datetime] = None) -> List[TimeWindow]:
+    """The last `months` calendar months, current month included, oldest first."""
+    now = now or datetime.utcnow()
+    result = []
+    for i in range(months - 1, -1, -1):
+        y, m = shift_month(now.year, now.month, -i)
+        result.append(month_window(y, m))
+    return result
+
+
+def booking_clock(utc_now: Optional[datetime] = None) -> datetime:
+    """
+    Naive local time comparable with bookings.booking_date/booking_time, which are
+    wall-clock times at the business (settings.BOOKING_UTC_OFFSET_MINUTES), not UTC.
+    """
+    return (utc_now or datetime.utcnow()) + timedelta(minutes=settings.BOOKING_UTC_OFFSET_MINUTES)
@@ -18,4 +18,4 @@ def get_db():
 
 
 # IMPORTANT: import models so they register with Base
-from app.db.models import user, category, service, booking, review, availability
+from app.db.models import user, category, service, booking, review, availability, booking_daily_stats, leaderboard, view_refresh, earnings_ledger, notification, booking_reminder, job_watermark, primary_read_pin
@@ -0,0 +1,61 @@
+# app/db/loaders.py
+"""
+Request-scoped batch loading (dataloader style).
+Collect the ids a route needs, fetch them with one `IN` query per model, and memoize
+the result for the rest of the request, instead of one query per row.
+"""
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from sqlalchemy.orm import Session, lazyload
+
+
+class BatchLoader:
+    def __init__(self, db: Session, model):
+        self.db = db
+        self.model = model
+        self._cache: Dict[Hashable, Optional[Any]] = {}
+        self._pending: set = set()
+
+    def prime(self, ids: Iterable[Hashable]) -> "BatchLoader":
+        """Queue ids for the next fetch; nothing is queried until a load."""
+        self._pending.update(i for i in ids if i is not None and i not in self._cache)
+        return self
+
+    def _fetch(self):
+        if not self._pending:
+            return
+        ids = list(self._pending)
+        self._pending.clear()
+        # relationships load lazily on access; dashboards mostly need plain columns
+        rows = self.db.query(self.model).options(lazyload("*")).filter(self.model.id.in_(ids)).all()
+        found = {row.id: row for row in rows}
+        for i in ids:
+            self._cache[i] = found.get(i)
+
+    def load(self, id: Hashable) -> Optional[Any]:
+        if id is None:
+            return None
+        if id not in self._cache:
+            self._pending.add(id)
+            self._fetch()
+        return self._cache.get(id)
+
+    def load_many(self, ids: Iterable[Hashable]) -> Dict[Hashable, Optional[Any]]:
+        ids = list(ids)
+        self.prime(ids)
+        self._fetch()
+        return {i: self._cache.get(i) for i in ids}
+
+
+class Loaders:
+    """One BatchLoader per model, shared by everything in the request."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._loaders: Dict[Any, BatchLoader] = {}
+
+    def __call__(self, model) -> BatchLoader:
+        loader = self._loaders.get(model)
+        if loader is None:
+            loader = self._loaders[model] = BatchLoader(self.db, model)
+        return loader
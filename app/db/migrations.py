@@ -0,0 +1,62 @@
+# app/db/migrations.py
+"""
+Schema upgrades for tables that predate the current models.
+
+create_all only creates missing tables: columns and indexes added later to users,
+bookings, reviews and notifications are never created on an existing database. They are
+listed here and added with idempotent DDL (ADD COLUMN IF NOT EXISTS, CREATE INDEX IF NOT
+EXISTS) compiled from the models themselves, so running this on every startup is a no-op
+once the database is current. New NOT NULL columns all carry a server default, which
+fills the existing rows; the rating aggregates are then backfilled by the
+provider_ratings_repair job.
+"""
+from typing import Dict, List
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from app.db.base import Base
+
+# columns added to existing tables, in the order they were introduced
+ADDED_COLUMNS: Dict[str, List[str]] = {
+    "users": [
+        "rating_sum",
+        "rating_count_1", "rating_count_2", "rating_count_3", "rating_count_4", "rating_count_5",
+        "token_version",
+    ],
+    "notifications": ["attempts", "next_attempt_at", "last_error", "failed_at"],
+}
+
+# indexes added to existing tables
+ADDED_INDEXES: Dict[str, List[str]] = {
+    "bookings": [
+        "ix_bookings_provider_status_created",
+        "ix_bookings_customer_status_created",
+        "ix_bookings_accepted_start",
+        "ix_bookings_pending_created",
+        "ix_bookings_pending_start",
+    ],
+    "reviews": ["ix_reviews_provider_created"],
+    "notifications": ["ix_notifications_unsent_due"],
+}
+
+
+def _table(name: str) -> Table:
+    return Base.metadata.tables[name]
+
+
+def upgrade_schema(conn: Connection):
+    """Bring tables created by an older version up to the models; safe to run repeatedly."""
+    dialect = conn.dialect
+    for table_name, columns in ADDED_COLUMNS.items():
+        table = _table(table_name)
+        for name in columns:
+            column_ddl = CreateColumn(table.c[name]).compile(dialect=dialect)
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {column_ddl}"))
+    # columns first: the indexes may cover them
+    for table_name, index_names in ADDED_INDEXES.items():
+        indexes = {index.name: index for index in _table(table_name).indexes}
+        for name in index_names:
+            conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+    conn.commit()
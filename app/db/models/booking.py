@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Float, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Float, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +6,20 @@ from app.db.base import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # provider dashboards: status counts and month/range earnings become index range scans
+        Index("ix_bookings_provider_status_created", "provider_id", "status", "created_at"),
+        Index("ix_bookings_customer_status_created", "customer_id", "status", "created_at"),
+        # reminder scan: accepted bookings by start time, answered from the index alone
+        Index(
+            "ix_bookings_accepted_start", "booking_date", "booking_time",
+            postgresql_include=["id", "customer_id", "provider_id"],
+            postgresql_where=text("status = 'accepted'"),
+        ),
+        # expiry sweep: only pending bookings are indexed, by age and by start time
+        Index("ix_bookings_pending_created", "created_at", postgresql_where=text("status = 'pending'")),
+        Index("ix_bookings_pending_start", "booking_date", "booking_time", postgresql_where=text("status = 'pending'")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
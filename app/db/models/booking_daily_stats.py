@@ -0,0 +1,26 @@
+# app/db/models/booking_daily_stats.py
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Float, Index
+from app.db.base import Base
+
+
+class BookingDailyStat(Base):
+    """
+    Rollup of bookings per created day, provider, service and status.
+    category_id is carried along from the service so category charts need no join.
+    Maintained incrementally on booking writes (app.services.booking_stats) and
+    rebuilt for recent days by the nightly reconcile job.
+    """
+    __tablename__ = "booking_daily_stats"
+    __table_args__ = (
+        Index("ix_booking_daily_stats_provider_day", "provider_id", "day"),
+        Index("ix_booking_daily_stats_category_day", "category_id", "day"),
+    )
+
+    day = Column(Date, primary_key=True)
+    provider_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String, primary_key=True)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+
+    bookings_count = Column(Integer, nullable=False, default=0)
+    amount_sum = Column(Float, nullable=False, default=0)
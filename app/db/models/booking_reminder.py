@@ -0,0 +1,13 @@
+# app/db/models/booking_reminder.py
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from app.db.base import Base
+
+
+class BookingReminder(Base):
+    """One row per reminded booking; the primary key makes enqueuing a reminder idempotent."""
+    __tablename__ = "booking_reminders"
+
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, SmallInteger, String, ForeignKey, Date, Float, DateTime, Index
+from datetime import datetime
+from app.db.base import Base
+
+
+class ProviderEarningsEntry(Base):
+    """
+    Append-only provider earnings ledger. Rows are never updated or deleted; a booking's
+    earnings are the sum of its entries, and corrections are new entries (a reversal
+    brings the booking's net back to zero).
+    period is the first day of the month the earning is reported in (the booking's
+    created month, like the rest of the dashboards).
+    """
+    __tablename__ = "provider_earnings_ledger"
+    __table_args__ = (
+        Index("ix_provider_earnings_ledger_provider_period", "provider_id", "period"),
+        Index("ix_provider_earnings_ledger_booking", "booking_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    provider_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False)
+    service_id = Column(Integer, ForeignKey("services.id", ondelete="SET NULL"), nullable=True)
+    period = Column(Date, nullable=False)
+
+    kind = Column(String, nullable=False)  # credit | reversal | adjustment
+    amount = Column(Float, nullable=False)  # signed
+    completed_delta = Column(SmallInteger, nullable=False, default=0)  # +1 credit, -1 reversal
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ProviderMonthlyEarnings(Base):
+    """Running totals of the ledger per provider and month, updated in the same transaction."""
+    __tablename__ = "provider_monthly_earnings"
+
+    provider_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    period = Column(Date, primary_key=True)
+
+    amount = Column(Float, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,12 @@
+# app/db/models/job_watermark.py
+from sqlalchemy import Column, String, DateTime
+from app.db.base import Base
+
+
+class JobWatermark(Base):
+    """How far an incremental job has processed; the next run starts after `watermark`."""
+    __tablename__ = "job_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
@@ -0,0 +1,22 @@
+# app/db/models/leaderboard.py
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from app.db.base import Base
+
+
+class ProviderLeaderboardEntry(Base):
+    """
+    Precomputed provider ranking, rebuilt in one batch by app.services.leaderboard.
+    rank is unique (1 = best) so top-K is an index range scan and a provider's rank is a PK lookup.
+    """
+    __tablename__ = "provider_leaderboard"
+
+    provider_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, nullable=False, unique=True, index=True)
+    score = Column(Float, nullable=False)
+
+    avg_rating = Column(Float, nullable=False, default=0)
+    rating_count = Column(Integer, nullable=False, default=0)
+    total_earnings = Column(Float, nullable=False, default=0)
+    completed_bookings = Column(Integer, nullable=False, default=0)
+
+    computed_at = Column(DateTime, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -6,6 +6,14 @@ from app.db.base import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # outbox scan: only rows still waiting for delivery are indexed, ordered by when they are due;
+        # user_id lets the claim pick due users without reading the rows themselves
+        Index(
+            "ix_notifications_unsent_due", "next_attempt_at", "user_id", "id",
+            postgresql_where=text("is_sent = false AND failed_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -20,5 +28,11 @@ class Notification(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     sent_at = Column(DateTime, nullable=True)
 
+    # delivery retries (app.services.notification_outbox)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=text("(now() at time zone 'utc')"))
+    last_error = Column(String, nullable=True)
+    failed_at = Column(DateTime, nullable=True)  # gave up after NOTIFICATION_MAX_ATTEMPTS
+
     user = relationship("User")
     booking = relationship("Booking", lazy="joined")
@@ -0,0 +1,11 @@
+# app/db/models/primary_read_pin.py
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from app.db.base import Base
+
+
+class PrimaryReadPin(Base):
+    """A user whose reads go to the primary until `until` (naive UTC); see app.db.replica."""
+    __tablename__ = "primary_read_pins"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    until = Column(DateTime, nullable=False)
@@ -1,10 +1,14 @@
 # app/db/models/review.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
 class Review(Base):
     __tablename__ = "reviews"
+    __table_args__ = (
+        # keyset pages per provider: (created_at, id) < cursor, newest first
+        Index("ix_reviews_provider_created", "provider_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, unique=True)
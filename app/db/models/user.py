@@ -28,12 +28,23 @@ class User(Base):
     address = Column(String, nullable=True)
     description = Column(String, nullable=True)
 
+    # maintained incrementally by app.services.provider_ratings
     avg_rating = Column(Float, nullable=True, default=0)
     rating_count = Column(Integer, nullable=True, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    # star histogram: reviews per rating value
+    rating_count_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_count_5 = Column(Integer, nullable=False, default=0, server_default="0")
 
     is_active = Column(Boolean, nullable=True)
     is_provider_approved = Column(Boolean, nullable=True)
 
+    # carried as the "ver" JWT claim; bumping it revokes every token issued so far
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(IST), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(IST), onupdate=lambda: datetime.now(IST))
 
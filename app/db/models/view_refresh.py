@@ -0,0 +1,11 @@
+# app/db/models/view_refresh.py
+from sqlalchemy import Column, String, DateTime
+from app.db.base import Base
+
+
+class MaterializedViewRefresh(Base):
+    """Last successful refresh of each managed materialized view (see app.db.views)."""
+    __tablename__ = "materialized_view_refreshes"
+
+    name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime, nullable=False)
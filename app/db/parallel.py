@@ -0,0 +1,43 @@
+# app/db/parallel.py
+"""
+Run independent dashboard sections concurrently.
+Each section is a callable taking a Session; it gets its own session (and so its own
+pooled connection) on a worker thread, so a route waits for its slowest section rather
+than the sum of all of them. Results come back keyed like the input.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+
+# shared by all requests; keep it at or below the engine pool (pool_size + max_overflow)
+_executor = ThreadPoolExecutor(
+    max_workers=max(settings.DASHBOARD_SECTION_WORKERS, 1),
+    thread_name_prefix="dashboard-section",
+)
+
+
+def _run(section: Callable[[Session], Any], session_factory: sessionmaker):
+    db = session_factory()
+    try:
+        return section(db)
+    finally:
+        db.close()
+
+
+def run_sections(
+    sections: Dict[str, Callable[[Session], Any]],
+    session_factory: Optional[sessionmaker] = None,
+) -> Dict[str, Any]:
+    """
+    Run every section on its own session and wait for all; the first error is re-raised.
+    Sessions come from `session_factory` (e.g. replica.read_sessionmaker()), default primary.
+    """
+    session_factory = session_factory or SessionLocal
+    if settings.DASHBOARD_SECTION_WORKERS <= 1:
+        return {name: _run(section, session_factory) for name, section in sections.items()}
+    futures = {name: _executor.submit(_run, section, session_factory) for name, section in sections.items()}
+    return {name: future.result() for name, future in futures.items()}
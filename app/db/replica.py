@@ -0,0 +1,125 @@
+# app/db/replica.py
+"""
+Read-replica routing.
+
+Dashboards, search and public listings depend on get_read_db / get_user_read_db instead
+of get_db. Those sessions go to REPLICA_DATABASE_URL when it is configured and its
+replay lag is under REPLICA_MAX_LAG_SECONDS; otherwise they fall back to the primary.
+Writes always use get_db. After a booking write, both parties' reads are pinned to
+the primary for REPLICA_STICKY_SECONDS so they see what was just written. The pin is a
+primary_read_pins row written in the booking's own transaction, so it holds whichever
+API worker serves the next read; it is looked up (one primary key read on the primary)
+only when a user's read would otherwise go to the replica.
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.security import get_current_user, Principal
+from app.db.base import SessionLocal
+from app.db.models.primary_read_pin import PrimaryReadPin
+
+logger = logging.getLogger(__name__)
+
+replica_engine = (
+    create_engine(settings.REPLICA_DATABASE_URL, pool_pre_ping=True)
+    if settings.REPLICA_DATABASE_URL else None
+)
+ReplicaSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+    if replica_engine is not None else None
+)
+
+# 0 when the replica has replayed everything it received (an idle primary sends nothing,
+# so the last replay timestamp alone would read as growing lag)
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_lock = threading.Lock()
+_lag_checked_at = 0.0
+_replica_ok = False
+
+
+def _measure_lag() -> Optional[float]:
+    with replica_engine.connect() as conn:
+        lag = conn.execute(_LAG_SQL).scalar()
+    return float(lag) if lag is not None else None
+
+
+def replica_available() -> bool:
+    """Whether reads may go to the replica; the lag is re-measured at most every REPLICA_LAG_CHECK_SECONDS."""
+    global _lag_checked_at, _replica_ok
+    if replica_engine is None:
+        return False
+    now = time.monotonic()
+    with _lock:
+        if now - _lag_checked_at < settings.REPLICA_LAG_CHECK_SECONDS:
+            return _replica_ok
+        _lag_checked_at = now
+    try:
+        lag = _measure_lag()
+        ok = lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not ok:
+            logger.warning("replica lag %s s over limit, reading from primary", lag)
+    except Exception:
+        logger.exception("replica lag check failed, reading from primary")
+        ok = False
+    with _lock:
+        _replica_ok = ok
+    return ok
+
+
+def pin_to_primary(db: Session, *user_ids: Optional[int]):
+    """
+    Route these users' reads to the primary for the next REPLICA_STICKY_SECONDS, on every
+    worker. Written in `db`'s transaction: the pin commits together with the write it covers.
+    """
+    # sorted: concurrent writers lock the pin rows in the same order
+    user_ids = sorted({user_id for user_id in user_ids if user_id is not None})
+    if replica_engine is None or not user_ids:
+        return
+    until = datetime.utcnow() + timedelta(seconds=settings.REPLICA_STICKY_SECONDS)
+    stmt = insert(PrimaryReadPin).values([{"user_id": user_id, "until": until} for user_id in user_ids])
+    db.execute(stmt.on_conflict_do_update(index_elements=[PrimaryReadPin.user_id], set_={"until": stmt.excluded.until}))
+
+
+def _is_pinned(user_id: Optional[int]) -> bool:
+    if user_id is None:
+        return False
+    # on the primary: the replica may not have the pin yet, which is the whole point
+    with SessionLocal() as db:
+        until = db.query(PrimaryReadPin.until).filter(PrimaryReadPin.user_id == user_id).scalar()
+    return until is not None and until > datetime.utcnow()
+
+
+def read_sessionmaker(user_id: Optional[int] = None):
+    """Session factory for read-only work: the replica when healthy and the user is not pinned."""
+    if replica_available() and not _is_pinned(user_id):
+        return ReplicaSessionLocal
+    return SessionLocal
+
+
+def get_read_db():
+    db = read_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_user_read_db(current_user: Principal = Depends(get_current_user)):
+    db = read_sessionmaker(current_user.id if current_user else None)()
+    try:
+        yield db
+    finally:
+        db.close()
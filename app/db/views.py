@@ -0,0 +1,102 @@
+# app/db/views.py
+"""
+Managed materialized views for dashboard series that would otherwise scan bookings/users
+on every request. Views are created at startup, refreshed CONCURRENTLY by a scheduled job
+(readers are never blocked) and every refresh is stamped in materialized_view_refreshes
+so endpoints can report how stale they are.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Column, Date, Integer, MetaData, Table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.models.view_refresh import MaterializedViewRefresh
+
+# kept out of Base.metadata so create_all never tries to create them as tables
+_view_metadata = MetaData()
+
+
+class MaterializedView:
+    def __init__(self, table: Table, definition: str, unique_columns: List[str]):
+        self.table = table
+        self.name = table.name
+        self.definition = definition
+        self.unique_columns = unique_columns
+
+    def create(self, conn: Connection):
+        conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {self.name} AS {self.definition}"))
+        # a unique index is what allows REFRESH ... CONCURRENTLY
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{self.name} ON {self.name} ({', '.join(self.unique_columns)})"
+        ))
+
+
+# weekday (ISO 1..7) x hour booking counts over the last 30 days (bookings.created_at is naive UTC)
+bookings_heatmap = MaterializedView(
+    Table(
+        "mv_bookings_heatmap", _view_metadata,
+        Column("weekday", Integer, primary_key=True),
+        Column("hour", Integer, primary_key=True),
+        Column("bookings", Integer),
+    ),
+    """
+    SELECT EXTRACT(isodow FROM created_at)::int AS weekday,
+           EXTRACT(hour FROM created_at)::int AS hour,
+           count(*)::int AS bookings
+    FROM bookings
+    WHERE created_at >= date_trunc('day', now() AT TIME ZONE 'UTC') - interval '29 days'
+    GROUP BY 1, 2
+    """,
+    ["weekday", "hour"],
+)
+
+# new providers per day over the last 30 days
+provider_growth_daily = MaterializedView(
+    Table(
+        "mv_provider_growth_daily", _view_metadata,
+        Column("day", Date, primary_key=True),
+        Column("new_providers", Integer),
+    ),
+    """
+    SELECT date_trunc('day', created_at)::date AS day,
+           count(*)::int AS new_providers
+    FROM users
+    WHERE role = 'provider' AND created_at >= date_trunc('day', now()) - interval '29 days'
+    GROUP BY 1
+    """,
+    ["day"],
+)
+
+VIEWS = [bookings_heatmap, provider_growth_daily]
+
+
+def _stamp(db, name: str, when: datetime):
+    stmt = insert(MaterializedViewRefresh).values(name=name, refreshed_at=when)
+    db.execute(stmt.on_conflict_do_update(index_elements=[MaterializedViewRefresh.name], set_={"refreshed_at": when}))
+
+
+def create_views(conn: Connection):
+    """Idempotent; CREATE ... AS populates the view, so it counts as a refresh."""
+    for view in VIEWS:
+        exists = conn.execute(text("SELECT to_regclass(:n)"), {"n": view.name}).scalar()
+        view.create(conn)
+        if not exists:
+            _stamp(conn, view.name, datetime.utcnow())
+    conn.commit()
+
+
+def refresh_views(db: Session):
+    for view in VIEWS:
+        started = datetime.utcnow()
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"))
+        _stamp(db, view.name, started)
+        db.commit()
+
+
+def refreshed_at(db: Session) -> Dict[str, Optional[datetime]]:
+    rows = db.query(MaterializedViewRefresh).filter(MaterializedViewRefresh.name.in_([v.name for v in VIEWS])).all()
+    found = {r.name: r.refreshed_at for r in rows}
+    return {v.name: found.get(v.name) for v in VIEWS}
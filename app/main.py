@@ -1,5 +1,7 @@
 from fastapi import FastAPI
 from app.db.base import Base, engine
+from app.db.views import create_views
+from app.db.migrations import upgrade_schema
 from app.api.routes import auth
 from app.api.routes import admin as admin_router
 from app.api.routes import provider as provider_router
@@ -15,6 +17,10 @@ from app.api.routes import admin_dashboard as admin_dashboard_router
 from app.api.routes import admin_dashboard_advanced as admin_dashboard_advanced_router
 from app.api.routes import customer_dashboard_advanced as customer_dashboard_advanced_router
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.scheduler import start_scheduler, stop_scheduler
+from app.services.jobs import register_jobs
+from app.services.booking_notifications import register_subscribers
+from app.services.notification_outbox import start_notification_workers, stop_notification_workers
 
 app = FastAPI()
 
@@ -24,11 +30,25 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    # keyset cursor of GET /reviews/provider/{id}
+    expose_headers=["X-Next-Cursor"],
 )
 
 @app.on_event("startup")
 def startup():
     Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        upgrade_schema(conn)
+        create_views(conn)
+    register_jobs()
+    register_subscribers()
+    start_scheduler()
+    start_notification_workers()
+
+@app.on_event("shutdown")
+def shutdown():
+    stop_notification_workers()
+    stop_scheduler()
 
 @app.get("/")
 def root():
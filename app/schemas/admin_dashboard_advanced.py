@@ -19,6 +19,7 @@ class CategoryDistributionItem(BaseModel):
     earnings: float
 
 class LeaderboardItem(BaseModel):
+    rank: Optional[int] = None
     provider_id: int
     provider_name: Optional[str]
     avg_rating: Optional[float]
@@ -27,11 +28,28 @@ class LeaderboardItem(BaseModel):
     completed_bookings: int
     score: float  # hybrid score used for ranking
 
+class LeaderboardPage(BaseModel):
+    total_ranked: int
+    computed_at: Optional[datetime]
+    items: List[LeaderboardItem]
+
+class LeaderboardRankResponse(BaseModel):
+    provider_id: int
+    rank: int
+    total_ranked: int
+    score: float
+    computed_at: datetime
+
 class HeatmapPoint(BaseModel):
     weekday: int   # 1..7
     hour: int      # 0..23
     bookings: int
 
+class SeriesFreshness(BaseModel):
+    name: str
+    refreshed_at: Optional[datetime]
+    staleness_seconds: Optional[float]
+
 class AdminAdvancedResponse(BaseModel):
     # keep previous high-level KPIs block
     total_users: int
@@ -45,6 +63,7 @@ class AdminAdvancedResponse(BaseModel):
     provider_leaderboard: List[LeaderboardItem]
     bookings_heatmap: List[HeatmapPoint]
     cancellation_rate_percent: float
+    series_freshness: List[SeriesFreshness] = []
 
     class Config:
         from_attributes = True
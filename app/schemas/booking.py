@@ -16,7 +16,7 @@ class BookingCreate(BaseModel):
 class BookingUpdate(BaseModel):
     status: Optional[str] = Field(
         default=None,
-        description="Allowed values: pending, accepted, rejected, completed, canceled"
+        description="Allowed values: pending, accepted, rejected, completed, canceled, expired"
     )
 
 
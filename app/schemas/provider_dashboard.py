@@ -1,7 +1,7 @@
 # app/schemas/provider_dashboard.py
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
 
 class TopServiceItem(BaseModel):
     service_id: int
@@ -38,6 +38,20 @@ class EarningsResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class DailyEarningsPoint(BaseModel):
+    date: date
+    bookings: int
+    completed_bookings: int
+    earnings: float
+
+class DailyEarningsResponse(BaseModel):
+    provider_id: int
+    start: date
+    end: date
+    total_earnings: float
+    completed_bookings: int
+    points: List[DailyEarningsPoint]  # one per day, days without bookings included
+
 class BookingsStatsResponse(BaseModel):
     total: int
     completed: int
@@ -61,7 +75,10 @@ class ReviewMini(BaseModel):
 
 class ReviewsResponse(BaseModel):
     average_rating: float | None
+    rating_count: int = 0
+    rating_histogram: Dict[int, int] = {}
     reviews: List[ReviewMini]
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -1,6 +1,6 @@
 # app/schemas/review.py
 from pydantic import BaseModel, Field, conint
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 class ReviewCreate(BaseModel):
@@ -19,3 +19,9 @@ class ReviewResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class RatingSummary(BaseModel):
+    provider_id: int
+    average_rating: Optional[float]
+    rating_count: int
+    histogram: Dict[int, int]  # stars (1-5) -> number of reviews
@@ -0,0 +1,323 @@
+# app/services/analytics_snapshot.py
+"""
+Columnar analytics snapshot for admin dashboards.
+
+A scheduled job streams bookings and providers out of Postgres into flat NumPy arrays,
+one .npy file per column, under ANALYTICS_SNAPSHOT_DIR. Readers memory-map the current
+snapshot, so all worker processes on a host share one copy through the page cache, and
+admin metrics become vectorized group-bys instead of OLTP queries.
+
+Layout:  <dir>/CURRENT                      name of the live snapshot directory
+         <dir>/snap-<ts>/<column>.npy       one array per column
+         <dir>/snap-<ts>/manifest.json      counts, status codes, display names, built_at
+
+A snapshot is written to its own directory and published by atomically replacing
+CURRENT; processes still mapped to the previous one keep reading it.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import BigInteger, case, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.time_windows import TimeWindow
+from app.db.models.booking import Booking
+from app.db.models.category import Category
+from app.db.models.service import Service
+from app.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# status code = position in this tuple; any other status is stored as len(STATUSES)
+STATUSES = ("pending", "accepted", "rejected", "completed", "canceled", "expired")
+
+_BOOKING_COLUMNS = {
+    "provider_id": np.int64,
+    "category_id": np.int64,  # -1 when the service has no category
+    "amount": np.float64,
+    "status": np.uint8,
+    "created": np.int64,  # bookings.created_at as UTC epoch seconds
+}
+_PROVIDER_COLUMNS = {
+    "id": np.int64,  # sorted ascending
+    "created": np.int64,
+    "avg_rating": np.float64,
+    "rating_count": np.int64,
+}
+_CHUNK = 50_000
+_DAY = 86400
+
+
+def _epoch(column):
+    return cast(func.floor(func.extract("epoch", column)), BigInteger)
+
+
+def _seconds(dt: datetime) -> int:
+    return int((dt - datetime(1970, 1, 1)).total_seconds())
+
+
+def _day_start(d: date) -> int:
+    return _seconds(datetime.combine(d, datetime.min.time()))
+
+
+def _stream(db: Session, stmt, columns: Dict[str, type]) -> Dict[str, np.ndarray]:
+    parts = {name: [] for name in columns}
+    for batch in db.execute(stmt.execution_options(yield_per=_CHUNK)).partitions():
+        for i, (name, dtype) in enumerate(columns.items()):
+            parts[name].append(np.fromiter((row[i] for row in batch), dtype=dtype, count=len(batch)))
+    return {
+        name: np.concatenate(chunks) if chunks else np.empty(0, dtype=columns[name])
+        for name, chunks in parts.items()
+    }
+
+
+def _write(path: str, arrays: Dict[str, np.ndarray], prefix: str):
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{prefix}_{name}.npy"), array)
+
+
+def build_snapshot(db: Session):
+    """Scheduled job: dump bookings and providers into a new snapshot and publish it."""
+    root = settings.ANALYTICS_SNAPSHOT_DIR
+    os.makedirs(root, exist_ok=True)
+    built_at = datetime.utcnow()
+
+    bookings = _stream(db, (
+        select(
+            Booking.provider_id,
+            func.coalesce(Service.category_id, -1),
+            func.coalesce(Booking.amount, 0),
+            case({s: i for i, s in enumerate(STATUSES)}, value=Booking.status, else_=len(STATUSES)),
+            _epoch(Booking.created_at),
+        )
+        .outerjoin(Service, Service.id == Booking.service_id)
+    ), _BOOKING_COLUMNS)
+    providers = _stream(db, (
+        select(User.id, _epoch(User.created_at), func.coalesce(User.avg_rating, 0), func.coalesce(User.rating_count, 0))
+        .where(User.role == "provider")
+        .order_by(User.id)
+    ), _PROVIDER_COLUMNS)
+
+    manifest = {
+        "built_at": built_at.isoformat(),
+        "statuses": list(STATUSES),
+        "total_users": db.query(func.count(User.id)).scalar() or 0,
+        "total_services": db.query(func.count(Service.id)).scalar() or 0,
+        "provider_names": {str(i): n for i, n in db.query(User.id, User.name).filter(User.role == "provider")},
+        "category_names": {str(i): n for i, n in db.query(Category.id, Category.name)},
+    }
+    db.rollback()
+
+    name = f"snap-{built_at:%Y%m%d%H%M%S%f}"
+    path = os.path.join(root, name)
+    os.makedirs(path)
+    _write(path, bookings, "booking")
+    _write(path, providers, "provider")
+    with open(os.path.join(path, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    pointer = os.path.join(root, "CURRENT")
+    with open(pointer + ".tmp", "w") as f:
+        f.write(name)
+    os.replace(pointer + ".tmp", pointer)
+    _prune(root, keep=name)
+    logger.info("analytics snapshot %s: %d bookings, %d providers", name, len(bookings["status"]), len(providers["id"]))
+
+
+def _prune(root: str, keep: str):
+    # keep the new snapshot and the one before it (other workers may still be mapped to it)
+    old = sorted(d for d in os.listdir(root) if d.startswith("snap-") and d != keep)
+    for d in old[:-1]:
+        shutil.rmtree(os.path.join(root, d), ignore_errors=True)
+
+
+class Snapshot:
+    def __init__(self, name: str, path: str):
+        self.name = name
+        with open(os.path.join(path, "manifest.json")) as f:
+            manifest = json.load(f)
+        self.built_at = datetime.fromisoformat(manifest["built_at"])
+        self.statuses: List[str] = manifest["statuses"]
+        self.total_users = int(manifest["total_users"])
+        self.total_services = int(manifest["total_services"])
+        self.provider_names = {int(k): v for k, v in manifest["provider_names"].items()}
+        self.category_names = {int(k): v for k, v in manifest["category_names"].items()}
+
+        def load(prefix, column):
+            return np.load(os.path.join(path, f"{prefix}_{column}.npy"), mmap_mode="r")
+
+        self.provider_id, self.category_id, self.amount, self.status, self.created = (
+            load("booking", c) for c in _BOOKING_COLUMNS
+        )
+        self.providers, self.provider_created, self.provider_avg_rating, self.provider_rating_count = (
+            load("provider", c) for c in _PROVIDER_COLUMNS
+        )
+
+    def code(self, status: str) -> int:
+        return self.statuses.index(status) if status in self.statuses else -1
+
+
+_lock = threading.Lock()
+_current: Optional[Snapshot] = None
+
+
+def current() -> Optional[Snapshot]:
+    """The live snapshot, or None when disabled, not built yet or too old (callers then use Postgres)."""
+    global _current
+    if not settings.ANALYTICS_SNAPSHOT_ENABLED:
+        return None
+    root = settings.ANALYTICS_SNAPSHOT_DIR
+    try:
+        with open(os.path.join(root, "CURRENT")) as f:
+            name = f.read().strip()
+    except FileNotFoundError:
+        return None
+    with _lock:
+        if _current is None or _current.name != name:
+            try:
+                _current = Snapshot(name, os.path.join(root, name))
+            except (OSError, ValueError, KeyError):
+                logger.exception("could not load analytics snapshot %s", name)
+                return None
+        snap = _current
+    if datetime.utcnow() - snap.built_at > timedelta(minutes=settings.ANALYTICS_SNAPSHOT_MAX_AGE_MINUTES):
+        return None
+    return snap
+
+
+# --- vectorized metrics ---
+
+def _group(keys: np.ndarray, mask: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(distinct keys, row count per key, weight sum per key) over the masked rows."""
+    uniq, inverse = np.unique(keys[mask], return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(uniq))
+    sums = np.bincount(inverse, weights=weights[mask], minlength=len(uniq))
+    return uniq, counts, sums
+
+
+def _top(order_by: np.ndarray, limit: int) -> np.ndarray:
+    return np.argsort(-order_by, kind="stable")[:limit]
+
+
+def kpis(snap: Snapshot, now: datetime) -> Dict[str, int]:
+    today = _day_start(now.date())
+    return {
+        "total_users": snap.total_users,
+        "total_providers": len(snap.providers),
+        "total_services": snap.total_services,
+        "total_bookings": len(snap.status),
+        "bookings_today": int(np.count_nonzero((snap.created >= today) & (snap.created < today + _DAY))),
+        "bookings_last_7_days": int(np.count_nonzero(snap.created >= _seconds(now - timedelta(days=7)))),
+    }
+
+
+def status_counts(snap: Snapshot) -> Dict[str, int]:
+    counts = np.bincount(snap.status, minlength=len(snap.statuses) + 1)
+    labels = snap.statuses + ["other"]
+    return {labels[i]: int(c) for i, c in enumerate(counts) if c}
+
+
+def cancellation_rate(snap: Snapshot) -> float:
+    canceled = np.count_nonzero(snap.status == snap.code("canceled"))
+    closed = canceled + np.count_nonzero(snap.status == snap.code("completed"))
+    return canceled / closed * 100.0 if closed else 0.0
+
+
+def top_providers_by_earnings(snap: Snapshot, limit: int) -> List[Tuple[int, Optional[str], float, int]]:
+    """(provider_id, name, earnings, completed bookings), highest earnings first."""
+    ids, counts, sums = _group(snap.provider_id, snap.status == snap.code("completed"), snap.amount)
+    return [
+        (int(ids[i]), snap.provider_names.get(int(ids[i])), float(sums[i]), int(counts[i]))
+        for i in _top(sums, limit)
+    ]
+
+
+def category_totals(snap: Snapshot, limit: int, by_count: bool = False) -> List[Tuple[int, Optional[str], int, float]]:
+    """(category_id, name, completed bookings, earnings), by earnings or by booking count."""
+    mask = (snap.status == snap.code("completed")) & (snap.category_id >= 0)
+    ids, counts, sums = _group(snap.category_id, mask, snap.amount)
+    return [
+        (int(ids[i]), snap.category_names.get(int(ids[i])), int(counts[i]), float(sums[i]))
+        for i in _top(counts if by_count else sums, limit)
+    ]
+
+
+def daily_series(snap: Snapshot, window: TimeWindow) -> List[Tuple[date, int, int, float]]:
+    """(day, bookings, completed, earnings) for every day in the window, gap-filled."""
+    start = _day_start(window.first_day)
+    mask = (snap.created >= start) & (snap.created < start + window.days * _DAY)
+    day = (snap.created[mask] - start) // _DAY
+    completed = snap.status[mask] == snap.code("completed")
+    bookings = np.bincount(day, minlength=window.days)
+    done = np.bincount(day[completed], minlength=window.days)
+    earnings = np.bincount(day[completed], weights=snap.amount[mask][completed], minlength=window.days)
+    return [
+        (window.first_day + timedelta(days=i), int(bookings[i]), int(done[i]), float(earnings[i]))
+        for i in range(window.days)
+    ]
+
+
+def provider_growth(snap: Snapshot, window: TimeWindow) -> List[int]:
+    """New providers per day of the window."""
+    start = _day_start(window.first_day)
+    created = snap.provider_created[(snap.provider_created >= start) & (snap.provider_created < start + window.days * _DAY)]
+    return np.bincount((created - start) // _DAY, minlength=window.days).tolist()
+
+
+def monthly_revenue(snap: Snapshot, months: List[TimeWindow]) -> Dict[Tuple[int, int], float]:
+    """Completed earnings keyed by (year, month) for the given month windows."""
+    mask = (snap.status == snap.code("completed")) & (snap.created >= _seconds(months[0].start)) & (snap.created < _seconds(months[-1].end))
+    month = snap.created[mask].astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    uniq, inverse = np.unique(month, return_inverse=True)
+    sums = np.bincount(inverse, weights=snap.amount[mask], minlength=len(uniq))
+    # months since 1970-01
+    return {(1970 + int(m) // 12, int(m) % 12 + 1): float(s) for m, s in zip(uniq, sums)}
+
+
+def heatmap(snap: Snapshot, now: datetime, days: int = 30) -> List[Tuple[int, int, int]]:
+    """(ISO weekday, hour, bookings) over the last `days` days, non-empty cells only."""
+    created = snap.created[snap.created >= _day_start(now.date() - timedelta(days=days - 1))]
+    # 1970-01-01 was a Thursday (ISO 4)
+    weekday = (created // _DAY + 3) % 7
+    hour = (created % _DAY) // 3600
+    cells = np.bincount(weekday * 24 + hour, minlength=7 * 24)
+    return [(int(i) // 24 + 1, int(i) % 24, int(cells[i])) for i in np.flatnonzero(cells)]
+
+
+def leaderboard(snap: Snapshot, limit: int) -> List[Dict]:
+    """Same score as app.services.leaderboard, computed over the snapshot."""
+    completed = snap.status == snap.code("completed")
+    ids = snap.providers
+    slot = np.searchsorted(ids, snap.provider_id[completed])
+    slot = np.minimum(slot, max(len(ids) - 1, 0))
+    known = (ids[slot] == snap.provider_id[completed]) if len(ids) else np.zeros(0, dtype=bool)
+    earned = np.bincount(slot[known], weights=snap.amount[completed][known], minlength=len(ids))
+    done = np.bincount(slot[known], minlength=len(ids))
+
+    max_earned = earned.max() if len(ids) else 0.0
+    score = (
+        snap.provider_avg_rating * np.log1p(snap.provider_rating_count) * settings.LEADERBOARD_RATING_WEIGHT
+        + (earned / max_earned if max_earned > 0 else np.zeros(len(ids))) * settings.LEADERBOARD_EARNINGS_WEIGHT
+    )
+    # score desc, provider id asc
+    order = np.lexsort((ids, -score))[:limit]
+    return [
+        {
+            "rank": rank,
+            "provider_id": int(ids[i]),
+            "provider_name": snap.provider_names.get(int(ids[i])),
+            "avg_rating": float(snap.provider_avg_rating[i]),
+            "rating_count": int(snap.provider_rating_count[i]),
+            "total_earnings": float(earned[i]),
+            "completed_bookings": int(done[i]),
+            "score": float(score[i]),
+        }
+        for rank, i in enumerate(order, start=1)
+    ]
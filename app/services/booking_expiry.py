@@ -0,0 +1,70 @@
+# app/services/booking_expiry.py
+"""
+Sweeper moving stale pending bookings to "expired".
+
+A pending booking expires once it is older than PENDING_BOOKING_TTL_HOURS or its start
+time (wall-clock at the business, see time_windows.booking_clock) has passed. Each batch
+is one UPDATE ... RETURNING over at most BOOKING_EXPIRY_BATCH rows picked through the
+pending-only partial indexes, committed together with its rollup deltas, cache
+invalidation and booking.expired events. The status-change routes load the booking FOR
+UPDATE: rows they hold are skipped here and looked at again next run, and a route that
+waited on a batch's lock sees the booking as expired and refuses the change.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.time_windows import booking_clock
+from app.db.models.booking import Booking
+from app.services.booking_lifecycle import on_bookings_status_changed
+
+logger = logging.getLogger(__name__)
+
+
+def _expire_batch(db: Session, now: datetime) -> int:
+    # created_at is naive UTC; booking_date/booking_time are local wall-clock
+    cutoff = now - timedelta(hours=settings.PENDING_BOOKING_TTL_HOURS)
+    local = booking_clock(now)
+    stale = (
+        select(Booking.id)
+        # each branch matches one of ix_bookings_pending_created / ix_bookings_pending_start
+        .where(
+            Booking.status == "pending",
+            or_(
+                Booking.created_at < cutoff,
+                tuple_(Booking.booking_date, Booking.booking_time) <= tuple_(local.date(), local.time()),
+            ),
+        )
+        .limit(settings.BOOKING_EXPIRY_BATCH)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = db.execute(
+        update(Booking)
+        # re-checked under the row lock: the booking may have been accepted meanwhile
+        .where(Booking.id.in_(stale), Booking.status == "pending")
+        .values(status="expired", updated_at=now)
+        .returning(
+            Booking.id, Booking.customer_id, Booking.provider_id, Booking.service_id,
+            Booking.booking_date, Booking.booking_time, Booking.amount, Booking.created_at, Booking.status,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    on_bookings_status_changed(db, rows, "pending")
+    db.commit()
+    return len(rows)
+
+
+def expire_stale_bookings(db: Session):
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        expired = _expire_batch(db, now)
+        total += expired
+        if expired < settings.BOOKING_EXPIRY_BATCH:
+            break
+    if total:
+        logger.info("expired %d stale pending booking(s)", total)
@@ -0,0 +1,72 @@
+# app/services/booking_lifecycle.py
+"""
+Single place for side effects of booking writes.
+Call these before db.commit() so derived data is written in the same transaction
+as the booking itself. Each call also emits a "booking.<status>" domain event
+(app.core.events); subscribers such as notifications run inside that same commit.
+"""
+from typing import Callable, Optional, Sequence
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.db import replica
+from app.db.models.booking import Booking
+from app.services import booking_stats, earnings_ledger
+from app.services.dashboard_cache import invalidate_for_bookings
+
+
+def _after_commit(db: Session, fn: Callable[[], None]):
+    # cache invalidation must not run before the new state is visible to readers
+    event.listen(db, "after_commit", lambda session: fn(), once=True)
+
+
+def _invalidate_caches(db: Session, bookings: Sequence[Booking]):
+    parties = {(b.customer_id, b.provider_id) for b in bookings}
+    # both parties read the write from the primary until the replica catches up
+    replica.pin_to_primary(db, *{user_id for pair in parties for user_id in pair})
+    _after_commit(db, lambda: invalidate_for_bookings(parties))
+
+
+def _emit(db: Session, booking: Booking, old_status: Optional[str], actor_id: Optional[int]):
+    # plain values only: subscribers must not need to touch the ORM object again
+    events.emit(db, f"booking.{booking.status}" if old_status else "booking.created", {
+        "booking_id": booking.id,
+        "customer_id": booking.customer_id,
+        "provider_id": booking.provider_id,
+        "service_id": booking.service_id,
+        "booking_date": booking.booking_date,
+        "booking_time": booking.booking_time,
+        "status": booking.status,
+        "old_status": old_status,
+        "actor_id": actor_id,
+    })
+
+
+def on_booking_created(db: Session, booking: Booking, category_id: Optional[int] = None, actor_id: Optional[int] = None):
+    # booking must be flushed so created_at/id are populated
+    booking_stats.record_booking_created(db, booking, category_id=category_id)
+    _invalidate_caches(db, [booking])
+    _emit(db, booking, None, actor_id)
+
+
+def on_booking_status_changed(db: Session, booking: Booking, old_status: str, actor_id: Optional[int] = None):
+    booking_stats.record_status_change(db, booking, old_status)
+    earnings_ledger.record_status_change(db, booking, old_status)
+    _invalidate_caches(db, [booking])
+    _emit(db, booking, old_status, actor_id)
+
+
+def on_bookings_status_changed(db: Session, bookings: Sequence, old_status: str):
+    """
+    Set-based variant for system changes (e.g. expiry) applied with one UPDATE ... RETURNING.
+    `bookings` are rows carrying the Booking columns (id, customer_id, provider_id, service_id,
+    booking_date, booking_time, amount, created_at, status); `old_status` must not be "completed".
+    """
+    if not bookings:
+        return
+    booking_stats.record_bulk_status_change(db, bookings, old_status)
+    _invalidate_caches(db, bookings)
+    for booking in bookings:
+        _emit(db, booking, old_status, None)
@@ -0,0 +1,62 @@
+# app/services/booking_notifications.py
+"""
+Notification fan-out for booking domain events.
+
+Runs as an app.core.events subscriber, i.e. inside the committing transaction: the
+outbox rows are inserted in the same commit as the booking change, with no extra
+queries, and the notification workers deliver them afterwards.
+"""
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.notifier import queue_notification, wake_workers_after_commit
+from app.services import booking_reminders
+
+_MESSAGES = {
+    "booking.created": "New booking #{booking_id} for {when}.",
+    "booking.accepted": "Booking #{booking_id} for {when} was accepted.",
+    "booking.rejected": "Booking #{booking_id} for {when} was rejected.",
+    "booking.completed": "Booking #{booking_id} for {when} was completed.",
+    "booking.canceled": "Booking #{booking_id} for {when} was canceled.",
+    "booking.expired": "Booking #{booking_id} for {when} expired without a response.",
+}
+
+
+def _recipients(payload: dict) -> List[int]:
+    # every party of the booking except whoever made the change (admins notify both)
+    parties = [payload["customer_id"], payload["provider_id"]]
+    return [user_id for user_id in parties if user_id != payload.get("actor_id")]
+
+
+def notify_booking_events(db: Session, batch: List[events.DomainEvent]):
+    queued = set()
+    for e in batch:
+        template = _MESSAGES.get(e.type)
+        if template is None:
+            continue
+        p = e.payload
+        message = template.format(booking_id=p["booking_id"], when=f"{p['booking_date']:%Y-%m-%d} {p['booking_time']:%H:%M}")
+        notification_type = e.type.replace(".", "_")  # "booking_accepted", matches Notification.type
+        for user_id in _recipients(p):
+            # the same change emitted twice in one transaction is one notification
+            key = (user_id, p["booking_id"], notification_type)
+            if key in queued:
+                continue
+            queued.add(key)
+            queue_notification(db, user_id=user_id, booking_id=p["booking_id"], type=notification_type, message=message)
+    if queued:
+        wake_workers_after_commit(db)
+
+
+_registered = False
+
+
+def register_subscribers():
+    global _registered
+    if _registered:
+        return
+    _registered = True
+    events.subscribe("booking.*", notify_booking_events)
+    events.subscribe("booking.accepted", booking_reminders.remind_late_acceptances)
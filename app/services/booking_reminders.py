@@ -0,0 +1,107 @@
+# app/services/booking_reminders.py
+"""
+Reminders for accepted bookings, BOOKING_REMINDER_HOURS before they start.
+
+Each run of the job only looks at bookings starting between the watermark (the horizon
+reached by the previous run) and now + BOOKING_REMINDER_HOURS, via the covering partial
+index ix_bookings_accepted_start, then moves the watermark up to the new horizon.
+Start times are local wall-clock times, so the horizon and the watermark are on the
+same clock (time_windows.booking_clock).
+Reminders are written to the notification outbox in bulk.
+
+booking_reminders has one row per reminded booking and every insert is
+ON CONFLICT DO NOTHING, so a booking is reminded at most once no matter how many
+workers or runs see it. A booking accepted when its start is already inside the
+horizon (behind the watermark) is reminded from the booking.accepted event instead.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.core.config import settings
+from app.core.notifier import queue_notifications, wake_workers_after_commit
+from app.core.time_windows import booking_clock
+from app.db.models.booking import Booking
+from app.db.models.booking_reminder import BookingReminder
+from app.db.models.job_watermark import JobWatermark
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "booking_reminders"
+
+# (booking_id, customer_id, provider_id, booking_date, booking_time)
+Due = Tuple[int, int, int, object, object]
+
+
+def _enqueue(db: Session, due: Iterable[Due]) -> int:
+    due = {row[0]: row for row in due}
+    if not due:
+        return 0
+    stmt = (
+        insert(BookingReminder)
+        .values([{"booking_id": booking_id, "created_at": datetime.utcnow()} for booking_id in due])
+        .on_conflict_do_nothing(index_elements=[BookingReminder.booking_id])
+        .returning(BookingReminder.booking_id)
+    )
+    # only bookings this call actually claimed get a reminder
+    claimed = db.execute(stmt).scalars().all()
+    rows = []
+    for booking_id in claimed:
+        _, customer_id, provider_id, booking_date, booking_time = due[booking_id]
+        message = f"Reminder: booking #{booking_id} is on {booking_date:%Y-%m-%d} at {booking_time:%H:%M}."
+        rows.append((customer_id, booking_id, "booking_reminder", message))
+        rows.append((provider_id, booking_id, "booking_reminder", message))
+    queue_notifications(db, rows)
+    if rows:
+        wake_workers_after_commit(db)
+    return len(claimed)
+
+
+def enqueue_due_reminders(db: Session):
+    now = booking_clock()
+    horizon = now + timedelta(hours=settings.BOOKING_REMINDER_HOURS)
+    mark = db.get(JobWatermark, WATERMARK)
+    # first run: nothing before now is worth reminding about
+    start = mark.watermark if mark else now
+    if start >= horizon:
+        return
+
+    start_at = tuple_(Booking.booking_date, Booking.booking_time)
+    due: List[Due] = (
+        db.query(Booking.id, Booking.customer_id, Booking.provider_id, Booking.booking_date, Booking.booking_time)
+        # matches ix_bookings_accepted_start
+        .filter(
+            Booking.status == "accepted",
+            start_at > tuple_(start.date(), start.time()),
+            start_at <= tuple_(horizon.date(), horizon.time()),
+        )
+        .all()
+    )
+    sent = _enqueue(db, due)
+
+    updated_at = datetime.utcnow()
+    stmt = insert(JobWatermark).values(name=WATERMARK, watermark=horizon, updated_at=updated_at)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[JobWatermark.name], set_={"watermark": horizon, "updated_at": updated_at},
+    ))
+    db.commit()
+    if sent:
+        logger.info("queued reminders for %d booking(s) starting before %s", sent, horizon)
+
+
+def remind_late_acceptances(db: Session, batch: List[events.DomainEvent]):
+    """booking.accepted subscriber: the job's window may already have passed these bookings."""
+    now = booking_clock()
+    horizon = now + timedelta(hours=settings.BOOKING_REMINDER_HOURS)
+    due = []
+    for e in batch:
+        p = e.payload
+        starts_at = datetime.combine(p["booking_date"], p["booking_time"])
+        if now < starts_at <= horizon:
+            due.append((p["booking_id"], p["customer_id"], p["provider_id"], p["booking_date"], p["booking_time"]))
+    _enqueue(db, due)
@@ -0,0 +1,214 @@
+# app/services/booking_stats.py
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.booking import Booking
+from app.db.models.booking_daily_stats import BookingDailyStat
+from app.db.models.service import Service
+
+
+# --------------------------
+# Incremental maintenance (call inside the booking write transaction)
+# --------------------------
+def _apply_delta(db: Session, *, day: date, provider_id: int, service_id: int, category_id: Optional[int],
+                 status: str, count: int, amount: float):
+    _apply_deltas(db, [dict(
+        day=day,
+        provider_id=provider_id,
+        service_id=service_id,
+        category_id=category_id,
+        status=status,
+        bookings_count=count,
+        amount_sum=amount,
+    )])
+
+
+def _apply_deltas(db: Session, values: List[dict]):
+    # one multi-row upsert; keys must be unique within `values`
+    stmt = insert(BookingDailyStat).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BookingDailyStat.day, BookingDailyStat.provider_id, BookingDailyStat.service_id, BookingDailyStat.status],
+        set_={
+            "bookings_count": BookingDailyStat.bookings_count + stmt.excluded.bookings_count,
+            "amount_sum": BookingDailyStat.amount_sum + stmt.excluded.amount_sum,
+        },
+    )
+    db.execute(stmt)
+
+
+def _booking_day(booking: Booking) -> date:
+    return (booking.created_at or datetime.utcnow()).date()
+
+
+def _category_id(db: Session, booking: Booking, category_id: Optional[int]) -> Optional[int]:
+    if category_id is not None:
+        return category_id
+    return db.query(Service.category_id).filter(Service.id == booking.service_id).scalar()
+
+
+def record_booking_created(db: Session, booking: Booking, category_id: Optional[int] = None):
+    _apply_delta(
+        db,
+        day=_booking_day(booking),
+        provider_id=booking.provider_id,
+        service_id=booking.service_id,
+        category_id=_category_id(db, booking, category_id),
+        status=booking.status,
+        count=1,
+        amount=float(booking.amount or 0.0),
+    )
+
+
+def record_status_change(db: Session, booking: Booking, old_status: str, category_id: Optional[int] = None):
+    if old_status == booking.status:
+        return
+    day = _booking_day(booking)
+    category_id = _category_id(db, booking, category_id)
+    amount = float(booking.amount or 0.0)
+    common = dict(day=day, provider_id=booking.provider_id, service_id=booking.service_id, category_id=category_id)
+    _apply_delta(db, status=old_status, count=-1, amount=-amount, **common)
+    _apply_delta(db, status=booking.status, count=1, amount=amount, **common)
+
+
+def record_bulk_status_change(db: Session, bookings, old_status: str):
+    """Move many bookings (rows with Booking columns, all now in one status) out of `old_status`."""
+    groups: Dict[Tuple[date, int, int, str], List[float]] = {}
+    for booking in bookings:
+        key = (_booking_day(booking), booking.provider_id, booking.service_id, booking.status)
+        count_amount = groups.setdefault(key, [0, 0.0])
+        count_amount[0] += 1
+        count_amount[1] += float(booking.amount or 0.0)
+    service_ids = {key[2] for key in groups}
+    categories = dict(db.query(Service.id, Service.category_id).filter(Service.id.in_(service_ids)).all())
+    values = []
+    for (day, provider_id, service_id, status), (count, amount) in groups.items():
+        common = dict(day=day, provider_id=provider_id, service_id=service_id, category_id=categories.get(service_id))
+        values.append(dict(common, status=old_status, bookings_count=-count, amount_sum=-amount))
+        values.append(dict(common, status=status, bookings_count=count, amount_sum=amount))
+    _apply_deltas(db, values)
+
+
+# --------------------------
+# Reconcile (nightly job) - rebuild the recent window from raw bookings
+# --------------------------
+def reconcile_daily_stats(db: Session, days: Optional[int] = None):
+    """
+    Recompute rollup rows for the last `days` days (settings.STATS_RECONCILE_DAYS by default)
+    from the bookings table in one transaction. Pass days=0 for a full rebuild.
+    """
+    days = settings.STATS_RECONCILE_DAYS if days is None else days
+    if days > 0 and db.query(BookingDailyStat.day).first() is None:
+        # empty rollup (first deploy) - backfill everything once
+        days = 0
+    since = datetime.combine(datetime.utcnow().date() - timedelta(days=days), datetime.min.time()) if days > 0 else None
+
+    day_col = func.date(Booking.created_at)
+    source = (
+        select(
+            day_col,
+            Booking.provider_id,
+            Booking.service_id,
+            Booking.status,
+            Service.category_id,
+            func.count(Booking.id),
+            func.coalesce(func.sum(Booking.amount), 0),
+        )
+        .outerjoin(Service, Service.id == Booking.service_id)
+        .group_by(day_col, Booking.provider_id, Booking.service_id, Booking.status, Service.category_id)
+    )
+    purge = delete(BookingDailyStat)
+    if since is not None:
+        source = source.where(Booking.created_at >= since)
+        purge = purge.where(BookingDailyStat.day >= since.date())
+
+    # Block concurrent incremental upserts until the rebuild commits; writers still in flight
+    # finish first, writers arriving later apply their delta on top of the rebuilt rows.
+    db.execute(text("LOCK TABLE booking_daily_stats IN EXCLUSIVE MODE"))
+    db.execute(purge)
+    db.execute(
+        insert(BookingDailyStat).from_select(
+            ["day", "provider_id", "service_id", "status", "category_id", "bookings_count", "amount_sum"],
+            source,
+        )
+    )
+    db.commit()
+
+
+# --------------------------
+# Read API - cost depends on the number of days, not on booking volume
+# --------------------------
+def _filtered(q, start: date, end: date, provider_id: Optional[int], category_id: Optional[int]):
+    q = q.filter(BookingDailyStat.day >= start, BookingDailyStat.day <= end)
+    if provider_id is not None:
+        q = q.filter(BookingDailyStat.provider_id == provider_id)
+    if category_id is not None:
+        q = q.filter(BookingDailyStat.category_id == category_id)
+    return q
+
+
+def daily_series(
+    db: Session,
+    start: date,
+    end: date,
+    *,
+    provider_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+) -> List[Tuple[date, int, int, float]]:
+    """
+    Gap-filled (day, bookings, completed_bookings, earnings) for every day in [start, end].
+    bookings counts every status; earnings sums completed bookings only.
+    """
+    daily = _filtered(
+        db.query(
+            BookingDailyStat.day.label("day"),
+            func.sum(BookingDailyStat.bookings_count).label("bookings"),
+            func.sum(BookingDailyStat.bookings_count).filter(BookingDailyStat.status == "completed").label("completed"),
+            func.sum(BookingDailyStat.amount_sum).filter(BookingDailyStat.status == "completed").label("earnings"),
+        ),
+        start, end, provider_id, category_id,
+    ).group_by(BookingDailyStat.day).subquery()
+
+    series = func.generate_series(
+        datetime.combine(start, datetime.min.time()),
+        datetime.combine(end, datetime.min.time()),
+        timedelta(days=1),
+    ).table_valued("day").render_derived(name="series")
+    series_day = func.date(series.c.day)
+    rows = (
+        db.query(
+            series_day,
+            func.coalesce(daily.c.bookings, 0),
+            func.coalesce(daily.c.completed, 0),
+            func.coalesce(daily.c.earnings, 0),
+        )
+        .select_from(series)
+        .outerjoin(daily, daily.c.day == series_day)
+        .order_by(series.c.day)
+        .all()
+    )
+    return [(d, int(b or 0), int(c or 0), float(e or 0.0)) for d, b, c, e in rows]
+
+
+def status_totals(
+    db: Session,
+    start: date,
+    end: date,
+    *,
+    provider_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+) -> Dict[str, Tuple[int, float]]:
+    """{status: (bookings_count, amount_sum)} for bookings created in [start, end]."""
+    rows = _filtered(
+        db.query(
+            BookingDailyStat.status,
+            func.sum(BookingDailyStat.bookings_count),
+            func.sum(BookingDailyStat.amount_sum),
+        ),
+        start, end, provider_id, category_id,
+    ).group_by(BookingDailyStat.status).all()
+    return {status: (int(cnt or 0), float(amount or 0.0)) for status, cnt, amount in rows}
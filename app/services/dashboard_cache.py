@@ -0,0 +1,91 @@
+# app/services/dashboard_cache.py
+"""
+Response cache for dashboard routes.
+
+Entries are keyed by (role, user id, route, query params) and use a per-role TTL. Stale
+entries are served while one background refresh recomputes them (see SWRCache).
+Booking status changes call invalidate_for_bookings() after commit (see
+app.services.booking_lifecycle).
+"""
+import functools
+from typing import Callable, Iterable, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import SWRCache
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.loaders import Loaders
+from app.core.security import Principal
+
+dashboard_cache = SWRCache(
+    stale_seconds=settings.DASHBOARD_CACHE_STALE_SECONDS,
+    maxsize=settings.DASHBOARD_CACHE_MAXSIZE,
+)
+
+
+def _ttl(role: str) -> float:
+    return {
+        "admin": settings.DASHBOARD_CACHE_TTL_ADMIN_SECONDS,
+        "provider": settings.DASHBOARD_CACHE_TTL_PROVIDER_SECONDS,
+        "customer": settings.DASHBOARD_CACHE_TTL_CUSTOMER_SECONDS,
+    }[role]
+
+
+def _recompute_detached(fn: Callable, kwargs: dict):
+    """Re-run a route outside its request: fresh session and loaders, same principal."""
+    # stay on the engine the request used (primary or replica)
+    bind = next((v.get_bind() for v in kwargs.values() if isinstance(v, Session)), None)
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    try:
+        fresh = {}
+        for name, value in kwargs.items():
+            if isinstance(value, Session):
+                value = db
+            elif isinstance(value, Loaders):
+                value = Loaders(db)
+            fresh[name] = value
+        return fn(**fresh)
+    finally:
+        db.close()
+
+
+def cached_dashboard(role: str):
+    """
+    Cache a dashboard route for `role`. The route must take `current_user` (and usually
+    `db`) as keyword dependencies; other arguments become part of the key.
+    Callers without the role bypass the cache so the route's own 403 still applies.
+    """
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        def wrapper(**kwargs):
+            current_user = kwargs.get("current_user")
+            if current_user is None or current_user.role != role:
+                return fn(**kwargs)
+            params = tuple(sorted(
+                (name, value) for name, value in kwargs.items()
+                if not isinstance(value, (Session, Loaders, Principal))
+            ))
+            user_id = current_user.id
+            key = (role, user_id, fn.__name__, params)
+            return dashboard_cache.get_or_compute(
+                key,
+                lambda: fn(**kwargs),
+                ttl=_ttl(role),
+                background_compute=lambda: _recompute_detached(fn, kwargs),
+            )
+        return wrapper
+    return decorator
+
+
+def invalidate_for_bookings(parties: Iterable[Tuple[int, int]]):
+    """
+    Drop the dashboards of every (customer_id, provider_id) pair in one pass over the cache;
+    admin dashboards go stale and refresh on next read.
+    """
+    owners = set()
+    for customer_id, provider_id in parties:
+        owners.add(("customer", customer_id))
+        owners.add(("provider", provider_id))
+    dashboard_cache.invalidate_where(lambda key: (key[0], key[1]) in owners)
+    dashboard_cache.expire_where(lambda key: key[0] == "admin")
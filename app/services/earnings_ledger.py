@@ -0,0 +1,153 @@
+# app/services/earnings_ledger.py
+"""
+Provider earnings ledger.
+
+Every change to what a provider has earned is an appended ProviderEarningsEntry; the
+per-provider monthly running total is upserted in the same transaction. A booking's
+net in the ledger always converges to its amount while completed and to zero otherwise,
+so re-applying a transition is a no-op and concurrent completions of one booking cannot
+double count (its row lock, taken by the status UPDATE, serializes them).
+
+Earnings reads go to provider_monthly_earnings: lifetime is a sum over months, a single
+month is a primary-key lookup.
+"""
+from datetime import date, datetime
+from typing import List, Tuple
+
+from sqlalchemy import Date, cast, delete, exists, func, insert, literal, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models.booking import Booking
+from app.db.models.earnings_ledger import ProviderEarningsEntry, ProviderMonthlyEarnings
+from app.db.models.service import Service
+
+
+def _period(booking: Booking) -> date:
+    return (booking.created_at or datetime.utcnow()).date().replace(day=1)
+
+
+def _append(db: Session, booking: Booking, kind: str, amount: float, completed_delta: int):
+    period = _period(booking)
+    db.execute(insert(ProviderEarningsEntry).values(
+        provider_id=booking.provider_id,
+        booking_id=booking.id,
+        service_id=booking.service_id,
+        period=period,
+        kind=kind,
+        amount=amount,
+        completed_delta=completed_delta,
+        created_at=datetime.utcnow(),
+    ))
+    stmt = pg_insert(ProviderMonthlyEarnings).values(
+        provider_id=booking.provider_id, period=period, amount=amount, completed_count=completed_delta,
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ProviderMonthlyEarnings.provider_id, ProviderMonthlyEarnings.period],
+        set_={
+            "amount": ProviderMonthlyEarnings.amount + stmt.excluded.amount,
+            "completed_count": ProviderMonthlyEarnings.completed_count + stmt.excluded.completed_count,
+        },
+    ))
+
+
+def sync_booking(db: Session, booking: Booking):
+    """Append whatever entry brings the booking's ledger net in line with its current state."""
+    # flushing issues the booking UPDATE, whose row lock makes a concurrent sync of the
+    # same booking wait for this transaction and then see its entries
+    db.flush()
+    net_amount, net_completed = db.query(
+        func.coalesce(func.sum(ProviderEarningsEntry.amount), 0),
+        func.coalesce(func.sum(ProviderEarningsEntry.completed_delta), 0),
+    ).filter(ProviderEarningsEntry.booking_id == booking.id).one()
+    net_amount, net_completed = float(net_amount), int(net_completed)
+
+    if booking.status == "completed":
+        amount = float(booking.amount or 0.0)
+        if net_completed == 0:
+            _append(db, booking, "credit", amount - net_amount, 1)
+        elif amount != net_amount:
+            _append(db, booking, "adjustment", amount - net_amount, 0)
+    elif net_completed or net_amount:
+        _append(db, booking, "reversal", -net_amount, -net_completed)
+
+
+def record_status_change(db: Session, booking: Booking, old_status: str):
+    if old_status != booking.status and "completed" in (old_status, booking.status):
+        sync_booking(db, booking)
+
+
+# --------------------------
+# Read API
+# --------------------------
+def lifetime_earnings_subquery(db: Session, provider_id: int):
+    return (
+        db.query(func.coalesce(func.sum(ProviderMonthlyEarnings.amount), 0))
+        .filter(ProviderMonthlyEarnings.provider_id == provider_id)
+        .scalar_subquery()
+    )
+
+
+def month_earnings_subquery(db: Session, provider_id: int, period: date):
+    return (
+        db.query(func.coalesce(func.sum(ProviderMonthlyEarnings.amount), 0))
+        .filter(ProviderMonthlyEarnings.provider_id == provider_id, ProviderMonthlyEarnings.period == period)
+        .scalar_subquery()
+    )
+
+
+def month_totals(db: Session, provider_id: int, period: date) -> Tuple[int, float]:
+    """(completed bookings, earnings) for the month starting at `period`."""
+    row = db.get(ProviderMonthlyEarnings, (provider_id, period))
+    return (int(row.completed_count), float(row.amount)) if row else (0, 0.0)
+
+
+def month_breakdown(db: Session, provider_id: int, period: date) -> List[Tuple[str, int, float]]:
+    """(service name, completed bookings, earnings) for one month, highest earnings first."""
+    value = func.sum(ProviderEarningsEntry.amount)
+    return (
+        db.query(Service.name, func.sum(ProviderEarningsEntry.completed_delta), value.label("value"))
+        .join(Service, Service.id == ProviderEarningsEntry.service_id)
+        .filter(ProviderEarningsEntry.provider_id == provider_id, ProviderEarningsEntry.period == period)
+        .group_by(Service.name)
+        .having(func.sum(ProviderEarningsEntry.completed_delta) > 0)
+        .order_by(value.desc())
+        .all()
+    )
+
+
+# --------------------------
+# Reconcile (scheduled) - backfill and rebuild running totals from the ledger
+# --------------------------
+def reconcile_ledger(db: Session):
+    """
+    Credit completed bookings that have no ledger entries yet (first deploy, or writes
+    that bypassed booking_lifecycle), then rebuild provider_monthly_earnings from the ledger.
+    """
+    db.execute(text("LOCK TABLE provider_earnings_ledger, provider_monthly_earnings IN EXCLUSIVE MODE"))
+    period = cast(func.date_trunc("month", Booking.created_at), Date)
+    missing = (
+        select(
+            Booking.provider_id, Booking.id, Booking.service_id, period,
+            literal("credit"), Booking.amount, literal(1), literal(datetime.utcnow()),
+        )
+        .where(
+            Booking.status == "completed",
+            ~exists().where(ProviderEarningsEntry.booking_id == Booking.id),
+        )
+    )
+    db.execute(insert(ProviderEarningsEntry).from_select(
+        ["provider_id", "booking_id", "service_id", "period", "kind", "amount", "completed_delta", "created_at"],
+        missing,
+    ))
+    db.execute(delete(ProviderMonthlyEarnings))
+    db.execute(insert(ProviderMonthlyEarnings).from_select(
+        ["provider_id", "period", "amount", "completed_count"],
+        select(
+            ProviderEarningsEntry.provider_id,
+            ProviderEarningsEntry.period,
+            func.sum(ProviderEarningsEntry.amount),
+            func.sum(ProviderEarningsEntry.completed_delta),
+        ).group_by(ProviderEarningsEntry.provider_id, ProviderEarningsEntry.period),
+    ))
+    db.commit()
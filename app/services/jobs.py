@@ -0,0 +1,120 @@
+# app/services/jobs.py
+"""Periodic background jobs, registered once at application startup."""
+import socket
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.scheduler import register_job
+from app.db import views
+from app.db.models.booking import Booking
+from app.db.models.booking_daily_stats import BookingDailyStat
+from app.db.models.earnings_ledger import ProviderMonthlyEarnings
+from app.db.models.job_watermark import JobWatermark
+from app.services import analytics_snapshot, booking_expiry, booking_reminders, booking_stats, earnings_ledger, leaderboard, provider_ratings
+
+_registered = False
+
+# how often the daily reconcile jobs look at their last-run stamp
+RECONCILE_CHECK_SECONDS = 3600
+
+
+def _unfilled(target, *source_filter) -> Callable[[Session], bool]:
+    """True while `target` is still empty although there are bookings to fill it from."""
+    def check(db: Session) -> bool:
+        return (
+            db.query(target).first() is None
+            and db.query(Booking.id).filter(*source_filter).first() is not None
+        )
+    return check
+
+
+def _at_most_every(
+    name: str,
+    interval_seconds: float,
+    func: Callable[[Session], None],
+    needed: Optional[Callable[[Session], bool]] = None,
+) -> Callable[[Session], None]:
+    """
+    Run `func` only when its last run, stamped in job_watermarks, is older than
+    `interval_seconds`, or when `needed(db)` says so (e.g. its table is still empty).
+    The stamp is shared by every worker, so restarts do not rerun a reconcile that
+    already ran within the interval.
+    """
+    key = f"{name}:last_run"
+
+    def run(db: Session):
+        now = datetime.utcnow()
+        mark = db.get(JobWatermark, key)
+        due = mark is None or mark.watermark <= now - timedelta(seconds=interval_seconds)
+        if not due and not (needed and needed(db)):
+            return
+        db.rollback()  # release the snapshot before the job takes its locks
+        func(db)
+        stmt = insert(JobWatermark).values(name=key, watermark=now, updated_at=datetime.utcnow())
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[JobWatermark.name], set_={"watermark": now, "updated_at": stmt.excluded.updated_at},
+        ))
+        db.commit()
+    return run
+
+
+def _register_reconcile(name: str, func: Callable[[Session], None], needed: Optional[Callable[[Session], bool]] = None):
+    # checked hourly from startup; runs once per STATS_RECONCILE_INTERVAL_HOURS across the cluster
+    interval = settings.STATS_RECONCILE_INTERVAL_HOURS * 3600
+    register_job(name, RECONCILE_CHECK_SECONDS, _at_most_every(name, interval, func, needed), run_at_start=True)
+
+
+def register_jobs():
+    global _registered
+    if _registered:
+        return
+    _registered = True
+
+    # the reconciles lock their tables against booking writes: at startup they only run when
+    # their table has never been filled or the last run is older than the interval
+    _register_reconcile(
+        "booking_daily_stats_reconcile",
+        booking_stats.reconcile_daily_stats,
+        needed=_unfilled(BookingDailyStat),
+    )
+    _register_reconcile(
+        "earnings_ledger_reconcile",
+        earnings_ledger.reconcile_ledger,
+        needed=_unfilled(ProviderMonthlyEarnings, Booking.status == "completed"),
+    )
+    _register_reconcile("provider_ratings_repair", provider_ratings.repair_provider_ratings)
+    register_job(
+        "provider_leaderboard_refresh",
+        settings.LEADERBOARD_REFRESH_MINUTES * 60,
+        leaderboard.refresh_leaderboard,
+        run_at_start=True,
+    )
+    register_job(
+        "pending_bookings_expiry",
+        settings.BOOKING_EXPIRY_INTERVAL_MINUTES * 60,
+        booking_expiry.expire_stale_bookings,
+        run_at_start=True,
+    )
+    register_job(
+        "booking_reminders",
+        settings.BOOKING_REMINDER_INTERVAL_MINUTES * 60,
+        booking_reminders.enqueue_due_reminders,
+        run_at_start=True,
+    )
+    register_job(
+        "materialized_views_refresh",
+        settings.MATVIEW_REFRESH_MINUTES * 60,
+        views.refresh_views,
+    )
+    if settings.ANALYTICS_SNAPSHOT_ENABLED:
+        # the snapshot lives on local disk, so one builder per host rather than per cluster
+        register_job(
+            f"analytics_snapshot_build:{socket.gethostname()}",
+            settings.ANALYTICS_SNAPSHOT_MINUTES * 60,
+            analytics_snapshot.build_snapshot,
+            run_at_start=True,
+        )
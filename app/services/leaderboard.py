@@ -0,0 +1,97 @@
+# app/services/leaderboard.py
+"""
+Provider leaderboard.
+
+score = avg_rating * ln(1 + rating_count) * LEADERBOARD_RATING_WEIGHT
+        + (earnings / max earnings) * LEADERBOARD_EARNINGS_WEIGHT
+
+The batch job scores every provider in a single set-based statement (earnings come from
+the booking_daily_stats rollup) and swaps the ranked result into provider_leaderboard.
+Reads never recompute: top-K walks the rank index, rank-of-provider is a PK lookup.
+"""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.booking_daily_stats import BookingDailyStat
+from app.db.models.leaderboard import ProviderLeaderboardEntry
+from app.db.models.user import User
+
+
+def refresh_leaderboard(db: Session, rating_weight: Optional[float] = None, earnings_weight: Optional[float] = None):
+    rating_weight = settings.LEADERBOARD_RATING_WEIGHT if rating_weight is None else rating_weight
+    earnings_weight = settings.LEADERBOARD_EARNINGS_WEIGHT if earnings_weight is None else earnings_weight
+
+    earnings = (
+        select(
+            BookingDailyStat.provider_id.label("provider_id"),
+            func.sum(BookingDailyStat.amount_sum).label("earnings"),
+            func.sum(BookingDailyStat.bookings_count).label("completed"),
+        )
+        .where(BookingDailyStat.status == "completed")
+        .group_by(BookingDailyStat.provider_id)
+        .subquery()
+    )
+    avg_rating = func.coalesce(User.avg_rating, 0)
+    rating_count = func.coalesce(User.rating_count, 0)
+    earned = func.coalesce(earnings.c.earnings, 0)
+    max_earned = func.nullif(func.max(earned).over(), 0)
+    scored = (
+        select(
+            User.id.label("provider_id"),
+            avg_rating.label("avg_rating"),
+            rating_count.label("rating_count"),
+            earned.label("total_earnings"),
+            func.coalesce(earnings.c.completed, 0).label("completed_bookings"),
+            (
+                avg_rating * func.ln(1 + rating_count) * rating_weight
+                + func.coalesce(earned / max_earned, 0) * earnings_weight
+            ).label("score"),
+        )
+        .outerjoin(earnings, earnings.c.provider_id == User.id)
+        .where(User.role == "provider")
+        .subquery()
+    )
+    ranked = select(
+        scored.c.provider_id,
+        func.row_number().over(order_by=(scored.c.score.desc(), scored.c.provider_id)),
+        scored.c.score,
+        scored.c.avg_rating,
+        scored.c.rating_count,
+        scored.c.total_earnings,
+        scored.c.completed_bookings,
+        literal(datetime.utcnow()),
+    )
+
+    # readers keep seeing the previous ranking until this commits
+    db.execute(delete(ProviderLeaderboardEntry))
+    db.execute(
+        insert(ProviderLeaderboardEntry).from_select(
+            ["provider_id", "rank", "score", "avg_rating", "rating_count", "total_earnings", "completed_bookings", "computed_at"],
+            ranked,
+        )
+    )
+    db.commit()
+
+
+def top_providers(db: Session, limit: int = 20, offset: int = 0) -> List[Tuple[ProviderLeaderboardEntry, Optional[str]]]:
+    return (
+        db.query(ProviderLeaderboardEntry, User.name)
+        .outerjoin(User, User.id == ProviderLeaderboardEntry.provider_id)
+        .order_by(ProviderLeaderboardEntry.rank)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+
+def provider_rank(db: Session, provider_id: int) -> Optional[ProviderLeaderboardEntry]:
+    return db.query(ProviderLeaderboardEntry).filter(ProviderLeaderboardEntry.provider_id == provider_id).first()
+
+
+def ranked_count(db: Session) -> int:
+    # ranks are dense 1..N, so the max rank is the population size
+    return int(db.query(func.max(ProviderLeaderboardEntry.rank)).scalar() or 0)
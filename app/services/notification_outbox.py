@@ -0,0 +1,207 @@
+# app/services/notification_outbox.py
+"""
+Notification delivery from the notifications table used as a durable outbox.
+
+dispatch_notification() only inserts the row; a small pool of worker threads per
+process claims due rows a user at a time: a claim takes a transaction-scoped advisory
+lock per user (skipping users another worker holds, so workers in every process share
+the queue without double sends), then locks every due row of those users, sends them
+and marks them sent in the same transaction. Workers are woken right after a local commit and otherwise poll.
+
+A failed send is retried after an exponentially growing, jittered delay
+(NOTIFICATION_RETRY_BASE_SECONDS doubling per attempt, capped at
+NOTIFICATION_RETRY_MAX_SECONDS) and given up after NOTIFICATION_MAX_ATTEMPTS. While the
+SMTP circuit breaker is open nothing is claimed, so an outage costs no attempts and the
+queue simply grows until the server is back.
+
+Digests: a new row is due at the end of its user's NOTIFICATION_DIGEST_WINDOW_MINUTES
+bucket rather than immediately, so every notification a user gets within one window
+becomes due at the same moment, is claimed together (a claim never takes only part of
+a user's due rows) and is sent as one message.
+Bucket boundaries are offset per user so digests do not all fall due at once.
+"""
+import logging
+import random
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, lazyload
+
+from app.core.config import settings
+from app.core.circuit_breaker import CircuitOpenError
+from app.core.email import send_many, smtp_breaker, smtp_pool
+from app.db.base import SessionLocal
+from app.db.models.notification import Notification
+from app.db.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_wake = threading.Event()
+_stop = threading.Event()
+_threads: List[threading.Thread] = []
+
+_EPOCH = datetime(1970, 1, 1)
+
+# first key of the two-key advisory locks claiming a user's notifications (user_id is the second)
+_CLAIM_LOCK_NAMESPACE = zlib.crc32(b"notification_outbox") & 0x7FFFFFFF
+
+
+def wake_workers():
+    _wake.set()
+
+
+def _subject(notification: Notification) -> str:
+    return f"Booking Update: {notification.type}"
+
+
+def digest_due_at(user_id: int, now: datetime) -> datetime:
+    """End of the user's digest window containing `now`."""
+    window = settings.NOTIFICATION_DIGEST_WINDOW_MINUTES * 60
+    if window <= 0:
+        return now
+    offset = user_id % window
+    elapsed = (now - _EPOCH).total_seconds() - offset
+    return _EPOCH + timedelta(seconds=(elapsed // window + 1) * window + offset)
+
+
+def _digest(notifications: List[Notification]) -> Tuple[str, str]:
+    if len(notifications) == 1:
+        return _subject(notifications[0]), notifications[0].message
+    return (
+        f"Booking Updates: {len(notifications)} new",
+        "\n".join(f"- {notification.message}" for notification in notifications),
+    )
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before attempt `attempts + 1`: exponential, capped, with equal jitter."""
+    delay = min(settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.NOTIFICATION_RETRY_MAX_SECONDS)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def _record_failure(notification: Notification, now: datetime, retry_at: datetime, error: Optional[str]):
+    notification.last_error = (error or "send failed")[:500]
+    if notification.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+        notification.failed_at = now
+        logger.warning("notification %s given up after %d attempts", notification.id, notification.attempts)
+    else:
+        notification.next_attempt_at = retry_at
+
+
+def _claim_users(db: Session, now: datetime, limit: int) -> List[int]:
+    """Up to `limit` users with due notifications, earliest first, locked for this transaction."""
+    due_users = (
+        # matches ix_notifications_unsent_due
+        select(Notification.user_id, func.min(Notification.next_attempt_at).label("due_at"))
+        .where(Notification.is_sent == False, Notification.failed_at.is_(None), Notification.next_attempt_at <= now)
+        .group_by(Notification.user_id)
+        .order_by("due_at", Notification.user_id)
+        .subquery()
+    )
+    return db.execute(
+        select(due_users.c.user_id)
+        # evaluated row by row under the LIMIT: users held by another worker are skipped,
+        # not waited on, and no lock is taken beyond the users returned
+        .where(func.pg_try_advisory_xact_lock(_CLAIM_LOCK_NAMESPACE, due_users.c.user_id))
+        .limit(limit)
+    ).scalars().all()
+
+
+def deliver_batch(db: Session, limit: int) -> Tuple[int, int]:
+    """
+    Claim every due notification of up to `limit` users, send one message per user and
+    commit. Returns (notifications claimed, notifications sent).
+    """
+    now = datetime.utcnow()
+    user_ids = _claim_users(db, now, limit)
+    if not user_ids:
+        db.rollback()
+        return 0, 0
+    rows = (
+        db.query(Notification, User.email)
+        .join(User, User.id == Notification.user_id)
+        .options(lazyload("*"))
+        .filter(
+            Notification.user_id.in_(user_ids),
+            Notification.is_sent == False, Notification.failed_at.is_(None), Notification.next_attempt_at <= now,
+        )
+        .order_by(Notification.user_id, Notification.id)
+        .with_for_update(of=Notification)
+        .all()
+    )
+    if not rows:
+        # the users' rows went out in a claim that committed after we picked them
+        db.rollback()
+        return 0, 0
+    # one message per user: everything claimed for them is merged into a digest
+    digests: Dict[int, List[Notification]] = {}
+    emails: Dict[int, str] = {}
+    for notification, email in rows:
+        digests.setdefault(notification.user_id, []).append(notification)
+        emails[notification.user_id] = email
+    try:
+        # the whole batch goes through one pooled SMTP connection
+        results = send_many([(emails[user_id], *_digest(group)) for user_id, group in digests.items()])
+    except CircuitOpenError:
+        # release the claim untouched: an outage does not count as an attempt
+        db.rollback()
+        return len(rows), 0
+    sent = 0
+    for group, result in zip(digests.values(), results):
+        # one retry time for the whole group, so a retried digest stays one message
+        retry_at = now + timedelta(seconds=retry_delay(max(n.attempts for n in group) + 1))
+        for notification in group:
+            notification.attempts += 1
+            if result.ok:
+                notification.is_sent = True
+                notification.sent_at = datetime.utcnow()
+                notification.last_error = None
+                sent += 1
+            else:
+                _record_failure(notification, now, retry_at, result.error)
+    db.commit()
+    return len(rows), sent
+
+
+def _worker():
+    while not _stop.is_set():
+        if smtp_breaker.is_open():
+            # mail server is down: leave the queue alone until the breaker lets a trial through
+            _stop.wait(settings.NOTIFICATION_POLL_SECONDS)
+            continue
+        claimed = sent = 0
+        db = SessionLocal()
+        try:
+            claimed, sent = deliver_batch(db, settings.NOTIFICATION_CLAIM_BATCH)
+        except Exception:
+            logger.exception("notification worker batch failed")
+            db.rollback()
+        finally:
+            db.close()
+        if claimed >= settings.NOTIFICATION_CLAIM_BATCH and sent:
+            # full batch that made progress: there is probably more queued
+            continue
+        _wake.wait(settings.NOTIFICATION_POLL_SECONDS)
+        _wake.clear()
+
+
+def start_notification_workers():
+    if settings.NOTIFICATION_WORKERS <= 0 or _threads:
+        return
+    _stop.clear()
+    for i in range(settings.NOTIFICATION_WORKERS):
+        t = threading.Thread(target=_worker, name=f"notification-worker-{i}", daemon=True)
+        t.start()
+        _threads.append(t)
+
+
+def stop_notification_workers():
+    _stop.set()
+    _wake.set()
+    for t in _threads:
+        t.join(timeout=10)
+    _threads.clear()
+    smtp_pool.close()
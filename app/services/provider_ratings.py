@@ -0,0 +1,112 @@
+# app/services/provider_ratings.py
+"""
+Provider rating aggregates (users.rating_sum, rating_count, avg_rating and the star
+histogram rating_count_1..rating_count_5).
+
+Reviews adjust them with a single UPDATE in the review's own transaction. SET
+expressions read the row's pre-update values under its row lock, so concurrent reviews
+of one provider serialize without lost updates. Deleting goes through delete_review(),
+whose DELETE ... RETURNING lets only the delete that actually removed the row take it
+off the aggregates. repair_provider_ratings() recomputes
+every provider from the reviews table with one grouped query.
+"""
+from sqlalchemy import case, delete, exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models.review import Review
+from app.db.models.user import User
+
+
+STARS = range(1, 6)
+
+
+def _star_column(star: int):
+    return getattr(User, f"rating_count_{star}")
+
+
+def _apply(db: Session, provider_id: int, rating: int, count_delta: int):
+    new_sum = func.coalesce(User.rating_sum, 0) + rating * count_delta
+    new_count = func.coalesce(User.rating_count, 0) + count_delta
+    star = _star_column(rating)
+    db.execute(
+        update(User)
+        .where(User.id == provider_id)
+        .values(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            avg_rating=case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0),
+            **{star.key: star + count_delta},
+            # a rating change is not a profile edit
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def review_added(db: Session, review: Review):
+    _apply(db, review.provider_id, review.rating, 1)
+
+
+def delete_review(db: Session, review_id: int) -> bool:
+    """Delete a review and take it off its provider's aggregates. False if it was already gone."""
+    row = db.execute(
+        delete(Review)
+        .where(Review.id == review_id)
+        .returning(Review.provider_id, Review.rating)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        # a concurrent delete won (or the review never existed): nothing to take off
+        return False
+    _apply(db, row.provider_id, row.rating, -1)
+    return True
+
+
+def repair_provider_ratings(db: Session):
+    """Scheduled job: recompute every provider's aggregates from reviews."""
+    agg = (
+        select(
+            Review.provider_id.label("provider_id"),
+            func.sum(Review.rating).label("rating_sum"),
+            func.count(Review.id).label("rating_count"),
+            *(func.count(Review.id).filter(Review.rating == s).label(f"rating_count_{s}") for s in STARS),
+        )
+        .group_by(Review.provider_id)
+        .subquery()
+    )
+    db.execute(
+        update(User)
+        .where(
+            User.id == agg.c.provider_id,
+            # only rows that drifted
+            or_(
+                User.rating_sum.is_distinct_from(agg.c.rating_sum),
+                User.rating_count.is_distinct_from(agg.c.rating_count),
+                *(_star_column(s) != agg.c[f"rating_count_{s}"] for s in STARS),
+            ),
+        )
+        .values(
+            rating_sum=agg.c.rating_sum,
+            rating_count=agg.c.rating_count,
+            avg_rating=agg.c.rating_sum * 1.0 / agg.c.rating_count,
+            **{f"rating_count_{s}": agg.c[f"rating_count_{s}"] for s in STARS},
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    # providers whose last review is gone
+    db.execute(
+        update(User)
+        .where(
+            User.role == "provider",
+            or_(User.rating_sum != 0, func.coalesce(User.rating_count, 0) != 0, *(_star_column(s) != 0 for s in STARS)),
+            ~exists().where(Review.provider_id == User.id),
+        )
+        .values(
+            rating_sum=0, rating_count=0, avg_rating=0.0,
+            **{f"rating_count_{s}": 0 for s in STARS},
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
@@ -0,0 +1,34 @@
+# app/services/reviews.py
+"""Read side of provider reviews: keyset pages and the stored rating summary."""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.models.review import Review
+from app.db.models.user import User
+
+
+def provider_reviews_page(
+    db: Session, provider_id: int, limit: Optional[int], cursor: Optional[str] = None,
+) -> Tuple[List[Review], Optional[str]]:
+    """Newest first; returns (reviews, cursor for the next page or None). limit=None returns every review."""
+    q = db.query(Review).filter(Review.provider_id == provider_id)
+    after = decode_cursor(cursor)
+    if after is not None:
+        q = q.filter(tuple_(Review.created_at, Review.id) < after)
+    q = q.order_by(Review.created_at.desc(), Review.id.desc())
+    if limit is None:
+        return q.all(), None
+    # one extra row tells whether another page exists
+    rows = q.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def rating_histogram(provider: User) -> Dict[int, int]:
+    """{1..5: review count}, read from the provider's stored counters."""
+    return {star: int(getattr(provider, f"rating_count_{star}") or 0) for star in range(1, 6)}
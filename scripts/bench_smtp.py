@@ -0,0 +1,70 @@
+"""
+SMTP transport throughput against a local stand-in server.
+
+    python scripts/bench_smtp.py --messages 2000 --batch 50 --threads 4
+
+Compares the pooled transport (app.core.email.SMTPPool) with opening one connection
+per message, which is what send_email used to do.
+"""
+import argparse
+import os
+import smtplib
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for key, value in {
+    "DATABASE_URL": "postgresql+psycopg2://u:p@localhost/db",
+    "SECRET_KEY": "bench",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+}.items():
+    os.environ.setdefault(key, value)
+
+from app.core import email  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from tests.smtp_server import StandInSMTP  # noqa: E402
+
+
+def _connection_per_message(messages):
+    for to_email, subject, body in messages:
+        msg = MIMEText(body)
+        msg["Subject"], msg["From"], msg["To"] = subject, settings.SMTP_FROM, to_email
+        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as smtp:
+            smtp.sendmail(msg["From"], [to_email], msg.as_string())
+
+
+def _run(label, send, messages, batch, threads):
+    batches = [messages[i:i + batch] for i in range(0, len(messages), batch)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(send, batches))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<24} {len(messages):>6} msgs  {elapsed:7.2f}s  {len(messages) / elapsed:9.1f} msg/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    server = StandInSMTP()
+    server.start()
+    settings.SMTP_HOST, settings.SMTP_PORT = "127.0.0.1", server.port
+    settings.SMTP_STARTTLS, settings.SMTP_USER, settings.SMTP_FROM = False, "", "bench@servicehub.test"
+    pool = email.SMTPPool(args.threads)
+    messages = [(f"user{i}@servicehub.test", "Booking Update", "x" * 500) for i in range(args.messages)]
+    try:
+        _run("connection per message", _connection_per_message, messages, args.batch, args.threads)
+        _run("pooled send_many", pool.send_many, messages, args.batch, args.threads)
+    finally:
+        pool.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Local stand-in SMTP server (aiosmtpd) for tests and benchmarks."""
+import socket
+import threading
+from typing import List, Optional
+
+from aiosmtpd.controller import Controller
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _Handler:
+    def __init__(self, server: "StandInSMTP"):
+        self.server = server
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.server.reject:
+            return "550 no such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if any(rcpt in self.server.reject_data for rcpt in envelope.rcpt_tos):
+            return "552 message rejected"
+        with self.server.lock:
+            self.server.messages.append((envelope.mail_from, list(envelope.rcpt_tos), envelope.content))
+            self.server.sessions.add(id(session))
+        return "250 Message accepted"
+
+
+class StandInSMTP:
+    def __init__(self, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.messages: List[tuple] = []
+        self.sessions: set = set()  # one id per SMTP connection that delivered mail
+        self.reject: set = set()  # refused at RCPT (SMTPRecipientsRefused)
+        self.reject_data: set = set()  # refused at DATA with a 5xx (SMTPDataError)
+        self.lock = threading.Lock()
+        self._controller: Optional[Controller] = None
+
+    def start(self):
+        self._controller = Controller(_Handler(self), hostname="127.0.0.1", port=self.port)
+        self._controller.start()
+
+    def stop(self):
+        if self._controller is not None:
+            self._controller.stop()
+            self._controller = None
+
+    def restart(self):
+        """Drop every open client connection, as a server restart or idle timeout would."""
+        self.stop()
+        self.start()
@@ -0,0 +1,66 @@
+from datetime import datetime, time, timedelta
+
+from app.api.routes.admin_dashboard import admin_dashboard
+from app.core.security import Principal
+from app.db.models.booking import Booking
+from app.db.models.category import Category
+from app.db.models.service import Service
+from app.db.models.user import User
+from app.services import booking_stats
+
+# KPIs, status counts, top providers, categories, 30-day trend
+ADMIN_DASHBOARD_QUERIES = 5
+
+
+def _seed(db, providers: int, bookings_per_provider: int):
+    now = datetime.utcnow()
+    offset = db.query(User).count()
+    customer = User(email=f"customer{offset}@servicehub.test", name="Customer", password_hash="x", role="customer")
+    db.add(customer)
+    for p in range(providers):
+        provider = User(email=f"provider{offset}-{p}@servicehub.test", name=f"Provider {p}", password_hash="x", role="provider")
+        category = Category(name=f"Category {offset}-{p}")
+        db.add_all([provider, category])
+        db.flush()
+        service = Service(provider_id=provider.id, category_id=category.id, name=f"Service {p}", price=50.0)
+        db.add(service)
+        db.flush()
+        for b in range(bookings_per_provider):
+            created = now - timedelta(days=b % 40)
+            db.add(Booking(
+                customer_id=customer.id, provider_id=provider.id, service_id=service.id,
+                booking_date=created.date(), booking_time=time(10), address="1 Main St",
+                amount=50.0 + b, status=("completed", "pending", "canceled")[b % 3], created_at=created,
+            ))
+    db.commit()
+    booking_stats.reconcile_daily_stats(db, days=0)
+
+
+def _run(db, admin, count_statements):
+    with count_statements() as counter:
+        response = admin_dashboard.__wrapped__(db=db, current_user=admin)
+    return response, counter.count
+
+
+def test_admin_dashboard_query_count_is_fixed(pg_session, count_statements):
+    user = User(email="admin@servicehub.test", name="Admin", password_hash="x", role="admin")
+    pg_session.add(user)
+    pg_session.commit()
+    admin = Principal(id=user.id, email=user.email, role="admin", is_active=True, is_provider_approved=None, token_version=0)
+    _seed(pg_session, providers=2, bookings_per_provider=6)
+
+    small, small_count = _run(pg_session, admin, count_statements)
+
+    _seed(pg_session, providers=12, bookings_per_provider=30)
+    large, large_count = _run(pg_session, admin, count_statements)
+
+    assert small_count == ADMIN_DASHBOARD_QUERIES
+    # no per-provider, per-category or per-day round trips
+    assert large_count == ADMIN_DASHBOARD_QUERIES
+
+    assert large.kpis.total_providers == 14
+    assert len(large.top_providers_by_earnings) == 10
+    assert all(item.provider_name for item in large.top_providers_by_earnings)
+    assert all(item.category_name for item in large.earnings_by_category)
+    assert len(large.bookings_trend_last_30_days) == 30
+    assert sum(large.bookings_by_status.values()) == large.kpis.total_bookings
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+from app.core.time_windows import booking_clock
+from app.db.models.booking import Booking
+from app.db.models.category import Category
+from app.db.models.service import Service
+from app.db.models.user import User
+from app.services.booking_expiry import expire_stale_bookings
+
+
+def _pending(db, starts_at: datetime) -> Booking:
+    customer = db.query(User).filter(User.role == "customer").first()
+    service = db.query(Service).first()
+    booking = Booking(
+        customer_id=customer.id, provider_id=service.provider_id, service_id=service.id,
+        booking_date=starts_at.date(), booking_time=starts_at.time().replace(microsecond=0),
+        address="1 Main St", amount=50.0, status="pending", created_at=datetime.utcnow(),
+    )
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def _seed(db):
+    customer = User(email="customer@servicehub.test", name="Customer", password_hash="x", role="customer")
+    provider = User(email="provider@servicehub.test", name="Provider", password_hash="x", role="provider")
+    category = Category(name="Cleaning")
+    db.add_all([customer, provider, category])
+    db.flush()
+    db.add(Service(provider_id=provider.id, category_id=category.id, name="Deep clean", price=50.0))
+    db.commit()
+
+
+def test_start_times_are_compared_on_the_business_clock(pg_session, monkeypatch):
+    monkeypatch.setattr("app.core.time_windows.settings.BOOKING_UTC_OFFSET_MINUTES", 330)
+    _seed(pg_session)
+    local_now = booking_clock()
+    # already started locally, though still hours ahead of UTC
+    started = _pending(pg_session, local_now - timedelta(hours=1))
+    upcoming = _pending(pg_session, local_now + timedelta(hours=1))
+
+    expire_stale_bookings(pg_session)
+
+    pg_session.expire_all()
+    assert pg_session.get(Booking, started.id).status == "expired"
+    assert pg_session.get(Booking, upcoming.id).status == "pending"
+
+
+def test_route_waiting_on_the_sweep_sees_the_booking_expired(pg_engine, pg_session, monkeypatch):
+    import threading
+
+    from fastapi import HTTPException
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.routes.bookings import accept_booking
+    from app.core.security import Principal
+
+    monkeypatch.setattr("app.core.time_windows.settings.BOOKING_UTC_OFFSET_MINUTES", 330)
+    _seed(pg_session)
+    booking = _pending(pg_session, booking_clock() - timedelta(hours=1))
+    provider = pg_session.get(User, booking.provider_id)
+    principal = Principal(provider.id, provider.email, "provider", True, True, 0)
+
+    # the sweep holds the row, as inside _expire_batch before its commit
+    sweep = pg_engine.connect()
+    sweep.begin()
+    sweep.execute(text("UPDATE bookings SET status = 'expired' WHERE id = :id"), {"id": booking.id})
+
+    outcome = {}
+    route_db = sessionmaker(bind=pg_engine)()
+
+    def accept():
+        try:
+            accept_booking(booking.id, db=route_db, current_user=principal)
+            outcome["status"] = "accepted"
+        except HTTPException as e:
+            outcome["status"] = e.status_code
+
+    worker = threading.Thread(target=accept)
+    worker.start()
+    worker.join(timeout=0.5)
+    assert worker.is_alive()  # blocked on the row lock
+    sweep.commit()
+    sweep.close()
+    worker.join(timeout=5)
+    route_db.close()
+
+    assert outcome["status"] == 400
+    pg_session.expire_all()
+    assert pg_session.get(Booking, booking.id).status == "expired"
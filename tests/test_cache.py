@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from app.core.cache import SWRCache
+
+
+def _slow(counter, value, started=None, release=None):
+    def compute():
+        with counter["lock"]:
+            counter["n"] += 1
+        if started is not None:
+            started.set()
+        if release is not None:
+            release.wait(5)
+        else:
+            time.sleep(0.05)
+        return value
+    return compute
+
+
+def _counter():
+    return {"n": 0, "lock": threading.Lock()}
+
+
+def _read_concurrently(cache, key, compute, readers=20):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute(key, compute, ttl=60))) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    return threads, results
+
+
+def test_cold_key_is_computed_once_for_concurrent_readers():
+    cache = SWRCache(stale_seconds=60)
+    calls = _counter()
+    threads, results = _read_concurrently(cache, ("provider", 1), _slow(calls, "v"))
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert results == ["v"] * 20
+
+
+def test_unrelated_invalidation_does_not_break_single_flight():
+    cache = SWRCache(stale_seconds=60)
+    calls = _counter()
+    started, release = threading.Event(), threading.Event()
+    threads, results = _read_concurrently(cache, ("provider", 1), _slow(calls, "v", started, release))
+    started.wait(5)
+    cache.invalidate_where(lambda key: key == ("customer", 2))
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert results == ["v"] * 20
+    # and the result was kept
+    assert cache.get_or_compute(("provider", 1), lambda: pytest.fail("recomputed"), ttl=60) == "v"
+
+
+def test_invalidating_the_key_mid_computation_discards_the_result():
+    cache = SWRCache(stale_seconds=60)
+    calls = _counter()
+    started, release = threading.Event(), threading.Event()
+    threads, results = _read_concurrently(cache, ("provider", 1), _slow(calls, "old", started, release), readers=5)
+    started.wait(5)
+    cache.invalidate_where(lambda key: key == ("provider", 1))
+    release.set()
+    for t in threads:
+        t.join()
+
+    # callers already waiting share the owner's result, but it is not cached
+    assert calls["n"] == 1
+    assert results == ["old"] * 5
+    assert cache.get_or_compute(("provider", 1), lambda: "new", ttl=60) == "new"
+
+
+def test_owner_failure_reaches_waiters_without_recomputing():
+    cache = SWRCache(stale_seconds=60)
+    calls = _counter()
+    started, release = threading.Event(), threading.Event()
+
+    def failing():
+        _slow(calls, None, started, release)()
+        raise RuntimeError("db down")
+
+    errors = []
+
+    def read():
+        try:
+            cache.get_or_compute("k", failing, ttl=60)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(10)]
+    for t in threads:
+        t.start()
+    started.wait(5)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls["n"] == 1
+    assert len(errors) == 10
+    assert cache.get_or_compute("k", lambda: "ok", ttl=60) == "ok"
+
+
+def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = SWRCache(stale_seconds=60)
+    cache.get_or_compute("k", lambda: "v1", ttl=60)
+    cache.expire_where(lambda key: key == "k")
+    calls = _counter()
+
+    values = [cache.get_or_compute("k", _slow(calls, "v2"), ttl=60) for _ in range(5)]
+    deadline = time.monotonic() + 5
+    while cache.get_or_compute("k", lambda: "miss", ttl=60) != "v2" and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert values == ["v1"] * 5
+    assert calls["n"] == 1
+    assert cache.get_or_compute("k", lambda: "miss", ttl=60) == "v2"
@@ -0,0 +1,128 @@
+import pytest
+
+from app.core import email
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+from tests.smtp_server import StandInSMTP, free_port
+
+
+@pytest.fixture
+def smtp_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+    monkeypatch.setattr(settings, "SMTP_STARTTLS", False)
+    monkeypatch.setattr(settings, "SMTP_USER", "")
+    monkeypatch.setattr(settings, "SMTP_FROM", "noreply@servicehub.test")
+    monkeypatch.setattr(settings, "SMTP_TIMEOUT_SECONDS", 2.0)
+    monkeypatch.setattr(email, "smtp_breaker", CircuitBreaker("smtp-test", 3, 60))
+
+
+@pytest.fixture
+def server(smtp_settings, monkeypatch):
+    srv = StandInSMTP()
+    srv.start()
+    monkeypatch.setattr(settings, "SMTP_PORT", srv.port)
+    yield srv
+    srv.stop()
+
+
+@pytest.fixture
+def pool():
+    p = email.SMTPPool(2)
+    yield p
+    p.close()
+
+
+def _free_slots(pool: email.SMTPPool) -> int:
+    return pool._slots._value
+
+
+def _ok(results):
+    return [r.ok for r in results]
+
+
+def test_batch_goes_through_one_pooled_connection(server, pool):
+    messages = [(f"user{i}@servicehub.test", "Booking Update", f"body {i}") for i in range(20)]
+
+    assert _ok(pool.send_many(messages)) == [True] * 20
+    assert _ok(pool.send_many(messages[:5])) == [True] * 5
+
+    assert len(server.messages) == 25
+    # both batches reused the same authenticated connection
+    assert len(server.sessions) == 1
+    assert _free_slots(pool) == 2
+
+
+def test_dropped_connection_is_replaced_once(server, pool):
+    assert _ok(pool.send_many([("a@servicehub.test", "s", "b")])) == [True]
+
+    server.restart()
+
+    assert _ok(pool.send_many([("b@servicehub.test", "s", "b"), ("c@servicehub.test", "s", "b")])) == [True, True]
+    assert [m[1] for m in server.messages] == [["a@servicehub.test"], ["b@servicehub.test"], ["c@servicehub.test"]]
+    assert _free_slots(pool) == 2
+
+
+def test_refused_recipient_fails_only_that_message(server, pool):
+    server.reject.add("gone@servicehub.test")
+
+    results = pool.send_many([("gone@servicehub.test", "s", "b"), ("ok@servicehub.test", "s", "b")])
+
+    assert _ok(results) == [False, True]
+    assert results[0].error.startswith("550")
+    assert email.smtp_breaker.is_open() is False
+
+
+def test_rejected_message_fails_alone_without_reconnecting(server, pool):
+    server.reject_data.add("big@servicehub.test")
+    messages = [("a@servicehub.test", "s", "b"), ("big@servicehub.test", "s", "b"), ("c@servicehub.test", "s", "b")]
+
+    for _ in range(5):
+        results = pool.send_many(messages)
+        assert _ok(results) == [True, False, True]
+        assert results[1].error.startswith("552")
+
+    # one connection throughout, and a permanent rejection never counts against the server
+    assert len(server.sessions) == 1
+    assert email.smtp_breaker.is_open() is False
+
+
+def test_connection_refused_returns_false_and_keeps_slots(smtp_settings, monkeypatch, pool):
+    monkeypatch.setattr(settings, "SMTP_PORT", free_port())  # nothing listens there
+
+    results = pool.send_many([("a@servicehub.test", "s", "b"), ("b@servicehub.test", "s", "b")])
+    assert _ok(results) == [False, False]
+    assert results[0].error.startswith("SMTP unavailable")
+    assert _free_slots(pool) == 2
+
+    monkeypatch.setattr(email, "smtp_pool", pool)
+    assert email.send_email("c@servicehub.test", "s", "b") is False
+    assert _free_slots(pool) == 2
+
+
+def test_breaker_opens_after_repeated_connection_failures(smtp_settings, monkeypatch, pool):
+    monkeypatch.setattr(settings, "SMTP_PORT", free_port())
+
+    for _ in range(3):
+        pool.send_many([("a@servicehub.test", "s", "b")])
+
+    with pytest.raises(CircuitOpenError):
+        pool.send_many([("a@servicehub.test", "s", "b")])
+    assert _free_slots(pool) == 2
+
+
+def test_unexpected_error_in_half_open_trial_does_not_wedge_the_breaker(server, monkeypatch, pool):
+    breaker = CircuitBreaker("smtp-test", 1, 0)
+    monkeypatch.setattr(email, "smtp_breaker", breaker)
+    breaker.record_failure()  # open; with no reset delay the next call is the trial
+
+    def broken(conn, to_email, subject, body):
+        raise UnicodeEncodeError("ascii", to_email, 0, 1, "ordinal not in range(128)")
+
+    monkeypatch.setattr(pool, "_send_one", broken)
+    with pytest.raises(UnicodeEncodeError):
+        pool.send_many([("ünïcode@servicehub.test", "s", "b")])
+
+    # the failed trial re-opened the circuit instead of leaving it claimed forever
+    assert breaker.is_open() is False
+    assert breaker.allow() is True
+    assert _free_slots(pool) == 2
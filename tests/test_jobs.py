@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from app.db.models.job_watermark import JobWatermark
+from app.services import jobs
+
+HOUR = 3600
+
+
+def _counting():
+    calls = []
+    return calls, lambda db: calls.append(db)
+
+
+def test_reconcile_runs_once_per_interval(pg_session):
+    calls, func = _counting()
+    run = jobs._at_most_every("reconcile", HOUR, func)
+
+    run(pg_session)
+    run(pg_session)  # e.g. a restart shortly after
+
+    assert len(calls) == 1
+    assert pg_session.get(JobWatermark, "reconcile:last_run") is not None
+
+
+def test_reconcile_runs_again_once_the_interval_has_passed(pg_session):
+    calls, func = _counting()
+    run = jobs._at_most_every("reconcile", HOUR, func)
+    run(pg_session)
+    mark = pg_session.get(JobWatermark, "reconcile:last_run")
+    mark.watermark = datetime.utcnow() - timedelta(seconds=HOUR + 1)
+    pg_session.commit()
+
+    run(pg_session)
+
+    assert len(calls) == 2
+
+
+def test_reconcile_runs_within_the_interval_when_needed(pg_session):
+    calls, func = _counting()
+    needed = [False]
+    run = jobs._at_most_every("reconcile", HOUR, func, needed=lambda db: needed[0])
+    run(pg_session)
+    run(pg_session)
+    needed[0] = True
+    run(pg_session)
+
+    assert len(calls) == 2
+
+
+def test_empty_rollup_is_only_needed_when_there_are_bookings(pg_session):
+    from app.db.models.booking_daily_stats import BookingDailyStat
+
+    assert jobs._unfilled(BookingDailyStat)(pg_session) is False
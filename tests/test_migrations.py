@@ -0,0 +1,43 @@
+from sqlalchemy import inspect, text
+
+from app.db.migrations import ADDED_COLUMNS, ADDED_INDEXES, upgrade_schema
+
+
+def _downgrade(conn):
+    """Strip the added columns and indexes, leaving the tables as an older release created them."""
+    for table_name, index_names in ADDED_INDEXES.items():
+        for name in index_names:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    for table_name, columns in ADDED_COLUMNS.items():
+        for name in columns:
+            conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN IF EXISTS {name}"))
+    conn.commit()
+
+
+def test_upgrade_adds_missing_columns_and_indexes(pg_engine):
+    with pg_engine.connect() as conn:
+        _downgrade(conn)
+        conn.execute(text(
+            "INSERT INTO users (email, name, password_hash, role, created_at) "
+            "VALUES ('old@servicehub.test', 'Old', 'x', 'provider', now())"
+        ))
+        conn.commit()
+
+        upgrade_schema(conn)
+        upgrade_schema(conn)  # a second run is a no-op
+
+        inspector = inspect(conn)
+        for table_name, columns in ADDED_COLUMNS.items():
+            existing = {c["name"] for c in inspector.get_columns(table_name)}
+            assert set(columns) <= existing
+        for table_name, index_names in ADDED_INDEXES.items():
+            existing = {i["name"] for i in inspector.get_indexes(table_name)}
+            assert set(index_names) <= existing
+
+        # existing rows get the server defaults of the new NOT NULL columns
+        row = conn.execute(text(
+            "SELECT rating_sum, rating_count_5, token_version FROM users WHERE email = 'old@servicehub.test'"
+        )).one()
+        assert tuple(row) == (0, 0, 0)
+        conn.execute(text("TRUNCATE users RESTART IDENTITY CASCADE"))
+        conn.commit()
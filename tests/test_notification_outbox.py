@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.email import SENT
+from app.db.models.notification import Notification
+from app.db.models.user import User
+from app.services import notification_outbox
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    sent = []
+
+    def send_many(messages):
+        sent.extend(messages)
+        return [SENT] * len(messages)
+
+    monkeypatch.setattr(notification_outbox, "send_many", send_many)
+    return sent
+
+
+def _user(db, name: str) -> User:
+    user = User(email=f"{name}@servicehub.test", name=name, password_hash="x", role="provider")
+    db.add(user)
+    db.flush()
+    return user
+
+
+def _queue(db, user: User, count: int):
+    due = datetime.utcnow() - timedelta(minutes=1)
+    db.add_all(
+        Notification(user_id=user.id, channel="email", type="booking_created", message=f"booking {i}", next_attempt_at=due)
+        for i in range(count)
+    )
+    db.commit()
+
+
+def test_a_busy_users_bucket_is_claimed_whole(pg_session, outbox):
+    busy = _user(pg_session, "busy")
+    _queue(pg_session, busy, 15)
+
+    claimed, sent = notification_outbox.deliver_batch(pg_session, limit=2)
+
+    assert (claimed, sent) == (15, 15)
+    assert len(outbox) == 1
+    assert outbox[0][1] == "Booking Updates: 15 new"
+
+
+def test_users_held_by_another_worker_are_skipped(pg_engine, pg_session, outbox):
+    first, second = _user(pg_session, "first"), _user(pg_session, "second")
+    _queue(pg_session, first, 3)
+    _queue(pg_session, second, 2)
+
+    with pg_engine.connect() as other_worker:
+        other_worker.begin()
+        other_worker.execute(select(func.pg_advisory_xact_lock(notification_outbox._CLAIM_LOCK_NAMESPACE, first.id)))
+
+        claimed, _ = notification_outbox.deliver_batch(pg_session, limit=10)
+        other_worker.rollback()
+
+    assert claimed == 2
+    assert [email for email, _, _ in outbox] == ["second@servicehub.test"]
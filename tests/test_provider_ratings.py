@@ -0,0 +1,45 @@
+from datetime import date, time
+
+from app.db.models.booking import Booking
+from app.db.models.category import Category
+from app.db.models.review import Review
+from app.db.models.service import Service
+from app.db.models.user import User
+from app.services import provider_ratings
+
+
+def _review(db, rating: int) -> Review:
+    customer = User(email="customer@servicehub.test", name="Customer", password_hash="x", role="customer")
+    provider = User(email="provider@servicehub.test", name="Provider", password_hash="x", role="provider")
+    category = Category(name="Cleaning")
+    db.add_all([customer, provider, category])
+    db.flush()
+    service = Service(provider_id=provider.id, category_id=category.id, name="Deep clean", price=50.0)
+    db.add(service)
+    db.flush()
+    booking = Booking(
+        customer_id=customer.id, provider_id=provider.id, service_id=service.id,
+        booking_date=date.today(), booking_time=time(10), address="1 Main St", amount=50.0, status="completed",
+    )
+    db.add(booking)
+    db.flush()
+    review = Review(booking_id=booking.id, customer_id=customer.id, provider_id=provider.id, rating=rating)
+    db.add(review)
+    db.flush()
+    provider_ratings.review_added(db, review)
+    db.commit()
+    return review
+
+
+def test_deleting_a_review_twice_decrements_once(pg_session):
+    review = _review(pg_session, rating=4)
+    provider_id = review.provider_id
+
+    assert provider_ratings.delete_review(pg_session, review.id) is True
+    # e.g. a second admin request for the same review
+    assert provider_ratings.delete_review(pg_session, review.id) is False
+    pg_session.commit()
+
+    provider = pg_session.get(User, provider_id)
+    pg_session.refresh(provider)
+    assert (provider.rating_sum, provider.rating_count, provider.rating_count_4) == (0, 0, 0)
@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db import replica
+from app.db.models.user import User
+
+
+@pytest.fixture
+def routing(pg_engine, monkeypatch):
+    """A 'replica' that is always healthy; the primary is the test database."""
+    replica_sessions = object()
+    monkeypatch.setattr(replica, "replica_engine", object())
+    monkeypatch.setattr(replica, "ReplicaSessionLocal", replica_sessions)
+    monkeypatch.setattr(replica, "replica_available", lambda: True)
+    monkeypatch.setattr(replica, "SessionLocal", sessionmaker(bind=pg_engine))
+    return replica_sessions
+
+
+def _users(db, *names):
+    users = [User(email=f"{name}@servicehub.test", name=name, password_hash="x") for name in names]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def test_pin_commits_with_the_write_and_is_seen_by_any_worker(pg_session, routing):
+    customer, provider, other = _users(pg_session, "customer", "provider", "other")
+
+    replica.pin_to_primary(pg_session, customer.id, provider.id)
+    # not committed yet: nothing to read your own write from
+    assert replica.read_sessionmaker(customer.id) is routing
+    pg_session.commit()
+
+    # the lookup is in the database, not in this process
+    assert replica.read_sessionmaker(customer.id) is replica.SessionLocal
+    assert replica.read_sessionmaker(provider.id) is replica.SessionLocal
+    assert replica.read_sessionmaker(other.id) is routing
+
+
+def test_expired_pin_reads_from_the_replica(pg_session, routing, monkeypatch):
+    (customer,) = _users(pg_session, "customer")
+    monkeypatch.setattr(replica.settings, "REPLICA_STICKY_SECONDS", -1)
+    replica.pin_to_primary(pg_session, customer.id)
+    pg_session.commit()
+
+    assert replica.read_sessionmaker(customer.id) is routing
@@ -0,0 +1,58 @@
+from datetime import date, time
+
+from fastapi import Response
+
+from app.api.routes.review import list_provider_reviews
+from app.db.models.booking import Booking
+from app.db.models.category import Category
+from app.db.models.review import Review
+from app.db.models.service import Service
+from app.db.models.user import User
+
+
+def _reviews(db, count: int) -> int:
+    customer = User(email="customer@servicehub.test", name="Customer", password_hash="x", role="customer")
+    provider = User(email="provider@servicehub.test", name="Provider", password_hash="x", role="provider")
+    category = Category(name="Cleaning")
+    db.add_all([customer, provider, category])
+    db.flush()
+    service = Service(provider_id=provider.id, category_id=category.id, name="Deep clean", price=50.0)
+    db.add(service)
+    db.flush()
+    for i in range(count):
+        booking = Booking(
+            customer_id=customer.id, provider_id=provider.id, service_id=service.id,
+            booking_date=date.today(), booking_time=time(10), address="1 Main St", amount=50.0, status="completed",
+        )
+        db.add(booking)
+        db.flush()
+        db.add(Review(booking_id=booking.id, customer_id=customer.id, provider_id=provider.id, rating=i % 5 + 1))
+    db.commit()
+    return provider.id
+
+
+def _list(db, provider_id, limit=None, cursor=None):
+    response = Response()
+    items = list_provider_reviews(provider_id, response, limit=limit, cursor=cursor, db=db)
+    return [r.id for r in items], response.headers.get("X-Next-Cursor")
+
+
+def test_without_limit_the_full_list_is_returned(pg_session):
+    provider_id = _reviews(pg_session, 5)
+
+    ids, cursor = _list(pg_session, provider_id)
+
+    assert len(ids) == 5
+    assert cursor is None
+
+
+def test_pages_carry_the_cursor_in_a_header(pg_session):
+    provider_id = _reviews(pg_session, 5)
+    everything, _ = _list(pg_session, provider_id)
+
+    first, cursor = _list(pg_session, provider_id, limit=2)
+    second, cursor = _list(pg_session, provider_id, limit=2, cursor=cursor)
+    third, cursor = _list(pg_session, provider_id, limit=2, cursor=cursor)
+
+    assert first + second + third == everything
+    assert cursor is None
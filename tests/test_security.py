@@ -0,0 +1,94 @@
+from unittest import mock
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.db.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def empty_principal_cache():
+    security.principal_cache.clear()
+    yield
+    security.principal_cache.clear()
+
+
+def _user(role="provider", version=0):
+    return User(id=7, email="p@servicehub.test", role=role, token_version=version)
+
+
+def _db(*rows):
+    """Session stub whose principal lookup returns `rows` in turn."""
+    db = mock.MagicMock()
+    db.query.return_value.filter.return_value.first.side_effect = list(rows)
+    return db
+
+
+def _row(role="provider", version=0):
+    return (7, "p@servicehub.test", role, True, True, version)
+
+
+def _lookups(db) -> int:
+    return db.query.return_value.filter.return_value.first.call_count
+
+
+def test_token_carries_id_role_and_version():
+    token = security.create_access_token({"sub": "p@servicehub.test"}, user=_user(version=3))
+    claims = security._decode(token)
+    assert (claims["uid"], claims["role"], claims["ver"]) == (7, "provider", 3)
+
+
+def test_principal_is_cached_after_first_lookup():
+    token = security.create_access_token({"sub": "p@servicehub.test"}, user=_user())
+    db = _db(_row())
+
+    assert security.get_current_user(token=token, db=db).id == 7
+    assert security.get_current_user(token=token, db=db).id == 7
+    assert _lookups(db) == 1
+
+
+def test_revoked_token_is_refused():
+    old = security.create_access_token({"sub": "p@servicehub.test"}, user=_user(version=0))
+    with pytest.raises(HTTPException) as e:
+        security.get_current_user(token=old, db=_db(_row(version=1)))
+    assert e.value.status_code == 401
+
+
+def test_newer_token_reloads_a_stale_cached_principal():
+    # this worker cached version 0; the user logged out everywhere through another worker
+    security.get_current_user(token=security.create_access_token({"sub": "p@servicehub.test"}, user=_user()), db=_db(_row()))
+    fresh = security.create_access_token({"sub": "p@servicehub.test"}, user=_user(version=1))
+    db = _db(_row(version=1))
+
+    assert security.get_current_user(token=fresh, db=db).token_version == 1
+    assert _lookups(db) == 1
+
+
+def test_token_without_version_is_refused():
+    legacy = security.jwt.encode({"sub": "p@servicehub.test", "exp": 9999999999}, security.settings.SECRET_KEY, algorithm=security.settings.ALGORITHM)
+    with pytest.raises(HTTPException) as e:
+        security.get_current_user(token=legacy, db=_db(_row()))
+    assert e.value.status_code == 401
+
+
+def test_require_role_refuses_other_roles_without_lookup():
+    token = security.create_access_token({"sub": "p@servicehub.test"}, user=_user())
+    db = _db(_row())
+    with pytest.raises(HTTPException) as e:
+        security.require_role("admin")(token=token, db=db)
+    assert e.value.status_code == 403
+    assert _lookups(db) == 0
+
+
+def test_require_role_checks_the_current_role_too():
+    token = security.create_access_token({"sub": "p@servicehub.test"}, user=_user(role="admin"))
+    # demoted without a token revocation
+    with pytest.raises(HTTPException) as e:
+        security.require_role("admin")(token=token, db=_db(_row(role="customer")))
+    assert e.value.status_code == 403
+
+
+def test_require_role_accepts_matching_role():
+    token = security.create_access_token({"sub": "p@servicehub.test"}, user=_user())
+    assert security.require_role("provider", "admin")(token=token, db=_db(_row())).role == "provider"